@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import logging
 import os
 import shlex
 import shutil
 import subprocess
 import sys
+import threading
 from datetime import datetime
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, List, Optional, Sequence
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
 
 try:
     import argcomplete
@@ -21,19 +24,44 @@ except ImportError:
     ARGCOMPLETE_AVAILABLE = False
 
 from . import __version__, config, types
-from .daemon import DaemonRunner
-from .engine import executor, planner, snapshot, state_store
+from .engine import state_store
 from .logging import configure_logging
-from .ssh import transport as ssh_transport
-from .engine.executor import _require_host
 
 # Import completers if argcomplete is available
 if ARGCOMPLETE_AVAILABLE:
     from . import completion
 
+if TYPE_CHECKING:
+    from .engine import planner
+
 Handler = Callable[[argparse.Namespace], int]
 logger = logging.getLogger(__name__)
 DEFAULT_IGNORE_PATTERNS = [".git", "node_modules", "__pycache__"]
+# Same spawn policy as ssh.transport.CLOSE_FDS; repeated here so the CLI does not import the SSH stack.
+_CLOSE_FDS = os.name == "nt"
+SUBCOMMANDS = ("run", "profiles", "init", "daemon", "status", "conflicts", "completion", "edit")
+
+# Heavy modules only the run/daemon paths need; functions import them locally, and these names stay reachable as
+# ``simple_sync.cli.<name>`` (for callers and mock.patch targets) through the module ``__getattr__`` below.
+_LAZY_ATTRIBUTES = {
+    "DaemonRunner": ("simple_sync.daemon", "DaemonRunner"),
+    "executor": ("simple_sync.engine.executor", None),
+    "planner": ("simple_sync.engine.planner", None),
+    "snapshot": ("simple_sync.engine.snapshot", None),
+    "ssh_transport": ("simple_sync.ssh.transport", None),
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
 
 
 def _find_register_python_argcomplete() -> Optional[str]:
@@ -61,8 +89,8 @@ def _resolve_editor_command(target: Path) -> List[str]:
     return ["vim", str(target)]
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Create the CLI parser with all supported subcommands."""
+def build_parser(*, only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Create the CLI parser with all supported subcommands, or just the ``only`` one when given."""
     parser = argparse.ArgumentParser(
         prog="simple-sync",
         description="Profile-driven file synchronization utility.",
@@ -88,117 +116,148 @@ def build_parser() -> argparse.ArgumentParser:
     )
     subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
 
-    run_parser = subparsers.add_parser(
-        "run",
-        help="Execute a synchronization run for a profile.",
-    )
-    profile_arg = run_parser.add_argument("profile", help="Name of the profile to synchronize.")
-    if ARGCOMPLETE_AVAILABLE:
-        profile_arg.completer = completion.profile_completer
-    run_parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="Plan actions without touching the filesystem.",
-    )
-    run_parser.set_defaults(func=_handle_run)
+    if only in (None, "run"):
+        run_parser = subparsers.add_parser(
+            "run",
+            help="Execute a synchronization run for a profile.",
+        )
+        profile_arg = run_parser.add_argument("profile", help="Name of the profile to synchronize.")
+        if ARGCOMPLETE_AVAILABLE:
+            profile_arg.completer = completion.profile_completer
+        run_parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Plan actions without touching the filesystem.",
+        )
+        run_parser.set_defaults(func=_handle_run)
 
-    profiles_parser = subparsers.add_parser(
-        "profiles",
-        help="List configured profiles.",
-    )
-    profiles_parser.add_argument(
-        "--details",
-        action="store_true",
-        help="Show extended profile information (includes file paths).",
-    )
-    profiles_parser.set_defaults(func=_handle_profiles)
+    if only in (None, "profiles"):
+        profiles_parser = subparsers.add_parser(
+            "profiles",
+            help="List configured profiles.",
+        )
+        profiles_parser.add_argument(
+            "--details",
+            action="store_true",
+            help="Show extended profile information (includes file paths).",
+        )
+        profiles_parser.set_defaults(func=_handle_profiles)
 
-    init_parser = subparsers.add_parser(
-        "init",
-        help="Create a new profile via interactive prompts.",
-    )
-    init_parser.add_argument(
-        "profile",
-        nargs="?",
-        help="Optional name for the new profile.",
-    )
-    init_parser.set_defaults(func=_handle_init)
+    if only in (None, "init"):
+        init_parser = subparsers.add_parser(
+            "init",
+            help="Create a new profile via interactive prompts.",
+        )
+        init_parser.add_argument(
+            "profile",
+            nargs="?",
+            help="Optional name for the new profile.",
+        )
+        init_parser.set_defaults(func=_handle_init)
 
-    daemon_parser = subparsers.add_parser(
-        "daemon",
-        help="Manage the long-running synchronization daemon.",
-    )
-    daemon_parser.add_argument(
-        "action",
-        choices=("start",),
-        help="Daemon action to perform.",
-    )
-    daemon_parser.add_argument(
-        "--once",
-        action="store_true",
-        help="Run scheduled profiles once then exit.",
-    )
-    daemon_parser.add_argument(
-        "--foreground",
-        action="store_true",
-        help="Keep output in the foreground instead of logging to per-profile files.",
-    )
-    daemon_parser.set_defaults(func=_handle_daemon)
+    if only in (None, "daemon"):
+        daemon_parser = subparsers.add_parser(
+            "daemon",
+            help="Manage the long-running synchronization daemon.",
+        )
+        daemon_parser.add_argument(
+            "action",
+            choices=("start",),
+            help="Daemon action to perform.",
+        )
+        daemon_parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run scheduled profiles once then exit.",
+        )
+        daemon_parser.add_argument(
+            "--foreground",
+            action="store_true",
+            help="Keep output in the foreground instead of logging to per-profile files.",
+        )
+        daemon_parser.set_defaults(func=_handle_daemon)
 
-    status_parser = subparsers.add_parser(
-        "status",
-        help="Show the latest sync status for a profile.",
-    )
-    status_profile_arg = status_parser.add_argument(
-        "profile",
-        nargs="?",
-        help="Profile to inspect; defaults to all.",
-    )
-    if ARGCOMPLETE_AVAILABLE:
-        status_profile_arg.completer = completion.profile_completer
-    status_parser.set_defaults(func=_handle_status)
+    if only in (None, "status"):
+        status_parser = subparsers.add_parser(
+            "status",
+            help="Show the latest sync status for a profile.",
+        )
+        status_profile_arg = status_parser.add_argument(
+            "profile",
+            nargs="?",
+            help="Profile to inspect; defaults to all.",
+        )
+        if ARGCOMPLETE_AVAILABLE:
+            status_profile_arg.completer = completion.profile_completer
+        status_parser.set_defaults(func=_handle_status)
+
+    if only in (None, "conflicts"):
+        conflicts_parser = subparsers.add_parser(
+            "conflicts",
+            help="Inspect outstanding conflicts for a profile.",
+        )
+        conflicts_profile_arg = conflicts_parser.add_argument(
+            "profile",
+            help="Profile to inspect for conflicts.",
+        )
+        if ARGCOMPLETE_AVAILABLE:
+            conflicts_profile_arg.completer = completion.profile_completer
+        conflicts_parser.set_defaults(func=_handle_conflicts)
+
+    if only in (None, "completion"):
+        completion_parser = subparsers.add_parser(
+            "completion",
+            help="Install or show tab completion setup instructions.",
+        )
+        completion_parser.add_argument(
+            "--install",
+            action="store_true",
+            help="Install completion for the current shell (bash/zsh/fish).",
+        )
+        completion_parser.add_argument(
+            "--shell",
+            choices=["bash", "zsh", "fish", "tcsh"],
+            help="Target shell for completion (auto-detected if not specified).",
+        )
+        completion_parser.set_defaults(func=_handle_completion)
 
-    conflicts_parser = subparsers.add_parser(
-        "conflicts",
-        help="Inspect outstanding conflicts for a profile.",
-    )
-    conflicts_profile_arg = conflicts_parser.add_argument(
-        "profile",
-        help="Profile to inspect for conflicts.",
-    )
-    if ARGCOMPLETE_AVAILABLE:
-        conflicts_profile_arg.completer = completion.profile_completer
-    conflicts_parser.set_defaults(func=_handle_conflicts)
+    if only in (None, "edit"):
+        edit_parser = subparsers.add_parser(
+            "edit",
+            help="Open a profile configuration in your editor.",
+        )
+        edit_profile_arg = edit_parser.add_argument("profile", help="Profile to edit.")
+        if ARGCOMPLETE_AVAILABLE:
+            edit_profile_arg.completer = completion.profile_completer
+        edit_parser.set_defaults(func=_handle_edit)
 
-    completion_parser = subparsers.add_parser(
-        "completion",
-        help="Install or show tab completion setup instructions.",
-    )
-    completion_parser.add_argument(
-        "--install",
-        action="store_true",
-        help="Install completion for the current shell (bash/zsh/fish).",
-    )
-    completion_parser.add_argument(
-        "--shell",
-        choices=["bash", "zsh", "fish", "tcsh"],
-        help="Target shell for completion (auto-detected if not specified).",
-    )
-    completion_parser.set_defaults(func=_handle_completion)
+    return parser
 
-    edit_parser = subparsers.add_parser(
-        "edit",
-        help="Open a profile configuration in your editor.",
-    )
-    edit_profile_arg = edit_parser.add_argument("profile", help="Profile to edit.")
-    if ARGCOMPLETE_AVAILABLE:
-        edit_profile_arg.completer = completion.profile_completer
-    edit_parser.set_defaults(func=_handle_edit)
 
-    return parser
+@lru_cache(maxsize=None)
+def _shared_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Parser reused by every ``main`` call in this process."""
+    return build_parser(only=only)
+
+
+def _sniff_subcommand(argv: Sequence[str]) -> Optional[str]:
+    """Return the subcommand named in ``argv``, or None when the full parser is needed."""
+    tokens = iter(argv)
+    for token in tokens:
+        if token == "--":
+            return None
+        if token.startswith("-"):
+            # --config-dir (or an unambiguous prefix of it) consumes the next token unless given as --opt=value.
+            if len(token) > 2 and "=" not in token and "--config-dir".startswith(token):
+                next(tokens, None)
+            continue
+        return token if token in SUBCOMMANDS else None
+    return None
 
 
 def _handle_run(args: argparse.Namespace) -> int:
+    from .engine import executor, snapshot
+
     runner = SyncRunner(config_dir=args.config_dir)
     try:
         runner.run(profile_name=args.profile, dry_run=args.dry_run)
@@ -240,6 +299,8 @@ def _handle_init(args: argparse.Namespace) -> int:
 
 def _handle_daemon(args: argparse.Namespace) -> int:
     if args.action == "start":
+        from .daemon import DaemonRunner
+
         runner = DaemonRunner(config_dir=args.config_dir)
         runner.run_forever(run_once=getattr(args, "once", False), foreground=getattr(args, "foreground", False))
         return 0
@@ -361,6 +422,7 @@ def _handle_completion(args: argparse.Namespace) -> int:
                     [register_cmd, "--shell", "fish", "simple-sync"],
                     capture_output=True,
                     text=True,
+                    close_fds=_CLOSE_FDS,
                 )
                 if result.returncode == 0:
                     fish_file.write_text(result.stdout)
@@ -439,7 +501,7 @@ def _handle_edit(args: argparse.Namespace) -> int:
     command = _resolve_editor_command(profile_path)
     print(f"Opening {profile_path} with: {' '.join(shlex.quote(part) for part in command)}")
     try:
-        result = subprocess.run(command)
+        result = subprocess.run(command, close_fds=_CLOSE_FDS)
     except FileNotFoundError:
         logger.error("Editor command '%s' not found. Set $VISUAL or $EDITOR, or install vim.", command[0])
         return 1
@@ -455,9 +517,15 @@ class SyncRunner:
     def __init__(self, *, config_dir: Optional[str] = None, input_func: Callable[[str], str] | None = None):
         self._config_dir = Path(config_dir).expanduser() if config_dir else None
         self._preconnect_done: bool = False
+        # The daemon may run several profiles on one runner at once; the hook still runs only once.
+        self._preconnect_lock = threading.Lock()
+        # Concurrent daemon profiles must not interleave their missing-endpoint prompts.
+        self._prompt_lock = threading.Lock()
         self._input = input_func or input
 
     def run(self, *, profile_name: str, dry_run: bool) -> None:
+        from .engine import executor, planner, snapshot
+
         base = config.ensure_config_structure(self._config_dir)
         profile_cfg = config.load_profile(profile_name, base)
         endpoint_a, endpoint_b = self._prepare_endpoints(profile_cfg)
@@ -470,17 +538,16 @@ class SyncRunner:
                 if endpoint.pre_connect_command:
                     preconnect_command = endpoint.pre_connect_command
                     break
-        if preconnect_command and not self._preconnect_done:
-            self._run_preconnect(preconnect_command, ssh_env)
-            self._preconnect_done = True
+        if preconnect_command:
+            with self._preconnect_lock:
+                if not self._preconnect_done:
+                    self._run_preconnect(preconnect_command, ssh_env)
+                    self._preconnect_done = True
 
         self._ensure_endpoints_available(endpoint_a, endpoint_b)
 
-        snap_a = snapshot.build_snapshot_for_endpoint(
-            endpoint_a, ignore_patterns=ignore_patterns, ssh_command=endpoint_a.ssh_command
-        )
-        snap_b = snapshot.build_snapshot_for_endpoint(
-            endpoint_b, ignore_patterns=ignore_patterns, ssh_command=endpoint_b.ssh_command
+        snap_a, snap_b = snapshot.build_snapshots_for_endpoints(
+            [endpoint_a, endpoint_b], ignore_patterns=ignore_patterns
         )
         state = state_store.load_state(profile_cfg.profile.name, base)
         plan_input = planner.PlannerInput(
@@ -499,7 +566,7 @@ class SyncRunner:
         plan_result = planner.plan(plan_input)
         self._log_plan(plan_result)
 
-        blocking_conflicts = [c for c in plan_result.conflicts if c.reason != "manual_copy_both"]
+        blocking_conflicts = [c for c in plan_result.conflicts if c.reason != planner.REASON_MANUAL_COPY_BOTH]
         if blocking_conflicts:
             if not dry_run:
                 self._persist_state(
@@ -553,20 +620,26 @@ class SyncRunner:
         missing_ep, missing_err = missing[0]
         source_ep = endpoint_b if missing_ep is endpoint_a else endpoint_a
 
-        if not self._prompt_initialize_missing(missing_ep, source_ep, missing_err):
+        with self._prompt_lock:
+            initialize = self._prompt_initialize_missing(missing_ep, source_ep, missing_err)
+        if not initialize:
             raise RuntimeError(f"Endpoint '{missing_ep.id}' is missing; initialization declined.")
 
         self._initialize_missing_endpoint(missing_ep)
 
     def _endpoint_exists(self, endpoint: types.Endpoint) -> tuple[bool, Optional[str]]:
         if endpoint.type == types.EndpointType.LOCAL:
-            return Path(endpoint.path).exists(), None
+            return endpoint.path.exists(), None
+
+        from .engine.executor import _require_host
+        from .ssh import transport as ssh_transport
 
         remote_cmd = ["test", "-d", str(endpoint.path)]
         result = ssh_transport.run_ssh_command(
             host=_require_host(endpoint),
             remote_command=remote_cmd,
             ssh_command=endpoint.ssh_command or "ssh",
+            capture_stdout=False,
         )
         if result.prompt_detected or result.auth_failed:
             raise RuntimeError("SSH authentication prompt detected; refusing to continue.")
@@ -592,15 +665,19 @@ class SyncRunner:
 
     def _initialize_missing_endpoint(self, endpoint: types.Endpoint) -> None:
         if endpoint.type == types.EndpointType.LOCAL:
-            Path(endpoint.path).mkdir(parents=True, exist_ok=True)
+            endpoint.path.mkdir(parents=True, exist_ok=True)
             logger.info("Created local directory %s.", endpoint.path)
             return
 
+        from .engine.executor import _require_host
+        from .ssh import transport as ssh_transport
+
         remote_cmd = ["mkdir", "-p", str(endpoint.path)]
         result = ssh_transport.run_ssh_command(
             host=_require_host(endpoint),
             remote_command=remote_cmd,
             ssh_command=endpoint.ssh_command or "ssh",
+            capture_stdout=False,
         )
         if result.prompt_detected or result.auth_failed:
             raise RuntimeError("SSH authentication prompt detected while creating remote directory.")
@@ -662,17 +739,16 @@ class SyncRunner:
         base_dir: Path,
         conflicts: List[types.Conflict],
     ) -> Path:
-        snap_a = snapshot.build_snapshot_for_endpoint(
-            endpoint_a, ignore_patterns=ignore_patterns, ssh_command=endpoint_a.ssh_command
-        )
-        snap_b = snapshot.build_snapshot_for_endpoint(
-            endpoint_b, ignore_patterns=ignore_patterns, ssh_command=endpoint_b.ssh_command
+        from .engine import snapshot
+
+        snap_a, snap_b = snapshot.build_snapshots_for_endpoints(
+            [endpoint_a, endpoint_b], ignore_patterns=ignore_patterns
         )
         next_state = state_store.ProfileState(profile=profile_name)
-        for entry in snap_a.entries.values():
-            state_store.record_entry(next_state, endpoint_a.id, entry)
-        for entry in snap_b.entries.values():
-            state_store.record_entry(next_state, endpoint_b.id, entry)
+        # Record entries in path order so the state file is written deterministically.
+        for endpoint, snap in ((endpoint_a, snap_a), (endpoint_b, snap_b)):
+            entries = snap.entries
+            state_store.record_entries(next_state, endpoint.id, (entries[path] for path in sorted(entries)))
         for conflict in conflicts:
             state_store.record_conflict(
                 next_state,
@@ -696,6 +772,7 @@ class SyncRunner:
                 capture_output=True,
                 text=True,
                 check=False,
+                close_fds=_CLOSE_FDS,
             )
         except OSError as exc:
             raise RuntimeError(f"Failed to execute pre-connect command: {exc}") from exc
@@ -726,9 +803,17 @@ class SyncRunner:
 class InitWizard:
     """Interactive profile creation."""
 
-    def __init__(self, *, config_dir: Optional[str] = None, input_func: Callable[[str], str] | None = None):
+    def __init__(
+        self,
+        *,
+        config_dir: Optional[str] = None,
+        input_func: Callable[[str], str] | None = None,
+        cwd: Optional[Path] = None,
+    ):
         self._config_dir = Path(config_dir).expanduser() if config_dir else None
         self._input = input_func or input
+        # Relative local paths resolve against this directory (the process cwd by default).
+        self._cwd = cwd
 
     def run(self, provided_name: Optional[str]) -> Path:
         base = config.ensure_config_structure(self._config_dir)
@@ -765,7 +850,10 @@ class InitWizard:
         endpoint_type = self._prompt_type(name, default_type)
         if endpoint_type == "local":
             path = self._prompt(f"Local path for '{name}'")
-            absolute_path = str(Path(path).expanduser().resolve())
+            local_path = Path(path).expanduser()
+            if self._cwd is not None:
+                local_path = self._cwd / local_path
+            absolute_path = str(local_path.resolve())
             return config.EndpointBlock(name=name, type="local", path=absolute_path)
         host = self._prompt(f"SSH host for '{name}'")
         path = self._prompt(f"Remote path for '{name}'")
@@ -902,13 +990,16 @@ def _format_timestamp(timestamp: float) -> str:
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     """Entry point for console_scripts."""
-    parser = build_parser()
+    argv = list(argv) if argv is not None else sys.argv[1:]
+    # Completion needs every subcommand; otherwise only the one being invoked is built.
+    completing = ARGCOMPLETE_AVAILABLE and "_ARGCOMPLETE" in os.environ
+    parser = _shared_parser(None if completing else _sniff_subcommand(argv))
 
     # Enable argcomplete if available
     if ARGCOMPLETE_AVAILABLE:
         argcomplete.autocomplete(parser)
 
-    args = parser.parse_args(list(argv) if argv is not None else None)
+    args = parser.parse_args(argv)
     configure_logging(verbose=args.verbose, quiet=args.quiet)
     handler: Handler = getattr(args, "func")
     return handler(args)
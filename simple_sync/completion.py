@@ -3,19 +3,33 @@
 from __future__ import annotations
 
 import argparse
+import os
+import re
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, List
 
 from . import config
 
+_POLICIES = ("manual", "newest", "prefer")
+_ENDPOINT_TYPES = ("local", "ssh")
+# Matches ``[endpoints.<name>]`` table headers (but not nested tables such as ``[endpoints.<name>.env]``).
+_ENDPOINT_TABLE_RE = re.compile(r"^[ \t]*\[[ \t]*endpoints\.([^.\]\s]+)[ \t]*\]", re.MULTILINE)
 
-def profile_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -> Iterable[str]:
+
+def profile_completer(
+    prefix: str,
+    parsed_args: argparse.Namespace,
+    *,
+    _scandir: Callable[[Path], Iterable[os.DirEntry]] = os.scandir,
+    **kwargs,
+) -> Iterable[str]:
     """
     Complete profile names from the user's configuration directory.
 
     Args:
         prefix: The current partial profile name being typed
         parsed_args: Parsed arguments so far
+        _scandir: Directory lister (tests substitute an in-memory one)
         **kwargs: Additional context from argcomplete
 
     Returns:
@@ -29,19 +43,17 @@ def profile_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) ->
         else:
             base = config.get_base_config_dir()
 
-        # Ensure profiles directory exists
-        profiles_dir = base / "profiles"
-        if not profiles_dir.exists():
+        # Get all profile names (without .toml extension); one directory read, no per-entry stat.
+        # Hidden files are skipped, as a "*.toml" glob would.
+        try:
+            entries = _scandir(base / "profiles")
+        except FileNotFoundError:
             return []
-
-        # Get all profile names (without .toml extension)
-        profile_names = []
-        for profile_path in profiles_dir.glob("*.toml"):
-            name = profile_path.stem
-            if name.startswith(prefix):
-                profile_names.append(name)
-
-        return sorted(profile_names)
+        return sorted(
+            entry.name[:-5]
+            for entry in entries
+            if entry.name.endswith(".toml") and not entry.name.startswith(".") and entry.name.startswith(prefix)
+        )
     except Exception:
         # If anything goes wrong, return empty list
         return []
@@ -68,14 +80,11 @@ def endpoint_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -
         if config_dir_arg:
             base = Path(config_dir_arg).expanduser()
         else:
-            base = None
-
-        # Load the profile
-        profile_cfg = config.load_profile(profile_name, base)
+            base = config.get_base_config_dir()
 
-        # Get endpoint names
+        # Read endpoint names straight from the table headers; completion does not need a validated profile
         endpoint_names = [
-            name for name in profile_cfg.endpoints.keys()
+            name for name in _endpoint_names(base / "profiles" / f"{profile_name}.toml")
             if name.startswith(prefix)
         ]
 
@@ -85,6 +94,12 @@ def endpoint_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -
         return []
 
 
+def _endpoint_names(profile_path: Path) -> List[str]:
+    """Return the endpoint table names declared in a profile file, without building a ProfileConfig."""
+    text = profile_path.read_text()
+    return list(dict.fromkeys(_ENDPOINT_TABLE_RE.findall(text)))
+
+
 def policy_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -> Iterable[str]:
     """
     Complete conflict policy names.
@@ -97,8 +112,7 @@ def policy_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) ->
     Returns:
         List of matching policy names
     """
-    policies = ["newest", "prefer", "manual"]
-    return [p for p in policies if p.startswith(prefix)]
+    return [p for p in _POLICIES if p.startswith(prefix)]
 
 
 def endpoint_type_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -> Iterable[str]:
@@ -113,8 +127,7 @@ def endpoint_type_completer(prefix: str, parsed_args: argparse.Namespace, **kwar
     Returns:
         List of matching endpoint types
     """
-    types = ["local", "ssh"]
-    return [t for t in types if t.startswith(prefix)]
+    return [t for t in _ENDPOINT_TYPES if t.startswith(prefix)]
 
 
 def directory_completer(prefix: str, parsed_args: argparse.Namespace, **kwargs) -> Iterable[str]:
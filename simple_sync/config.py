@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
 
 CONFIG_DIR_NAME = "simple_sync"
 SUBDIRECTORIES: tuple[str, ...] = ("profiles", "state", "logs")
+PROFILE_CACHE_SIZE = 128
+
+_VALID_ENDPOINT_TYPES = frozenset({"local", "ssh"})
+_VALID_POLICIES = frozenset({"newest", "prefer", "manual"})
+_VALID_MERGE_FALLBACKS = frozenset({"newest", "manual", "prefer"})
 
 
 def is_windows() -> bool:
@@ -17,8 +24,13 @@ def is_windows() -> bool:
     return os.name == "nt" or sys.platform.startswith("win")
 
 
+@lru_cache(maxsize=1)
 def get_base_config_dir() -> Path:
-    """Resolve the platform-specific configuration directory."""
+    """Resolve the platform-specific configuration directory.
+
+    The result is computed once per process; call ``get_base_config_dir.cache_clear()``
+    after changing the environment it depends on.
+    """
     if is_windows():
         appdata = os.environ.get("APPDATA")
         base = Path(appdata) if appdata else Path.home() / "AppData" / "Roaming"
@@ -29,9 +41,20 @@ def get_base_config_dir() -> Path:
 def ensure_config_structure(base_dir: Path | None = None, *, subdirs: Iterable[str] = SUBDIRECTORIES) -> Path:
     """Ensure that the config directory and expected subdirectories exist."""
     base = base_dir or get_base_config_dir()
-    base.mkdir(parents=True, exist_ok=True)
+    checked_base = False
     for name in subdirs:
-        (base / name).mkdir(parents=True, exist_ok=True)
+        # Common case is an existing tree: a single mkdir attempt per subdirectory.
+        path = base / name
+        try:
+            path.mkdir()
+        except FileExistsError:
+            if not path.is_dir():
+                raise ConfigError(f"{path} exists but is not a directory.") from None
+        except FileNotFoundError:
+            path.mkdir(parents=True, exist_ok=True)
+        checked_base = True
+    if not checked_base:
+        base.mkdir(parents=True, exist_ok=True)
     return base
 
 
@@ -229,8 +252,29 @@ def load_profile(profile_name: str, base_dir: Path | None = None) -> ProfileConf
     return load_profile_from_path(profile_path)
 
 
+# Parsed profiles keyed by path; each value carries the stat stamp it was parsed from.
+_PROFILE_CACHE: Dict[str, tuple[tuple[int, int, int, int], ProfileConfig]] = {}
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+
 def load_profile_from_path(profile_path: Path) -> ProfileConfig:
-    """Load a profile from an explicit path."""
+    """Load a profile from an explicit path.
+
+    Results are cached until the file's inode, size, or timestamps change. The
+    cache is safe to use from several threads, and callers share the returned
+    object, so treat it as read-only.
+    """
+    try:
+        st = profile_path.stat()
+    except OSError as exc:  # pragma: no cover - filesystem errors
+        raise ConfigError(f"Unable to read profile file {profile_path}: {exc}") from exc
+    key = str(profile_path)
+    stamp = (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+    with _PROFILE_CACHE_LOCK:
+        cached = _PROFILE_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
     try:
         raw_data = profile_path.read_text()
     except OSError as exc:  # pragma: no cover - filesystem errors
@@ -241,28 +285,62 @@ def load_profile_from_path(profile_path: Path) -> ProfileConfig:
     except ValueError as exc:
         raise ConfigError(f"Failed to parse {profile_path.name}: {exc}") from exc
 
-    return _build_profile_config(mapping, profile_path)
+    profile = _build_profile_config(mapping, profile_path)
+    with _PROFILE_CACHE_LOCK:
+        _PROFILE_CACHE.pop(key, None)
+        if len(_PROFILE_CACHE) >= PROFILE_CACHE_SIZE:
+            del _PROFILE_CACHE[next(iter(_PROFILE_CACHE))]
+        _PROFILE_CACHE[key] = (stamp, profile)
+    return profile
+
+
+def clear_profile_cache() -> None:
+    """Forget every cached profile so the next load re-reads from disk."""
+    with _PROFILE_CACHE_LOCK:
+        _PROFILE_CACHE.clear()
 
 
 def _build_profile_config(data: Mapping[str, Any], profile_path: Path) -> ProfileConfig:
-    profile_block = _load_profile_block(_require_table(data, "profile"), profile_path)
-    endpoints = _load_endpoints(_require_table(data, "endpoints"), profile_path)
-    conflict = _load_conflict(_require_table(data, "conflict"), profile_path)
-    if conflict.policy == "prefer" and conflict.prefer not in endpoints:
-        raise ConfigError(
-            f"Conflict prefer endpoint '{conflict.prefer}' not defined in endpoints for {profile_path}."
-        )
-    ignore = _load_ignore(data.get("ignore"))
-    schedule = _load_schedule(data.get("schedule"))
-    ssh_block = _load_ssh(data.get("ssh"))
-    return ProfileConfig(
-        profile=profile_block,
-        endpoints=endpoints,
-        conflict=conflict,
-        ignore=ignore,
-        schedule=schedule,
-        ssh=ssh_block,
-    )
+    blocks, errors = _load_blocks(data, profile_path)
+    if errors:
+        if len(errors) == 1:
+            raise ConfigError(errors[0])
+        details = "\n".join(f"  - {error}" for error in errors)
+        raise ConfigError(f"{len(errors)} problems in {profile_path}:\n{details}")
+    return ProfileConfig(**blocks)
+
+
+def validate_profile(data: Mapping[str, Any], profile_path: Path = Path("<profile>")) -> List[str]:
+    """Return every validation problem in parsed profile data (empty when valid)."""
+    return _load_blocks(data, profile_path)[1]
+
+
+def _load_blocks(data: Mapping[str, Any], profile_path: Path) -> tuple[Dict[str, Any], List[str]]:
+    """Run each section loader, collecting errors instead of stopping at the first one."""
+    blocks: Dict[str, Any] = {}
+    errors: List[str] = []
+
+    def attempt(field_name: str, loader: Callable[[], Any]) -> None:
+        try:
+            blocks[field_name] = loader()
+        except ConfigError as exc:
+            errors.append(str(exc))
+
+    attempt("profile", lambda: _load_profile_block(_require_table(data, "profile"), profile_path))
+    attempt("endpoints", lambda: _load_endpoints(_require_table(data, "endpoints"), profile_path))
+    attempt("conflict", lambda: _load_conflict(_require_table(data, "conflict"), profile_path))
+    # Cross-section check only makes sense once both sections loaded cleanly.
+    conflict = blocks.get("conflict")
+    endpoints = blocks.get("endpoints")
+    if conflict is not None and endpoints is not None:
+        if conflict.policy == "prefer" and conflict.prefer not in endpoints:
+            errors.append(
+                f"Conflict prefer endpoint '{conflict.prefer}' not defined in endpoints for {profile_path}."
+            )
+    attempt("ignore", lambda: _load_ignore(data.get("ignore")))
+    attempt("schedule", lambda: _load_schedule(data.get("schedule")))
+    attempt("ssh", lambda: _load_ssh(data.get("ssh")))
+    return blocks, errors
 
 
 def _load_profile_block(block: Mapping[str, Any], profile_path: Path) -> ProfileBlock:
@@ -284,7 +362,7 @@ def _load_endpoints(block: Mapping[str, Any], profile_path: Path) -> Dict[str, E
         endpoint_type = _require_str(value, "type", f"[endpoints.{name}]", profile_path)
         path = value.get("path")
         host = value.get("host")
-        if endpoint_type not in {"local", "ssh"}:
+        if endpoint_type not in _VALID_ENDPOINT_TYPES:
             raise ConfigError(
                 f"Endpoint '{name}' has unsupported type '{endpoint_type}' in {profile_path}."
             )
@@ -314,13 +392,13 @@ def _load_conflict(block: Mapping[str, Any], profile_path: Path) -> ConflictBloc
     merge_text_files = block.get("merge_text_files", True)
     merge_fallback = block.get("merge_fallback", "newest")
 
-    if policy not in {"newest", "prefer", "manual"}:
+    if policy not in _VALID_POLICIES:
         raise ConfigError(f"Conflict policy '{policy}' is not supported in {profile_path}.")
     if policy == "prefer" and not prefer:
         raise ConfigError(f"'prefer' policy requires 'prefer' field in {profile_path}.")
     if policy == "manual" and not manual_behavior:
         raise ConfigError(f"'manual' policy requires 'manual_behavior' field in {profile_path}.")
-    if merge_fallback not in {"newest", "manual", "prefer"}:
+    if merge_fallback not in _VALID_MERGE_FALLBACKS:
         raise ConfigError(f"merge_fallback '{merge_fallback}' is not supported in {profile_path}.")
 
     return ConflictBlock(
@@ -465,6 +543,9 @@ def _parse_array(inner: str, lineno: int) -> List[Any]:
 
 
 def _strip_inline_comment(value: str) -> str:
+    if "#" not in value:
+        # Most values carry no comment; skip the per-character scan.
+        return value.strip()
     result = []
     in_string = False
     escape = False
@@ -513,10 +594,12 @@ __all__ = [
     "SshBlock",
     "SUBDIRECTORIES",
     "build_profile_template",
+    "clear_profile_cache",
     "ensure_config_structure",
     "get_base_config_dir",
     "is_windows",
     "load_profile",
     "load_profile_from_path",
     "profile_to_toml",
+    "validate_profile",
 ]
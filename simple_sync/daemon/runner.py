@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import contextvars
 import logging
 import signal
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,6 +16,12 @@ from simple_sync import config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on profiles synced at once when several fall due together.
+MAX_PARALLEL_PROFILES = 8
+# Profile whose sync owns the current context. The engine's worker pools submit through
+# contextvars.copy_context(), so records from their threads are tagged with it as well.
+_current_profile: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("simple_sync_profile", default=None)
+
 
 @dataclass
 class ScheduledProfile:
@@ -47,14 +55,12 @@ class DaemonRunner:
             now = time.time()
             due = [p for p in profiles.values() if p.next_run <= now]
             if due:
-                for profile in due:
-                    try:
-                        with self._profile_logger(profile.name):
-                            logger.info("Running scheduled sync for %s.", profile.name)
-                            runner.run(profile_name=profile.name, dry_run=False)
-                    except Exception as exc:  # pragma: no cover
-                        logger.error("Scheduled sync failed: %s", exc)
-                    profile.next_run = time.time() + profile.interval
+                if len(due) == 1:
+                    self._run_profile(runner, due[0])
+                else:
+                    # Profiles are dominated by SSH and disk waits, so threads overlap them well.
+                    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_PROFILES, len(due))) as pool:
+                        list(pool.map(lambda profile: self._run_profile(runner, profile), due))
                 if run_once:
                     break
                 continue
@@ -66,6 +72,15 @@ class DaemonRunner:
             else:
                 time.sleep(5)
 
+    def _run_profile(self, runner, profile: ScheduledProfile) -> None:
+        try:
+            with self._profile_logger(profile.name):
+                logger.info("Running scheduled sync for %s.", profile.name)
+                runner.run(profile_name=profile.name, dry_run=False)
+        except Exception as exc:  # pragma: no cover
+            logger.error("Scheduled sync failed: %s", exc)
+        profile.next_run = time.time() + profile.interval
+
     def _load_scheduled_profiles(self) -> Dict[str, ScheduledProfile]:
         summaries = _gather_profiles(self._base_dir)
         scheduled: Dict[str, ScheduledProfile] = {}
@@ -99,6 +114,9 @@ class DaemonRunner:
         file_path = log_dir / f"{profile_name}.log"
         handler = logging.FileHandler(file_path)
         handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(message)s"))
+        # Profiles may sync concurrently; keep other profiles' records out of this log.
+        handler.addFilter(lambda record: _current_profile.get() == profile_name)
+        token = _current_profile.set(profile_name)
         root = logging.getLogger()
         root.addHandler(handler)
         try:
@@ -106,6 +124,7 @@ class DaemonRunner:
         finally:
             root.removeHandler(handler)
             handler.close()
+            _current_profile.reset(token)
 
 
 def _gather_profiles(base: Path):
@@ -1,5 +1,14 @@
 """Engine package exposing sync components."""
 
-from . import executor, planner, snapshot, state_store
+from __future__ import annotations
+
+import importlib
 
 __all__ = ["executor", "planner", "snapshot", "state_store"]
+
+
+def __getattr__(name: str):
+    # Submodules load on first use so that importing one (e.g. state_store) does not pull in the executor and SSH stack.
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
 import os
 import shutil
 import shlex
 import tempfile
 from pathlib import Path, PurePosixPath
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from simple_sync import types
 from simple_sync.engine import merge, state_store
@@ -17,6 +18,14 @@ from simple_sync.ssh import transport as ssh_transport
 
 logger = logging.getLogger(__name__)
 
+# Plain copies between the same local/SSH endpoint pair are sent through one tar pipe
+# once at least this many are queued; below it, per-file scp is cheaper to start.
+TAR_BATCH_MIN_FILES = 16
+# Smaller groups of local->SSH file uploads are spread over this many parallel scp channels.
+PARALLEL_COPY_CONNECTIONS = 4
+# Remote deletes for one endpoint share a single `rm -rf`, this many paths per call.
+REMOTE_DELETE_BATCH_SIZE = 256
+
 
 class ExecutionError(RuntimeError):
     """Raised when applying operations fails."""
@@ -28,25 +37,59 @@ def apply_operations(
     dry_run: bool = False,
     state: Optional[state_store.ProfileState] = None
 ) -> None:
-    """Apply a list of operations to the filesystem."""
-    for op in ops:
-        if op.type == types.OperationType.COPY:
-            _copy(op, dry_run=dry_run)
-        elif op.type == types.OperationType.DELETE:
-            _delete(op, dry_run=dry_run)
-        elif op.type == types.OperationType.MKDIR:
-            _mkdir(op, dry_run=dry_run)
-        elif op.type == types.OperationType.MERGE:
-            _merge(op, dry_run=dry_run, state=state)
-        else:  # pragma: no cover - unknown ops future-proofing
-            raise ExecutionError(f"Unsupported operation type: {op.type}")
+    """Apply a list of operations to the filesystem, in plan order.
+
+    Consecutive local<->SSH copies between one endpoint pair, and consecutive deletes on
+    one SSH endpoint, are sent together. A run ends as soon as any other operation follows,
+    so batching never moves an operation past one planned before or after it.
+    """
+    if dry_run:
+        runs: Iterable[Tuple[Optional[tuple], Iterable[types.Operation]]] = [(None, ops)]
+    else:
+        runs = itertools.groupby(ops, key=_batch_key)
+    for key, run in runs:
+        if key is None:
+            remaining: Iterable[types.Operation] = run
+        elif key[0] == types.OperationType.COPY:
+            remaining = _apply_batched_copies(list(run))
+        else:
+            remaining = _apply_batched_deletes(list(run))
+        for op in remaining:
+            _apply_operation(op, dry_run=dry_run, state=state)
+
+
+def _apply_operation(
+    op: types.Operation,
+    *,
+    dry_run: bool,
+    state: Optional[state_store.ProfileState]
+) -> None:
+    if op.type == types.OperationType.COPY:
+        _copy(op, dry_run=dry_run)
+    elif op.type == types.OperationType.DELETE:
+        _delete(op, dry_run=dry_run)
+    elif op.type == types.OperationType.MKDIR:
+        _mkdir(op, dry_run=dry_run)
+    elif op.type == types.OperationType.MERGE:
+        _merge(op, dry_run=dry_run, state=state)
+    else:  # pragma: no cover - unknown ops future-proofing
+        raise ExecutionError(f"Unsupported operation type: {op.type}")
+
+
+def _batch_key(op: types.Operation) -> Optional[tuple]:
+    """Return what op may be batched with, or None when it must run on its own."""
+    if _is_tar_batchable(op):
+        return (types.OperationType.COPY, op.source, op.destination)
+    if op.type == types.OperationType.DELETE and op.destination and op.destination.type == types.EndpointType.SSH:
+        return (types.OperationType.DELETE, op.destination)
+    return None
 
 
 def _copy(op: types.Operation, *, dry_run: bool) -> None:
     if not op.source or not op.destination:
         raise ExecutionError("COPY operation requires source and destination endpoints.")
-    src_root = Path(op.source.path)
-    dst_root = Path(op.destination.path)
+    src_root = op.source.path
+    dst_root = op.destination.path
     target_suffix = op.metadata.get("target_suffix") if op.metadata else None
     rel_path = target_suffix or op.path
 
@@ -118,10 +161,85 @@ def _copy(op: types.Operation, *, dry_run: bool) -> None:
         )
 
 
+def _apply_batched_copies(run: List[types.Operation]) -> List[types.Operation]:
+    """Send a run of copies between one local/SSH pair as a tar pipe or parallel uploads; return the rest."""
+    source, destination = run[0].source, run[0].destination
+    if len(run) < TAR_BATCH_MIN_FILES:
+        if source.type != types.EndpointType.LOCAL:
+            return run
+        uploaded = _upload_in_parallel(source, destination, run)
+        return [op for op in run if id(op) not in uploaded]
+    rel_paths = [op.path for op in run]
+    try:
+        if source.type == types.EndpointType.LOCAL:
+            remote_root = str(PurePosixPath(str(destination.path)))
+            _ensure_remote_dir(destination, remote_root)
+            ssh_copy.copy_batch_to_remote(
+                host=_require_host(destination),
+                local_root=source.path,
+                rel_paths=rel_paths,
+                remote_root=remote_root,
+                ssh_command=destination.ssh_command or "ssh",
+            )
+        else:
+            destination.path.mkdir(parents=True, exist_ok=True)
+            ssh_copy.copy_batch_from_remote(
+                host=_require_host(source),
+                remote_root=str(PurePosixPath(str(source.path))),
+                rel_paths=rel_paths,
+                local_root=destination.path,
+                ssh_command=source.ssh_command or "ssh",
+            )
+    except ssh_copy.RemoteCopyError as exc:
+        raise ExecutionError(str(exc)) from exc
+    return []
+
+
+def _upload_in_parallel(
+    source: types.Endpoint,
+    destination: types.Endpoint,
+    group: List[types.Operation],
+) -> set[int]:
+    """Upload the regular files in group concurrently; return the ids of the ops handled."""
+    src_root = source.path
+    files = [op for op in group if (src_root / op.path).is_file()]
+    if len(files) < 2:
+        return set()
+    dst_root = destination.path
+    targets = [_remote_path(dst_root, op.path) for op in files]
+    parents = sorted({str(PurePosixPath(target).parent) for target in targets})
+    _ensure_remote_dir(destination, *parents)
+    try:
+        ssh_copy.copy_many(
+            host=_require_host(destination),
+            transfers=[(src_root / op.path, target) for op, target in zip(files, targets)],
+            direction="to_remote",
+            max_conns=PARALLEL_COPY_CONNECTIONS,
+            scp_command=_scp_command(destination),
+        )
+    except ssh_copy.RemoteCopyError as exc:
+        raise ExecutionError(str(exc)) from exc
+    return {id(op) for op in files}
+
+
+def _is_tar_batchable(op: types.Operation) -> bool:
+    if op.type != types.OperationType.COPY or not op.source or not op.destination:
+        return False
+    if {op.source.type, op.destination.type} != {types.EndpointType.LOCAL, types.EndpointType.SSH}:
+        return False
+    meta = op.metadata or {}
+    # Renamed targets and symlinks keep their dedicated handling.
+    if meta.get("target_suffix") or meta.get("is_symlink"):
+        return False
+    if op.source.type == types.EndpointType.LOCAL:
+        return not (op.source.path / op.path).is_symlink()
+    return True
+
+
 def _delete(op: types.Operation, *, dry_run: bool) -> None:
     if not op.destination:
         raise ExecutionError("DELETE operation requires destination endpoint.")
-    dst_root = Path(op.destination.path)
+    dst_root = op.destination.path
     if op.destination.type == types.EndpointType.LOCAL:
         target = dst_root / op.path
         if dry_run or not target.exists():
@@ -133,25 +251,40 @@ def _delete(op: types.Operation, *, dry_run: bool) -> None:
     elif op.destination.type == types.EndpointType.SSH:
         if dry_run:
             return
-        remote_target = _remote_path(dst_root, op.path)
-        result = ssh_transport.run_ssh_command(
-            host=_require_host(op.destination),
-            remote_command=["rm", "-rf", remote_target],
-            ssh_command=op.destination.ssh_command or "ssh",
-        )
-        if result.exit_code != 0:
-            message = result.stderr.strip() or "Remote delete failed."
-            if result.prompt_detected or result.auth_failed:
-                message = "SSH authentication prompt detected; refusing to continue."
-            raise ExecutionError(message)
+        _delete_remote(op.destination, [_remote_path(dst_root, op.path)])
     else:
         raise ExecutionError("Unsupported destination endpoint for delete.")
 
 
+def _apply_batched_deletes(run: List[types.Operation]) -> List[types.Operation]:
+    """Remove a run of paths on one SSH endpoint with as few `rm -rf` calls as possible; return the rest."""
+    if len(run) < 2:
+        return run
+    destination = run[0].destination
+    targets = [_remote_path(destination.path, op.path) for op in run]
+    for start in range(0, len(targets), REMOTE_DELETE_BATCH_SIZE):
+        _delete_remote(destination, targets[start : start + REMOTE_DELETE_BATCH_SIZE])
+    return []
+
+
+def _delete_remote(endpoint: types.Endpoint, targets: List[str]) -> None:
+    result = ssh_transport.run_ssh_command(
+        host=_require_host(endpoint),
+        remote_command=["rm", "-rf", *targets],
+        ssh_command=endpoint.ssh_command or "ssh",
+        capture_stdout=False,
+    )
+    if result.exit_code != 0:
+        message = result.stderr.strip() or "Remote delete failed."
+        if result.prompt_detected or result.auth_failed:
+            message = "SSH authentication prompt detected; refusing to continue."
+        raise ExecutionError(message)
+
+
 def _mkdir(op: types.Operation, *, dry_run: bool) -> None:
     if not op.destination:
         raise ExecutionError("MKDIR operation requires destination endpoint.")
-    dst_root = Path(op.destination.path)
+    dst_root = op.destination.path
     if dry_run:
         return
     (dst_root / op.path).mkdir(parents=True, exist_ok=True)
@@ -188,6 +321,7 @@ def _copy_symlink_to_remote(
         host=_require_host(endpoint),
         remote_command=["sh", "-c", remote_cmd],
         ssh_command=endpoint.ssh_command or "ssh",
+        capture_stdout=False,
     )
     if result.exit_code != 0:
         message = result.stderr.strip() or "Failed to create remote symlink."
@@ -203,12 +337,13 @@ def _copy_remote_symlink_to_local(*, destination: Path, link_target: str | None)
     destination.symlink_to(link_target)
 
 
-def _ensure_remote_dir(endpoint: types.Endpoint, path: str) -> None:
-    cmd = f"mkdir -p {shlex.quote(path)}"
+def _ensure_remote_dir(endpoint: types.Endpoint, *paths: str) -> None:
+    cmd = "mkdir -p " + " ".join(shlex.quote(path) for path in paths)
     result = ssh_transport.run_ssh_command(
         host=_require_host(endpoint),
         remote_command=["sh", "-c", cmd],
         ssh_command=endpoint.ssh_command or "ssh",
+        capture_stdout=False,
     )
     if result.prompt_detected or result.auth_failed:
         raise ExecutionError("SSH authentication prompt detected; refusing to continue.")
@@ -270,36 +405,28 @@ def _relay_remote_copy(
     link_target = meta.get("link_target")
     if not is_symlink:
         # Fall back to querying the source to see if it's a symlink
-        remote_source = _remote_path(Path(source.path), path)
+        remote_source = _remote_path(source.path, path)
         is_symlink, link_target = _remote_symlink_info(
             types.Operation(type=types.OperationType.COPY, path=path, source=source, destination=destination),
             remote_source,
         )
 
     if is_symlink:
-        dest_remote = _remote_path(Path(destination.path), path)
+        dest_remote = _remote_path(destination.path, path)
         _copy_symlink_to_remote(destination=dest_remote, endpoint=destination, link_target=link_target)
         return
 
-    local_tmp = Path(tempfile.mkdtemp(prefix="simple_sync_relay"))
     try:
-        temp_file = local_tmp / Path(path).name
-        ssh_copy.copy_remote_to_local(
-            host=_require_host(source),
-            remote_path=_remote_path(Path(source.path), path),
-            local_path=temp_file,
-            scp_command=_scp_command(source),
-        )
-        ssh_copy.copy_local_to_remote(
-            host=_require_host(destination),
-            local_path=temp_file,
-            remote_path=_remote_path(Path(destination.path), path),
-            scp_command=_scp_command(destination),
+        ssh_copy.copy_remote_to_remote(
+            source_host=_require_host(source),
+            source_path=_remote_path(source.path, path),
+            destination_host=_require_host(destination),
+            destination_path=_remote_path(destination.path, path),
+            source_ssh_command=source.ssh_command or "ssh",
+            destination_ssh_command=destination.ssh_command or "ssh",
         )
     except ssh_copy.RemoteCopyError as exc:
         raise ExecutionError(str(exc)) from exc
-    finally:
-        shutil.rmtree(local_tmp, ignore_errors=True)
 
 
 def _merge(
@@ -319,8 +446,8 @@ def _merge(
         return
 
     # Get file contents from both endpoints
-    src_root = Path(op.source.path)
-    dst_root = Path(op.destination.path)
+    src_root = op.source.path
+    dst_root = op.destination.path
 
     try:
         content_a = _read_file_content(op.source, src_root, op.path)
@@ -420,20 +547,20 @@ def _write_file_content(endpoint: types.Endpoint, root: Path, path: str, content
             Path(tmp_path).unlink(missing_ok=True)
 
 
-def _parse_mtime(value: object) -> Optional[float]:
-    """Safely parse an mtime value to float, returning None if invalid."""
+def _parse_mtime_ns(value: object) -> Optional[int]:
+    """Safely parse an mtime_ns value to int, returning None if invalid."""
     try:
-        return float(value)  # type: ignore[arg-type]
+        return int(value)  # type: ignore[arg-type]
     except (TypeError, ValueError):
         return None
 
 
-def _stat_mtime(endpoint: types.Endpoint, rel_path: str) -> Optional[float]:
-    """Get the filesystem mtime for local endpoints."""
+def _stat_mtime_ns(endpoint: types.Endpoint, rel_path: str) -> Optional[int]:
+    """Get the filesystem mtime_ns for local endpoints."""
     if endpoint.type != types.EndpointType.LOCAL:
         return None
     try:
-        return (Path(endpoint.path) / rel_path).stat().st_mtime
+        return (endpoint.path / rel_path).stat().st_mtime_ns
     except FileNotFoundError:
         return None
     except OSError as exc:  # pragma: no cover - filesystem failure
@@ -446,14 +573,14 @@ def _resolve_newest_endpoints(op: types.Operation) -> tuple[types.Endpoint, type
     if not op.source or not op.destination:
         raise ExecutionError("MERGE fallback requires source and destination endpoints.")
 
-    source_mtime = _parse_mtime(op.metadata.get("source_mtime"))
-    destination_mtime = _parse_mtime(op.metadata.get("destination_mtime"))
+    source_mtime = _parse_mtime_ns(op.metadata.get("source_mtime_ns"))
+    destination_mtime = _parse_mtime_ns(op.metadata.get("destination_mtime_ns"))
 
     # Fall back to checking the local filesystem if metadata is missing
     if source_mtime is None:
-        source_mtime = _stat_mtime(op.source, op.path)
+        source_mtime = _stat_mtime_ns(op.source, op.path)
     if destination_mtime is None:
-        destination_mtime = _stat_mtime(op.destination, op.path)
+        destination_mtime = _stat_mtime_ns(op.destination, op.path)
 
     if destination_mtime is None or (source_mtime is not None and source_mtime >= destination_mtime):
         return op.source, op.destination
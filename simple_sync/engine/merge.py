@@ -5,6 +5,7 @@ from __future__ import annotations
 import difflib
 import mimetypes
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -24,32 +25,39 @@ class MergeResult:
             object.__setattr__(self, "conflicts", [])
 
 
+# Common text file extensions, compared against the lower-cased suffix.
+_TEXT_EXTENSIONS = frozenset({
+    ".md", ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".c", ".cpp", ".h", ".hpp",
+    ".cs", ".rb", ".go", ".rs", ".php", ".html", ".css", ".scss", ".sass", ".less",
+    ".xml", ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", ".sh", ".bash",
+    ".zsh", ".fish", ".sql", ".r", ".R", ".m", ".swift", ".kt", ".scala", ".clj",
+    ".hs", ".ml", ".ex", ".exs", ".erl", ".pl", ".pm", ".lua", ".vim", ".el",
+    ".tex", ".rst", ".adoc", ".org", ".cmake", ".gradle", ".properties", ".env",
+    ".gitignore", ".dockerignore", ".editorconfig", ".eslintrc", ".prettierrc",
+})
+
+
 def is_text_file(path: str | Path) -> bool:
     """Determine if a file is likely a text file based on extension."""
-    # Common text file extensions
-    text_extensions = {
-        ".md", ".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".c", ".cpp", ".h", ".hpp",
-        ".cs", ".rb", ".go", ".rs", ".php", ".html", ".css", ".scss", ".sass", ".less",
-        ".xml", ".json", ".yaml", ".yml", ".toml", ".ini", ".cfg", ".conf", ".sh", ".bash",
-        ".zsh", ".fish", ".sql", ".r", ".R", ".m", ".swift", ".kt", ".scala", ".clj",
-        ".hs", ".ml", ".ex", ".exs", ".erl", ".pl", ".pm", ".lua", ".vim", ".el",
-        ".tex", ".rst", ".adoc", ".org", ".cmake", ".gradle", ".properties", ".env",
-        ".gitignore", ".dockerignore", ".editorconfig", ".eslintrc", ".prettierrc",
-    }
-
     path_obj = Path(path) if isinstance(path, str) else path
-    suffix = path_obj.suffix.lower()
+    return _is_text_name(path_obj.name)
+
+
+@lru_cache(maxsize=4096)
+def _is_text_name(name: str) -> bool:
+    # Only the file name matters, so a tree full of repeated names hits the cache.
+    suffix = Path(name).suffix.lower()
 
     # Avoid merging generic .txt files; they're often user content better handled by policy
     if suffix == ".txt":
         return False
 
     # Check extension
-    if suffix in text_extensions:
+    if suffix in _TEXT_EXTENSIONS:
         return True
 
     # Check mimetype
-    mime_type, _ = mimetypes.guess_type(str(path_obj))
+    mime_type, _ = mimetypes.guess_type(name)
     if mime_type and mime_type.startswith("text/"):
         return True
 
@@ -58,9 +66,8 @@ def is_text_file(path: str | Path) -> bool:
 
 def is_binary_content(content: bytes) -> bool:
     """Check if content appears to be binary by looking for null bytes."""
-    # Check first 8KB for null bytes (standard heuristic)
-    sample_size = min(8192, len(content))
-    return b'\x00' in content[:sample_size]
+    # Check first 8KB for null bytes (standard heuristic); find() bounds the scan without slicing a copy.
+    return content.find(b"\x00", 0, 8192) != -1
 
 
 def merge_three_way(base: str, current_a: str, current_b: str) -> MergeResult:
@@ -75,24 +82,17 @@ def merge_three_way(base: str, current_a: str, current_b: str) -> MergeResult:
     Returns:
         MergeResult indicating success or failure with merged content
     """
+    # Identical sides, or one side unchanged from base: no diff needed
+    if current_a == current_b or current_b == base:
+        return MergeResult(success=True, content=current_a)
+    if current_a == base:
+        return MergeResult(success=True, content=current_b)
+
     # Split into lines for diffing
     base_lines = base.splitlines(keepends=True)
     a_lines = current_a.splitlines(keepends=True)
     b_lines = current_b.splitlines(keepends=True)
 
-    # Use difflib.Differ to find differences
-    differ = difflib.Differ()
-
-    # Compute diffs from base to each version
-    diff_a = list(difflib.unified_diff(base_lines, a_lines, lineterm=''))
-    diff_b = list(difflib.unified_diff(base_lines, b_lines, lineterm=''))
-
-    # If one side is unchanged, use the other side
-    if not diff_a or len(diff_a) <= 2:  # unified_diff header is 2 lines
-        return MergeResult(success=True, content=current_b)
-    if not diff_b or len(diff_b) <= 2:
-        return MergeResult(success=True, content=current_a)
-
     # Try automatic merge using difflib.merge
     try:
         merged_lines = _merge_lines(base_lines, a_lines, b_lines)
@@ -4,13 +4,28 @@ from __future__ import annotations
 
 import time
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
 
 from simple_sync import types
 from simple_sync.engine import state_store
 
 
-@dataclass
+# Reasons attached to planned operations and conflicts.
+REASON_NEW_OR_MODIFIED_ON_A = "new_or_modified_on_a"
+REASON_NEW_OR_MODIFIED_ON_B = "new_or_modified_on_b"
+REASON_MODIFIED_ON_A = "modified_on_a"
+REASON_MODIFIED_ON_B = "modified_on_b"
+REASON_DELETED_ON_A = "deleted_on_a"
+REASON_DELETED_ON_B = "deleted_on_b"
+REASON_MERGE_ATTEMPT = "merge_attempt"
+REASON_NEWEST_WINS = "newest_wins"
+REASON_PREFER_POLICY = "prefer_policy"
+REASON_MANUAL_COPY_BOTH = "manual_copy_both"
+REASON_MANUAL_COPY_BOTH_COPY = "manual_copy_both_copy"
+REASON_BOTH_MODIFIED = "both_modified"
+
+
+@dataclass(slots=True)
 class PlannerInput:
     profile: str
     snapshot_a: Dict[str, types.FileEntry]
@@ -23,9 +38,10 @@ class PlannerInput:
     manual_behavior: str | None = None
     merge_text_files: bool = True
     merge_fallback: str = "newest"
+    clock: Callable[[], float] = time.time
 
 
-@dataclass
+@dataclass(slots=True)
 class PlannerOutput:
     operations: List[types.Operation] = field(default_factory=list)
     conflicts: List[types.Conflict] = field(default_factory=list)
@@ -47,11 +63,14 @@ def plan(input_data: PlannerInput) -> PlannerOutput:
     for entries in input_data.state.endpoints.values():
         state_paths.update(entries.keys())
     all_paths = set(input_data.snapshot_a.keys()) | set(input_data.snapshot_b.keys()) | state_paths
+    # Snapshot and state keys are already normalized, so the per-endpoint tables are probed directly.
+    stored_a = input_data.state.endpoints.get(input_data.endpoint_a.id, {})
+    stored_b = input_data.state.endpoints.get(input_data.endpoint_b.id, {})
     for path in sorted(all_paths):
         entry_a = input_data.snapshot_a.get(path)
         entry_b = input_data.snapshot_b.get(path)
-        last_a = state_store.get_last_entry(input_data.state, input_data.endpoint_a.id, path)
-        last_b = state_store.get_last_entry(input_data.state, input_data.endpoint_b.id, path)
+        last_a = stored_a.get(path)
+        last_b = stored_b.get(path)
         _classify_path(
             out,
             path,
@@ -66,6 +85,7 @@ def plan(input_data: PlannerInput) -> PlannerOutput:
             input_data.manual_behavior,
             input_data.merge_text_files,
             input_data.merge_fallback,
+            input_data.clock,
         )
     return out
 
@@ -84,6 +104,7 @@ def _classify_path(
     manual_behavior: str | None,
     merge_text_files: bool = True,
     merge_fallback: str = "newest",
+    clock: Callable[[], float] = time.time,
 ) -> None:
     if entry_a and not entry_b:
         if _changed_since_last(entry_a, last_a) or last_b is None:
@@ -93,7 +114,7 @@ def _classify_path(
                     path=path,
                     source=endpoint_a,
                     destination=endpoint_b,
-                    metadata={**{"reason": "new_or_modified_on_a"}, **_symlink_metadata(entry_a)},
+                    metadata={"reason": REASON_NEW_OR_MODIFIED_ON_A, **_symlink_metadata(entry_a)},
                 )
             )
         else:
@@ -102,7 +123,7 @@ def _classify_path(
                     type=types.OperationType.DELETE,
                     path=path,
                     destination=endpoint_a,
-                    metadata={"reason": "deleted_on_b"},
+                    metadata={"reason": REASON_DELETED_ON_B},
                 )
             )
     elif entry_b and not entry_a:
@@ -113,7 +134,7 @@ def _classify_path(
                     path=path,
                     source=endpoint_b,
                     destination=endpoint_a,
-                    metadata={**{"reason": "new_or_modified_on_b"}, **_symlink_metadata(entry_b)},
+                    metadata={"reason": REASON_NEW_OR_MODIFIED_ON_B, **_symlink_metadata(entry_b)},
                 )
             )
         else:
@@ -122,7 +143,7 @@ def _classify_path(
                     type=types.OperationType.DELETE,
                     path=path,
                     destination=endpoint_b,
-                    metadata={"reason": "deleted_on_a"},
+                    metadata={"reason": REASON_DELETED_ON_A},
                 )
             )
     elif entry_a and entry_b:
@@ -154,12 +175,12 @@ def _classify_path(
                         source=endpoint_a,
                         destination=endpoint_b,
                         metadata={
-                            "reason": "merge_attempt",
+                            "reason": REASON_MERGE_ATTEMPT,
                             "fallback_policy": merge_fallback,
                             "fallback_prefer": prefer_endpoint,
                             "fallback_manual_behavior": manual_behavior,
-                            "source_mtime": entry_a.mtime,
-                            "destination_mtime": entry_b.mtime,
+                            "source_mtime_ns": entry_a.mtime_ns,
+                            "destination_mtime_ns": entry_b.mtime_ns,
                         },
                     )
                 )
@@ -172,7 +193,7 @@ def _classify_path(
                         source=winner,
                         destination=loser,
                         metadata={
-                            **{"reason": "newest_wins"},
+                            "reason": REASON_NEWEST_WINS,
                             **_symlink_metadata(entry_a if winner is endpoint_a else entry_b),
                         },
                     )
@@ -186,13 +207,13 @@ def _classify_path(
                         source=winner,
                         destination=loser,
                         metadata={
-                            **{"reason": "prefer_policy"},
+                            "reason": REASON_PREFER_POLICY,
                             **_symlink_metadata(entry_a if winner is endpoint_a else entry_b),
                         },
                     )
                 )
             elif policy == "manual" and manual_behavior == "copy_both":
-                timestamp = int(time.time())
+                timestamp = int(clock())
                 out.operations.extend(
                     _copy_both_operations(path, endpoint_a, endpoint_b, entry_a, entry_b, timestamp=timestamp)
                 )
@@ -200,7 +221,7 @@ def _classify_path(
                     types.Conflict(
                         path=path,
                         endpoints=(endpoint_a, endpoint_b),
-                        reason="manual_copy_both",
+                        reason=REASON_MANUAL_COPY_BOTH,
                         metadata={"resolution": "copy_both", "timestamp": timestamp},
                     )
                 )
@@ -209,7 +230,7 @@ def _classify_path(
                     types.Conflict(
                         path=path,
                         endpoints=(endpoint_a, endpoint_b),
-                        reason="both_modified",
+                        reason=REASON_BOTH_MODIFIED,
                         metadata={"a": entry_a, "b": entry_b},
                     )
                 )
@@ -220,7 +241,7 @@ def _classify_path(
                     path=path,
                     source=endpoint_a,
                     destination=endpoint_b,
-                    metadata={**{"reason": "modified_on_a"}, **_symlink_metadata(entry_a)},
+                    metadata={"reason": REASON_MODIFIED_ON_A, **_symlink_metadata(entry_a)},
                 )
             )
         elif _changed_since_last(entry_b, last_b):
@@ -230,7 +251,7 @@ def _classify_path(
                     path=path,
                     source=endpoint_b,
                     destination=endpoint_a,
-                    metadata={**{"reason": "modified_on_b"}, **_symlink_metadata(entry_b)},
+                    metadata={"reason": REASON_MODIFIED_ON_B, **_symlink_metadata(entry_b)},
                 )
             )
     else:
@@ -241,7 +262,7 @@ def _classify_path(
                     type=types.OperationType.DELETE,
                     path=path,
                     destination=endpoint_a,
-                    metadata={"reason": "deleted_on_a"},
+                    metadata={"reason": REASON_DELETED_ON_A},
                 )
             )
         if last_b:
@@ -250,7 +271,7 @@ def _classify_path(
                     type=types.OperationType.DELETE,
                     path=path,
                     destination=endpoint_b,
-                    metadata={"reason": "deleted_on_b"},
+                    metadata={"reason": REASON_DELETED_ON_B},
                 )
             )
 
@@ -261,7 +282,7 @@ def _entries_equal(a: types.FileEntry, b: types.FileEntry) -> bool:
         and a.is_symlink == b.is_symlink
         and (a.link_target or "") == (b.link_target or "")
         and (a.size == b.size)
-        and (int(a.mtime) == int(b.mtime))
+        and (a.mtime_ns // types.NS_PER_SECOND == b.mtime_ns // types.NS_PER_SECOND)
     )
 
 
@@ -276,7 +297,7 @@ def _changed_since_last(entry: types.FileEntry, last: state_store.StoredEntry |
         return True
     if entry.size != last.size:
         return True
-    if int(entry.mtime) != int(last.mtime):
+    if entry.mtime_ns // types.NS_PER_SECOND != last.mtime_ns // types.NS_PER_SECOND:
         return True
     return False
 
@@ -287,7 +308,7 @@ def _choose_newest(
     endpoint_a: types.Endpoint,
     endpoint_b: types.Endpoint,
 ) -> tuple[types.Endpoint, types.Endpoint]:
-    if entry_a.mtime >= entry_b.mtime:
+    if entry_a.mtime_ns >= entry_b.mtime_ns:
         return endpoint_a, endpoint_b
     return endpoint_b, endpoint_a
 
@@ -324,7 +345,7 @@ def _copy_both_operations(
             source=endpoint_a,
             destination=endpoint_b,
             metadata={
-                "reason": "manual_copy_both_copy",
+                "reason": REASON_MANUAL_COPY_BOTH_COPY,
                 "target_suffix": suffix_a,
                 **_symlink_metadata(entry_a),
             },
@@ -337,7 +358,7 @@ def _copy_both_operations(
             source=endpoint_b,
             destination=endpoint_a,
             metadata={
-                "reason": "manual_copy_both_copy",
+                "reason": REASON_MANUAL_COPY_BOTH_COPY,
                 "target_suffix": suffix_b,
                 **_symlink_metadata(entry_b),
             },
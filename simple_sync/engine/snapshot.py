@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import contextvars
 import fnmatch
 import os
+import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Sequence
+from typing import Dict, Iterable, Optional, Pattern, Sequence
 
 from simple_sync import types
 from simple_sync.ssh import listing
@@ -16,7 +20,7 @@ class SnapshotError(RuntimeError):
     """Raised when building a snapshot fails."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SnapshotResult:
     root: Path
     entries: Dict[str, types.FileEntry]
@@ -35,51 +39,73 @@ def build_snapshot(
         raise SnapshotError(f"Snapshot root {base} is not a directory.")
 
     entries: Dict[str, types.FileEntry] = {}
-    resolved_ignore = tuple(ignore_patterns or [])
-
-    for current_root, dirs, files in os.walk(base):
-        current_path = Path(current_root)
-        rel_dir = current_path.relative_to(base)
-        rel_str = "." if str(rel_dir) == "." else rel_dir.as_posix()
-        if rel_str != "." and _is_ignored(rel_str, resolved_ignore):
-            dirs[:] = []
-            continue
-        if rel_str != ".":
-            entries[rel_str] = _make_entry(current_path, rel_str, is_dir=True)
-
-        dirs[:] = [d for d in dirs if not _is_ignored(_join_rel(rel_dir, d), resolved_ignore)]
-        for name in files:
-            rel_file = _join_rel(rel_dir, name)
-            if _is_ignored(rel_file, resolved_ignore):
-                continue
-            file_path = current_path / name
-            entries[rel_file] = _make_entry(file_path, rel_file, is_dir=False)
+    resolved_ignore = _compile_ignore(ignore_patterns)
+
+    # scandir hands back DirEntry objects whose type and lstat data come from the
+    # directory read itself, so each entry costs at most one stat call.
+    pending = [(str(base), "")]
+    while pending:
+        current_path, rel_dir = pending.pop()
+        try:
+            iterator = os.scandir(current_path)
+        except OSError:
+            continue  # unreadable directories are skipped, as os.walk did
+        with iterator:
+            for dir_entry in iterator:
+                rel_path = _join_rel(rel_dir, dir_entry.name)
+                if _is_ignored(rel_path, resolved_ignore):
+                    continue
+                entry = _make_entry(dir_entry, rel_path)
+                entries[rel_path] = entry
+                if entry.is_dir:
+                    pending.append((dir_entry.path, rel_path))
 
     return SnapshotResult(root=base, entries=entries)
 
 
-def _join_rel(base: Path, child: str) -> str:
-    if str(base) == ".":
-        return child
-    return Path(base, child).as_posix()
+def _join_rel(base: str, child: str) -> str:
+    return f"{base}/{child}" if base else child
+
+
+def _compile_ignore(patterns: Sequence[str] | None) -> Optional[Pattern[str]]:
+    """Fold all ignore globs into a single regex so each path is matched once."""
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns), flags)
+
+
+def _is_ignored(rel_path: str, matcher: Optional[Pattern[str]]) -> bool:
+    return matcher is not None and matcher.match(rel_path) is not None
 
 
-def _is_ignored(rel_path: str, patterns: Sequence[str]) -> bool:
-    return any(fnmatch.fnmatch(rel_path, pattern) for pattern in patterns)
+def snapshot_entry(root: Path | str, rel_path: str) -> Optional[types.FileEntry]:
+    """Return the entry build_snapshot would record for one path under root, or None if it is gone."""
+    path = os.path.join(root, rel_path)
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    return _entry_from_stat(st, path, types.normalize_relative_path(rel_path))
 
 
-def _make_entry(path: Path, rel_path: str, *, is_dir: bool) -> types.FileEntry:
-    stat = path.lstat()  # never follow links; works for dangling symlinks
-    is_symlink = path.is_symlink()
+def _make_entry(dir_entry: os.DirEntry, rel_path: str) -> types.FileEntry:
+    # never follow links; works for dangling symlinks
+    return _entry_from_stat(dir_entry.stat(follow_symlinks=False), dir_entry.path, rel_path)
+
+
+def _entry_from_stat(st: os.stat_result, path: str, rel_path: str) -> types.FileEntry:
+    is_symlink = stat.S_ISLNK(st.st_mode)
     link_target = os.readlink(path) if is_symlink else None
-    if is_symlink:
-        is_dir = False  # treat symlinks as files for planning purposes
-    size = 0 if (is_dir or is_symlink) else stat.st_size
-    return types.FileEntry(
+    # symlinks are treated as files for planning purposes; an lstat never reports a link as a directory
+    is_dir = stat.S_ISDIR(st.st_mode)
+    size = 0 if (is_dir or is_symlink) else st.st_size
+    # rel_path is already normalized by the caller.
+    return types.FileEntry.unchecked(
         path=rel_path,
         is_dir=is_dir,
         size=size,
-        mtime=stat.st_mtime,
+        mtime_ns=st.st_mtime_ns,
         is_symlink=is_symlink,
         link_target=link_target,
     )
@@ -97,7 +123,7 @@ def build_snapshot_for_endpoint(
     if endpoint.type == types.EndpointType.SSH:
         if not endpoint.host:
             raise SnapshotError(f"Endpoint '{endpoint.id}' is missing host information.")
-        resolved_ignore = tuple(ignore_patterns or [])
+        resolved_ignore = _compile_ignore(ignore_patterns)
         entries = listing.list_remote_entries(
             host=endpoint.host,
             root=str(endpoint.path),
@@ -108,8 +134,45 @@ def build_snapshot_for_endpoint(
             if rel_path == "." or _is_ignored(rel_path, resolved_ignore):
                 continue
             filtered[rel_path] = entry
-        return SnapshotResult(root=Path(endpoint.path), entries=filtered)
+        return SnapshotResult(root=endpoint.path, entries=filtered)
     raise SnapshotError(f"Unsupported endpoint type: {endpoint.type}")
 
 
-__all__ = ["SnapshotError", "SnapshotResult", "build_snapshot", "build_snapshot_for_endpoint"]
+def build_snapshots_for_endpoints(
+    endpoints: Sequence[types.Endpoint],
+    *,
+    ignore_patterns: Sequence[str] | None = None,
+) -> list[SnapshotResult]:
+    """Snapshot several endpoints concurrently, returning results in the same order.
+
+    Remote listings are mostly network wait and local walks mostly syscalls, so
+    overlapping them makes the total time track the slowest endpoint.
+    """
+    if len(endpoints) < 2:
+        return [
+            build_snapshot_for_endpoint(endpoint, ignore_patterns=ignore_patterns, ssh_command=endpoint.ssh_command)
+            for endpoint in endpoints
+        ]
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        futures = [
+            # Each task runs in a copy of the caller's context (e.g. the daemon's per-profile log tag).
+            pool.submit(
+                contextvars.copy_context().run,
+                build_snapshot_for_endpoint,
+                endpoint,
+                ignore_patterns=ignore_patterns,
+                ssh_command=endpoint.ssh_command,
+            )
+            for endpoint in endpoints
+        ]
+        return [future.result() for future in futures]
+
+
+__all__ = [
+    "SnapshotError",
+    "SnapshotResult",
+    "build_snapshot",
+    "build_snapshot_for_endpoint",
+    "build_snapshots_for_endpoints",
+    "snapshot_entry",
+]
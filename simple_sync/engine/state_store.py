@@ -3,34 +3,41 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is the fallback
+    orjson = None
 
 from simple_sync import config, types
 
-STATE_VERSION = 4
+STATE_VERSION = 5
 
 
 class StateStoreError(RuntimeError):
     """Raised when state files cannot be read or parsed."""
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredEntry:
     """Metadata persisted for each file in the last sync."""
 
     path: str
     is_dir: bool
     size: int
-    mtime: float
+    mtime_ns: int
     is_symlink: bool = False
     link_target: Optional[str] = None
     hash: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConflictRecord:
     path: str
     reason: str
@@ -40,7 +47,7 @@ class ConflictRecord:
     metadata: Dict[str, object] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProfileState:
     profile: str
     endpoints: Dict[str, Dict[str, StoredEntry]] = field(default_factory=dict)
@@ -51,7 +58,18 @@ class ProfileState:
             "version": STATE_VERSION,
             "profile": self.profile,
             "endpoints": {
-                endpoint: {path: asdict(entry) for path, entry in entries.items()}
+                endpoint: {
+                    path: {
+                        "path": entry.path,
+                        "is_dir": entry.is_dir,
+                        "size": entry.size,
+                        "mtime_ns": entry.mtime_ns,
+                        "is_symlink": entry.is_symlink,
+                        "link_target": entry.link_target,
+                        "hash": entry.hash,
+                    }
+                    for path, entry in entries.items()
+                }
                 for endpoint, entries in self.endpoints.items()
             },
             "conflicts": [
@@ -70,7 +88,7 @@ class ProfileState:
     @classmethod
     def from_dict(cls, payload: Dict[str, object]) -> "ProfileState":
         version = payload.get("version", 1)
-        if version not in {1, 2, 3, STATE_VERSION}:
+        if version not in {1, 2, 3, 4, STATE_VERSION}:
             raise StateStoreError("Unsupported state file version.")
         profile = payload.get("profile")
         if not isinstance(profile, str):
@@ -84,11 +102,13 @@ class ProfileState:
                     for path, entry_data in entries.items():
                         if not isinstance(entry_data, dict):
                             continue
+                        path = sys.intern(path)
+                        stored_path = entry_data.get("path", path)
                         endpoint_entries[path] = StoredEntry(
-                            path=entry_data.get("path", path),
+                            path=path if stored_path == path else stored_path,
                             is_dir=bool(entry_data.get("is_dir", False)),
                             size=int(entry_data.get("size", 0)),
-                            mtime=float(entry_data.get("mtime", 0.0)),
+                            mtime_ns=_entry_mtime_ns(entry_data, version),
                             is_symlink=bool(entry_data.get("is_symlink", False)),
                             link_target=entry_data.get("link_target"),
                             hash=entry_data.get("hash"),
@@ -124,8 +144,9 @@ def load_state(profile_name: str, base_dir: Path | None = None) -> ProfileState:
     if not path.exists():
         return ProfileState(profile=profile_name)
     try:
-        payload = json.loads(path.read_text())
-    except json.JSONDecodeError as exc:
+        data = path.read_bytes()
+        payload = orjson.loads(data) if orjson is not None else json.loads(data)
+    except json.JSONDecodeError as exc:  # orjson.JSONDecodeError subclasses this
         raise StateStoreError(f"Failed to parse state file {path}: {exc}") from exc
     except OSError as exc:  # pragma: no cover - filesystem failure
         raise StateStoreError(f"Unable to read state file {path}: {exc}") from exc
@@ -136,8 +157,25 @@ def save_state(state: ProfileState, base_dir: Path | None = None) -> Path:
     """Persist profile state to the state/ directory."""
     base = config.ensure_config_structure(base_dir)
     path = _state_path(base, state.profile)
-    data = json.dumps(state.to_dict(), indent=2, sort_keys=True)
-    path.write_text(data + "\n")
+    tmp_path = path.with_name(path.name + ".tmp")
+    replaced = False
+    try:
+        # Entries are serialized in insertion order; callers record them sorted by path.
+        if orjson is not None:
+            tmp_path.write_bytes(orjson.dumps(state.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        else:
+            # Stream the encoder output straight to disk rather than building one large string.
+            with tmp_path.open("w") as handle:
+                json.dump(state.to_dict(), handle, indent=2)
+                handle.write("\n")
+        os.replace(tmp_path, path)
+        replaced = True
+    except OSError as exc:  # pragma: no cover - filesystem failure
+        raise StateStoreError(f"Unable to write state file {path}: {exc}") from exc
+    finally:
+        # Any failure, including an encoder error part-way through, must not leave a partial temp file.
+        if not replaced:
+            tmp_path.unlink(missing_ok=True)
     return path
 
 
@@ -152,13 +190,27 @@ def record_entry(
         path=normalized_path,
         is_dir=entry.is_dir,
         size=entry.size,
-        mtime=entry.mtime,
+        mtime_ns=entry.mtime_ns,
         is_symlink=entry.is_symlink,
         link_target=entry.link_target,
         hash=entry.hash,
     )
 
 
+def record_entries(
+    state: ProfileState,
+    endpoint_id: str,
+    entries: Iterable[types.FileEntry],
+) -> None:
+    """Store metadata for many entries of one endpoint, in iteration order (bulk record_entry)."""
+    stored = state.endpoints.setdefault(endpoint_id, {})
+    for entry in entries:
+        path = entry.path
+        stored[path] = StoredEntry(
+            path, entry.is_dir, entry.size, entry.mtime_ns, entry.is_symlink, entry.link_target, entry.hash
+        )
+
+
 def record_conflict(
     state: ProfileState,
     *,
@@ -191,6 +243,13 @@ def get_last_entry(
     return state.endpoints.get(endpoint_id, {}).get(normalized)
 
 
+def _entry_mtime_ns(entry_data: Dict[str, object], version: int) -> int:
+    if version < 5:
+        # Older state files stored float seconds.
+        return int(float(entry_data.get("mtime", 0.0)) * types.NS_PER_SECOND)
+    return int(entry_data.get("mtime_ns", 0))
+
+
 def _state_path(base: Path, profile_name: str) -> Path:
     safe_name = profile_name.replace("/", "_")
     return base / "state" / f"{safe_name}.json"
@@ -204,6 +263,7 @@ __all__ = [
     "get_last_entry",
     "load_state",
     "record_conflict",
+    "record_entries",
     "record_entry",
     "save_state",
 ]
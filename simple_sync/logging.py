@@ -7,6 +7,7 @@ import sys
 from typing import TextIO
 
 DEFAULT_LEVEL = logging.INFO
+LOG_FORMAT = "[%(levelname)s] %(message)s"
 VERBOSITY_TO_LEVEL = {
     -2: logging.ERROR,
     -1: logging.WARNING,
@@ -20,18 +21,34 @@ def _level_for_counts(verbose: int = 0, quiet: int = 0) -> int:
     return VERBOSITY_TO_LEVEL.get(delta, logging.DEBUG if delta > 0 else logging.ERROR)
 
 
-def configure_logging(*, verbose: int = 0, quiet: int = 0, stream: TextIO | None = None) -> None:
-    """Configure root logging for CLI usage."""
-    level = _level_for_counts(verbose, quiet)
-    handler_stream = stream or sys.stderr
-
-    root_logger = logging.getLogger()
-    root_logger.handlers.clear()
-
-    handler = logging.StreamHandler(handler_stream)
-    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
-    root_logger.addHandler(handler)
-    root_logger.setLevel(level)
+# Name of the root handler owned by configure_logging, so repeat calls can find and reuse it.
+_HANDLER_NAME = "simple_sync.cli"
+
+
+def configure_logging(
+    *,
+    verbose: int = 0,
+    quiet: int = 0,
+    stream: TextIO | None = None,
+    logger: logging.Logger | None = None,
+) -> None:
+    """Configure root logging (or the given logger) for CLI usage."""
+    root = logger if logger is not None else logging.getLogger()
+    handlers = root.handlers
+    if len(handlers) == 1 and handlers[0].get_name() == _HANDLER_NAME:
+        # Already set up by an earlier call: only the destination and level can differ.
+        handler = handlers[0]
+    else:
+        for handler in handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        handler = logging.StreamHandler()
+        handler.set_name(_HANDLER_NAME)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    # Resolved per call, so a caller that has redirected sys.stderr gets the current one.
+    handler.setStream(stream if stream is not None else sys.stderr)
+    root.setLevel(_level_for_counts(verbose, quiet))
 
 
 __all__ = ["configure_logging"]
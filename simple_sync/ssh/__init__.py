@@ -1,14 +1,25 @@
 """SSH helpers for simple_sync."""
 
-from .commands import BEGIN_MARKER, END_MARKER, MarkerResult, run_with_markers, wrap_remote_command
-from .copy import RemoteCopyError, copy_local_to_remote, copy_remote_to_local
+from .commands import BEGIN_MARKER, END_MARKER, MarkerResult, iter_marker_body, run_with_markers, wrap_remote_command
+from .copy import (
+    RemoteCopyError,
+    copy_batch_from_remote,
+    copy_batch_to_remote,
+    copy_local_to_remote,
+    copy_many,
+    copy_remote_to_local,
+)
 from .listing import RemoteListingError, list_remote_entries
-from .transport import SSHCommandError, SSHResult, run_ssh_command
+from .transport import SSHCommandError, SSHResult, SSHStream, build_ssh_command, open_ssh_stream, run_ssh_command
 
 __all__ = [
     "SSHCommandError",
     "SSHResult",
+    "SSHStream",
+    "build_ssh_command",
     "MarkerResult",
+    "iter_marker_body",
+    "open_ssh_stream",
     "run_ssh_command",
     "run_with_markers",
     "wrap_remote_command",
@@ -17,6 +28,9 @@ __all__ = [
     "RemoteListingError",
     "list_remote_entries",
     "RemoteCopyError",
+    "copy_batch_from_remote",
+    "copy_batch_to_remote",
     "copy_local_to_remote",
+    "copy_many",
     "copy_remote_to_local",
 ]
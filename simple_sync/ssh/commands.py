@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+import shlex
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Iterable, Iterator, List, Sequence
 
 from .transport import SSHResult, run_ssh_command
 
 BEGIN_MARKER = "__SS_BEGIN__"
 END_MARKER = "__SS_END__"
+_BEGIN_LINE = f"{BEGIN_MARKER}\n".encode()
+_BEGIN_PRINTF = f"printf '%s\\n' {BEGIN_MARKER}"
+_END_PRINTF = f"printf '%s\\n' {END_MARKER}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MarkerResult:
     exit_code: int
     body: str
@@ -19,10 +23,9 @@ class MarkerResult:
 
 
 def wrap_remote_command(command: Sequence[str]) -> List[str]:
-    """Inject marker printing around a command."""
-    prefix = ["printf", f"{BEGIN_MARKER}\\n"]
-    suffix = ["printf", f"{END_MARKER}\\n"]
-    return ["sh", "-c", " ".join(_quote_segment(segment) for segment in [*prefix, *command, *suffix])]
+    """Inject marker printing around a command, preserving its exit status."""
+    quoted = " ".join(shlex.quote(segment) for segment in command)
+    return ["sh", "-c", f"{_BEGIN_PRINTF}; {quoted}; status=$?; {_END_PRINTF}; exit $status"]
 
 
 def run_with_markers(
@@ -41,23 +44,47 @@ def run_with_markers(
     )
 
 
-def _extract_between_markers(stdout: str) -> str:
-    lines = stdout.splitlines()
-    capturing = False
-    body_lines: List[str] = []
-    for line in lines:
-        if not capturing:
-            if line.strip() == BEGIN_MARKER:
-                capturing = True
-            continue
-        if line.strip() == END_MARKER:
+def iter_marker_body(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield streamed output that follows the begin marker line.
+
+    Banner noise before the marker is dropped. The end marker is passed through
+    untouched, so callers should use a self-delimiting format and ignore the tail.
+    """
+    chunks = iter(chunks)
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        index = pending.find(_BEGIN_LINE)
+        if index >= 0:
+            remainder = pending[index + len(_BEGIN_LINE) :]
+            if remainder:
+                yield remainder
             break
-        body_lines.append(line)
-    return "\n".join(body_lines).strip()
-
+        # Keep just enough bytes to recognise a marker split across chunks.
+        pending = pending[-len(_BEGIN_LINE) :]
+    else:
+        return
+    yield from chunks
 
-def _quote_segment(segment: str) -> str:
-    return segment if segment.startswith("$") else f"'{segment}'"
 
-
-__all__ = ["MarkerResult", "wrap_remote_command", "run_with_markers", "BEGIN_MARKER", "END_MARKER"]
+def _extract_between_markers(stdout: str) -> str:
+    begin = stdout.find(BEGIN_MARKER)
+    if begin < 0:
+        return ""
+    begin = stdout.find("\n", begin)
+    if begin < 0:
+        return ""
+    end = stdout.rfind(END_MARKER, begin)
+    if end < 0:
+        end = len(stdout)
+    return stdout[begin + 1 : end].strip()
+
+
+__all__ = [
+    "MarkerResult",
+    "iter_marker_body",
+    "wrap_remote_command",
+    "run_with_markers",
+    "BEGIN_MARKER",
+    "END_MARKER",
+]
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import contextvars
+import queue
+import secrets
 import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Literal, Sequence, Tuple
+
+from .transport import CLOSE_FDS, build_ssh_command, contains_prompt, multiplex_args
 
 
 class RemoteCopyError(RuntimeError):
@@ -46,12 +53,216 @@ def copy_remote_to_local(
     _run_command(cmd)
 
 
+def copy_many(
+    *,
+    host: str,
+    transfers: Iterable[Tuple[Path | str, str]],
+    direction: Literal["to_remote", "from_remote"],
+    max_conns: int = 4,
+    scp_command: Sequence[str] | str = "scp",
+    extra_args: Iterable[str] | None = None,
+) -> None:
+    """Copy many (local_path, remote_path) pairs using up to max_conns parallel scp processes.
+
+    Every transfer is attempted; failures are collected and raised together.
+    """
+    if direction not in ("to_remote", "from_remote"):
+        raise RemoteCopyError(f"Unknown copy direction: {direction}")
+    if max_conns < 1:
+        raise RemoteCopyError("max_conns must be at least 1.")
+    extra = list(extra_args or [])
+    slots: queue.SimpleQueue[int] = queue.SimpleQueue()
+    for slot in range(max_conns):
+        slots.put(slot)
+
+    def transfer(local_path: Path | str, remote_path: str) -> None:
+        remote = f"{host}:{remote_path}"
+        source, destination = (str(local_path), remote) if direction == "to_remote" else (remote, str(local_path))
+        # Each slot owns its own ControlMaster socket, so workers never share one TCP stream.
+        slot = slots.get()
+        try:
+            _run_command(
+                _build_scp_command(
+                    scp_command=scp_command,
+                    extra_args=extra,
+                    source=source,
+                    destination=destination,
+                    slot=slot,
+                )
+            )
+        finally:
+            slots.put(slot)
+
+    with ThreadPoolExecutor(max_workers=max_conns) as pool:
+        # Workers run in copies of the caller's context, keeping e.g. the daemon's per-profile log tag.
+        futures = [
+            (local_path, remote_path, pool.submit(contextvars.copy_context().run, transfer, local_path, remote_path))
+            for local_path, remote_path in transfers
+        ]
+    failures = []
+    for local_path, remote_path, future in futures:
+        exc = future.exception()
+        if exc is not None:
+            failures.append(f"{local_path} <-> {host}:{remote_path}: {exc}")
+    if failures:
+        raise RemoteCopyError(f"{len(failures)} transfer(s) failed: " + "; ".join(failures))
+
+
+def copy_batch_to_remote(
+    *,
+    host: str,
+    local_root: Path | str,
+    rel_paths: Iterable[str],
+    remote_root: str,
+    ssh_command: Sequence[str] | str = "ssh",
+    extra_args: Iterable[str] | None = None,
+) -> None:
+    """Copy many paths under local_root to remote_root through one ``tar | ssh tar`` pipe."""
+    _run_pipeline(
+        _tar_create_command(str(local_root)),
+        build_ssh_command(
+            host=host,
+            remote_command=_tar_extract_command(remote_root),
+            ssh_command=ssh_command,
+            extra_args=extra_args,
+        ),
+        _null_separated(rel_paths),
+        failure="tar pipeline failed.",
+    )
+
+
+def copy_batch_from_remote(
+    *,
+    host: str,
+    remote_root: str,
+    rel_paths: Iterable[str],
+    local_root: Path | str,
+    ssh_command: Sequence[str] | str = "ssh",
+    extra_args: Iterable[str] | None = None,
+) -> None:
+    """Copy many paths under remote_root to local_root through one ``ssh tar | tar`` pipe."""
+    _run_pipeline(
+        build_ssh_command(
+            host=host,
+            remote_command=_tar_create_command(remote_root),
+            ssh_command=ssh_command,
+            extra_args=extra_args,
+        ),
+        _tar_extract_command(str(local_root)),
+        _null_separated(rel_paths),
+        failure="tar pipeline failed.",
+    )
+
+
+def copy_remote_to_remote(
+    *,
+    source_host: str,
+    source_path: str,
+    destination_host: str,
+    destination_path: str,
+    source_ssh_command: Sequence[str] | str = "ssh",
+    destination_ssh_command: Sequence[str] | str = "ssh",
+) -> None:
+    """Stream one file between two hosts through a local ``ssh cat | ssh cat`` pipe, with no local temp copy.
+
+    The source sends its permission bits and mtime ahead of the bytes, and the copy
+    gets both before it is renamed over destination_path. The rename only happens
+    once both ends of the pipe have succeeded. On any failure the temp file is
+    removed and the target is left untouched.
+    """
+    partial_path = f"{destination_path}.tmp.{secrets.token_hex(4)}"
+
+    def run_on_destination(remote_command: list[str], failure: str) -> None:
+        _run_command(
+            build_ssh_command(host=destination_host, remote_command=remote_command, ssh_command=destination_ssh_command),
+            failure=failure,
+        )
+
+    try:
+        _run_pipeline(
+            build_ssh_command(
+                host=source_host,
+                remote_command=["sh", "-c", _RELAY_SEND_SCRIPT, "sh", source_path],
+                ssh_command=source_ssh_command,
+            ),
+            build_ssh_command(
+                host=destination_host,
+                remote_command=["sh", "-c", _RELAY_RECEIVE_SCRIPT, "sh", partial_path],
+                ssh_command=destination_ssh_command,
+            ),
+            failure="remote relay failed.",
+        )
+        run_on_destination(["mv", "-f", "--", partial_path, destination_path], "remote rename failed.")
+    except RemoteCopyError:
+        try:
+            run_on_destination(["rm", "-f", "--", partial_path], "remote cleanup failed.")
+        except RemoteCopyError:
+            pass  # the relay or rename failure is the error worth reporting
+        raise
+
+
+# One "<octal mode> <epoch mtime>" header line precedes the file bytes on the relay pipe.
+_RELAY_SEND_SCRIPT = 'find "$1" -maxdepth 0 -printf "%m %T@\\n" && exec cat -- "$1"'
+_RELAY_RECEIVE_SCRIPT = 'read -r mode mtime && cat > "$1" && chmod "$mode" "$1" && touch -d "@$mtime" "$1"'
+
+
+def _tar_create_command(root: str) -> list[str]:
+    # Names arrive NUL-separated on stdin, which sidesteps ARG_MAX and odd characters in names.
+    return ["tar", "-C", root, "--null", "--no-recursion", "-T", "-", "-cf", "-"]
+
+
+def _tar_extract_command(root: str) -> list[str]:
+    return ["tar", "-C", root, "-xpf", "-"]
+
+
+def _null_separated(rel_paths: Iterable[str]) -> bytes:
+    return b"".join(f"{path}\0".encode() for path in rel_paths)
+
+
+def _run_pipeline(create_cmd: Sequence[str], extract_cmd: Sequence[str], names: bytes = b"", *, failure: str) -> None:
+    """Run ``create_cmd | extract_cmd``, feeding names to the first command's stdin."""
+    with tempfile.TemporaryFile() as create_err, tempfile.TemporaryFile() as extract_err:
+        try:
+            creator = subprocess.Popen(
+                create_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=create_err, close_fds=CLOSE_FDS
+            )
+        except OSError as exc:
+            raise RemoteCopyError(f"Failed to run command: {exc}") from exc
+        try:
+            extractor = subprocess.Popen(
+                extract_cmd, stdin=creator.stdout, stdout=subprocess.DEVNULL, stderr=extract_err, close_fds=CLOSE_FDS
+            )
+        except OSError as exc:
+            creator.kill()
+            creator.wait()
+            raise RemoteCopyError(f"Failed to run command: {exc}") from exc
+        finally:
+            creator.stdout.close()  # the extractor owns the read end now
+        try:
+            creator.stdin.write(names)
+        except BrokenPipeError:
+            pass  # creator died early; its exit status and stderr explain why
+        finally:
+            creator.stdin.close()
+        codes = (creator.wait(), extractor.wait())
+        stderr = b""
+        for handle in (create_err, extract_err):
+            handle.seek(0)
+            stderr += handle.read()
+    if any(codes):
+        message = stderr.decode(errors="replace").strip()
+        if contains_prompt(message):
+            raise RemoteCopyError("SSH authentication prompt detected; refusing to block.")
+        raise RemoteCopyError(message or failure)
+
+
 def _build_scp_command(
     *,
     scp_command: Sequence[str] | str,
     extra_args: Iterable[str] | None,
     source: str,
     destination: str,
+    slot: int | None = None,
 ) -> list[str]:
     if isinstance(scp_command, str):
         base = [scp_command]
@@ -59,24 +270,32 @@ def _build_scp_command(
         base = list(scp_command)
     if not base:
         raise RemoteCopyError("scp_command must not be empty.")
-    return base + list(extra_args or []) + [source, destination]
+    extra = list(extra_args or [])
+    # -p keeps the source mtime, as the tar path does; otherwise the next plan sees every copy as modified.
+    return base + multiplex_args(base + extra, slot=slot) + ["-p"] + extra + [source, destination]
 
 
-def _run_command(cmd: Sequence[str]) -> None:
+def _run_command(cmd: Sequence[str], *, failure: str = "scp command failed.") -> None:
     try:
-        completed = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        # scp output is only interesting on failure, so stdout is discarded and stderr decoded lazily.
+        completed = subprocess.run(
+            cmd, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=CLOSE_FDS
+        )
     except OSError as exc:
         raise RemoteCopyError(f"Failed to run command: {exc}") from exc
     if completed.returncode != 0:
-        stderr = completed.stderr.strip()
-        if _contains_prompt(stderr):
+        stderr = completed.stderr.decode("utf-8", "replace").strip()
+        if contains_prompt(stderr):
             raise RemoteCopyError("SSH authentication prompt detected; refusing to block.")
-        raise RemoteCopyError(stderr or "scp command failed.")
-
-
-def _contains_prompt(stderr: str) -> bool:
-    lowered = stderr.lower()
-    return any(marker in lowered for marker in ["password:", "passphrase", "enter pin", "enter passcode"])
+        raise RemoteCopyError(stderr or failure)
 
 
-__all__ = ["RemoteCopyError", "copy_local_to_remote", "copy_remote_to_local"]
+__all__ = [
+    "RemoteCopyError",
+    "copy_batch_from_remote",
+    "copy_batch_to_remote",
+    "copy_local_to_remote",
+    "copy_many",
+    "copy_remote_to_local",
+    "copy_remote_to_remote",
+]
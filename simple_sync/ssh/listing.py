@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Sequence
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from simple_sync import types
-from .commands import MarkerResult, run_with_markers
+from .commands import iter_marker_body, wrap_remote_command
+from .transport import open_ssh_stream
 
-FIND_FORMAT = "%P|%y|%s|%T@|%l\\n"
+# Every field is NUL-terminated so names containing newlines or "|" survive the round trip.
+FIND_FORMAT = "%P\\0%y\\0%s\\0%T@\\0%l\\0"
+_FIELDS_PER_ENTRY = 5
+# One FIND_FORMAT record: path, type, size, mtime and link target.
+_RECORD_RE = re.compile(rb"([^\0]*)\0([^\0])\0(\d+)\0(-?\d+(?:\.\d*)?)\0([^\0]*)\0")
 
 
 class RemoteListingError(RuntimeError):
@@ -21,41 +27,67 @@ def list_remote_entries(
     ssh_command: Sequence[str] | str = "ssh",
     extra_args: Iterable[str] | None = None,
 ) -> Dict[str, types.FileEntry]:
-    """List files under root on a remote host."""
-    remote_command = ["find", root, "-printf", FIND_FORMAT]
-    result = run_with_markers(
+    """List files under root on a remote host.
+
+    Any non-zero find status raises RemoteListingError, even when records were
+    parsed. find exits 1 when it cannot read a subdirectory, and a listing that
+    is missing that subtree would make its files look deleted to the planner.
+    """
+    remote_command = wrap_remote_command(["find", root, "-printf", FIND_FORMAT])
+    # Parse records as they stream in rather than holding the whole listing in memory.
+    with open_ssh_stream(
         host=host,
         remote_command=remote_command,
         ssh_command=ssh_command,
         extra_args=extra_args,
-    )
+    ) as stream:
+        entries = _parse_entries(iter_marker_body(stream.iter_chunks()))
+        result = stream.finish()
     if result.exit_code != 0:
         raise RemoteListingError(f"Remote find failed: {result.stderr.strip()}")
-    entries: Dict[str, types.FileEntry] = {}
-    for line in result.body.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split("|", 4)
-        if len(parts) < 4:
-            continue
-        rel_path, type_char, size_str, mtime_str, *rest = parts
-        rel_path = rel_path or "."
-        is_dir = type_char == "d"
-        is_symlink = type_char == "l"
-        size = 0 if (is_dir or is_symlink) else int(size_str)
-        mtime = float(mtime_str)
-        link_target = rest[0] if rest else None
-        entry = types.FileEntry(
-            path=rel_path,
-            is_dir=is_dir,
-            size=size,
-            mtime=mtime,
-            is_symlink=is_symlink,
-            link_target=link_target or None,
-        )
-        entries[entry.path] = entry
     return entries
 
 
+def _parse_entries(chunks: Iterable[bytes]) -> Dict[str, types.FileEntry]:
+    pairs: List[Tuple[str, types.FileEntry]] = []
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        # Anchored matching keeps records aligned; the regex engine does the tokenizing in C.
+        while (match := _RECORD_RE.match(buffer, pos)) is not None:
+            entry = _make_entry(*match.groups())
+            pairs.append((entry.path, entry))
+            pos = match.end()
+        buffer = buffer[pos:]
+        if buffer.count(b"\0") >= _FIELDS_PER_ENTRY:
+            raise RemoteListingError(f"Malformed remote listing record: {buffer[:200]!r}")
+    # Whatever is left (normally just the end marker) is not a complete record.
+    return dict(pairs)
+
+
+def _make_entry(rel_path: bytes, type_char: bytes, size_raw: bytes, mtime_raw: bytes, link_target: bytes) -> types.FileEntry:
+    is_dir = type_char == b"d"
+    is_symlink = type_char == b"l"
+    # find's %P is already relative with no "." or ".." segments, so normalization is skipped.
+    return types.FileEntry.unchecked(
+        # surrogateescape round-trips names that are not valid UTF-8, matching os.fsdecode locally.
+        path=rel_path.decode("utf-8", "surrogateescape") or ".",
+        is_dir=is_dir,
+        size=0 if (is_dir or is_symlink) else int(size_raw),
+        mtime_ns=_parse_timestamp_ns(mtime_raw),
+        is_symlink=is_symlink,
+        link_target=link_target.decode("utf-8", "surrogateescape") or None,
+    )
+
+
+def _parse_timestamp_ns(value: bytes) -> int:
+    """Convert find's decimal ``%T@`` seconds to integer nanoseconds without float rounding."""
+    # The sign applies to the whole value (pre-1970 mtimes print as e.g. -1.5), not just the integer part.
+    negative = value.startswith(b"-")
+    seconds, _, fraction = value.removeprefix(b"-").partition(b".")
+    ns = int(seconds) * types.NS_PER_SECOND + int(fraction[:9].ljust(9, b"0"))
+    return -ns if negative else ns
+
+
 __all__ = ["RemoteListingError", "list_remote_entries"]
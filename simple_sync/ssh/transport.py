@@ -2,17 +2,43 @@
 
 from __future__ import annotations
 
+import atexit
+import os
+import re
 import shlex
+import shutil
 import subprocess
+import tempfile
+import threading
 from dataclasses import dataclass
-from typing import Iterable, List, Mapping, Sequence
+from typing import IO, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+_AUTH_FAILURE_RE = re.compile(r"permission denied|authentication failed", re.IGNORECASE)
+_PROMPT_RE = re.compile(r"password:|passphrase|enter pin|enter passcode", re.IGNORECASE)
+# Python-created descriptors are non-inheritable already, so POSIX children can skip the close-all-fds pass
+# (and use posix_spawn where the interpreter supports it). Windows keeps the default.
+CLOSE_FDS = os.name == "nt"
+# Arguments made only of these characters are left unquoted by shlex.quote as well.
+_SAFE_ARG = re.compile(r"[\w@%+=:,./-]+", re.ASCII).fullmatch
+
+# Directory holding the ControlMaster sockets for this process; created on first use under _mux_lock.
+_mux_dir: Optional[str] = None
+# ssh program that closes the masters at exit; follows the configured command rather than assuming "ssh".
+_mux_ssh_program = "ssh"
+_mux_lock = threading.Lock()
+# Only OpenSSH's own clients understand the ControlMaster options; wrappers are passed through untouched.
+_OPENSSH_PROGRAMS = frozenset({"ssh", "scp"})
+# Socket paths must fit sun_path (104 bytes on macOS/BSD, 108 on Linux, NUL included). %C expands
+# to 40 hex digits and ssh binds the master under a further 17-character random suffix first.
+_MAX_SOCKET_PATH = 103
+_CONTROL_PATH_SUFFIX = len("/") + 40 + len(".0123456789abcdef")
 
 
 class SSHCommandError(RuntimeError):
     """Raised when an SSH command cannot be executed."""
 
 
-@dataclass
+@dataclass(slots=True)
 class SSHResult:
     exit_code: int
     stdout: str
@@ -29,52 +55,201 @@ def run_ssh_command(
     extra_args: Iterable[str] | None = None,
     env: Mapping[str, str] | None = None,
     timeout: float | None = None,
+    capture_stdout: bool = True,
 ) -> SSHResult:
-    """Execute a remote command via SSH and capture its output."""
-    if isinstance(ssh_command, str):
-        base_cmd: List[str] = [ssh_command]
-    else:
-        base_cmd = list(ssh_command)
-    if not base_cmd:
-        raise SSHCommandError("ssh_command must not be empty.")
-    cmd = base_cmd + list(extra_args or []) + [host, _quote_remote_command(remote_command)]
+    """Execute a remote command via SSH and capture its output.
+
+    Callers that only care about the exit status can pass ``capture_stdout=False``
+    to discard stdout instead of reading and decoding it; stderr is always kept.
+    """
+    cmd = build_ssh_command(host=host, remote_command=remote_command, ssh_command=ssh_command, extra_args=extra_args)
     try:
         completed = subprocess.run(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             env=env,
             timeout=timeout,
             check=False,
+            close_fds=CLOSE_FDS,
         )
     except OSError as exc:  # pragma: no cover - system failures
         raise SSHCommandError(f"Failed to execute SSH command: {exc}") from exc
-    stderr = completed.stderr
-    auth_failed = _contains_auth_failure(stderr)
-    prompt_detected = _contains_prompt(stderr)
+    return _make_result(completed.returncode, completed.stdout or "", completed.stderr)
+
+
+class SSHStream:
+    """A running SSH command whose stdout is consumed incrementally."""
+
+    def __init__(self, process: subprocess.Popen, stderr_file: IO[bytes]) -> None:
+        self._process = process
+        self._stderr_file = stderr_file
+
+    def iter_chunks(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Yield stdout as it arrives, in chunks of at most chunk_size bytes."""
+        stdout = self._process.stdout
+        while True:
+            chunk = stdout.read1(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def finish(self) -> SSHResult:
+        """Drain any unread stdout, wait for exit, and report status and stderr."""
+        for _ in self.iter_chunks():
+            pass
+        exit_code = self._process.wait()
+        self._stderr_file.seek(0)
+        stderr = self._stderr_file.read().decode(errors="replace")
+        return _make_result(exit_code, "", stderr)
+
+    def __enter__(self) -> "SSHStream":
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        self._process.stdout.close()
+        self._stderr_file.close()
+
+
+def open_ssh_stream(
+    *,
+    host: str,
+    remote_command: Sequence[str],
+    ssh_command: Sequence[str] | str = "ssh",
+    extra_args: Iterable[str] | None = None,
+    env: Mapping[str, str] | None = None,
+) -> SSHStream:
+    """Start a remote command via SSH without buffering its whole output in memory."""
+    cmd = build_ssh_command(host=host, remote_command=remote_command, ssh_command=ssh_command, extra_args=extra_args)
+    # stderr is spooled to a file so a chatty remote cannot block on a pipe nobody is reading.
+    stderr_file = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, env=env, close_fds=CLOSE_FDS)
+    except OSError as exc:  # pragma: no cover - system failures
+        stderr_file.close()
+        raise SSHCommandError(f"Failed to execute SSH command: {exc}") from exc
+    return SSHStream(process, stderr_file)
+
+
+def build_ssh_command(
+    *,
+    host: str,
+    remote_command: Sequence[str],
+    ssh_command: Sequence[str] | str = "ssh",
+    extra_args: Iterable[str] | None = None,
+) -> List[str]:
+    """Assemble the argv for running remote_command on host."""
+    if isinstance(ssh_command, str):
+        base_cmd: List[str] = [ssh_command]
+    else:
+        base_cmd = list(ssh_command)
+    if not base_cmd:
+        raise SSHCommandError("ssh_command must not be empty.")
+    extra = list(extra_args or [])
+    return base_cmd + multiplex_args(base_cmd + extra) + extra + [host, _quote_remote_command(remote_command)]
+
+
+def _make_result(exit_code: int, stdout: str, stderr: str) -> SSHResult:
     return SSHResult(
-        exit_code=completed.returncode,
-        stdout=completed.stdout,
+        exit_code=exit_code,
+        stdout=stdout,
         stderr=stderr,
-        auth_failed=auth_failed,
-        prompt_detected=prompt_detected,
+        auth_failed=_contains_auth_failure(stderr),
+        prompt_detected=contains_prompt(stderr),
     )
 
 
+def multiplex_args(existing_args: Sequence[str], *, slot: int | None = None) -> List[str]:
+    """Return OpenSSH options that reuse one master connection per destination.
+
+    Passing ``slot`` gives the caller its own master (and TCP stream) per slot so
+    parallel transfers are not serialized through a single connection. Nothing is
+    injected on Windows (its OpenSSH port lacks ControlMaster support), when the
+    program (the first of ``existing_args``) is not OpenSSH's ssh or scp, when the
+    caller already configures ControlMaster/ControlPath, or when the socket path
+    would be too long for a Unix socket.
+    """
+    if os.name == "nt" or not existing_args:
+        return []
+    program = existing_args[0]
+    if os.path.basename(program) not in _OPENSSH_PROGRAMS:
+        return []
+    if any("controlpath" in arg.lower() or "controlmaster" in arg.lower() for arg in existing_args):
+        return []
+    global _mux_dir, _mux_ssh_program
+    with _mux_lock:
+        if _mux_dir is None:
+            # A short base keeps the socket path clear of long $TMPDIRs such as macOS's /var/folders/...
+            _mux_dir = tempfile.mkdtemp(prefix="ss-", dir="/tmp" if os.path.isdir("/tmp") else None)
+            atexit.register(_close_multiplexed_connections)
+        if os.path.basename(program) == "ssh":
+            _mux_ssh_program = program
+        elif _mux_ssh_program == "ssh":
+            # scp cannot send -O exit; use the ssh installed beside it.
+            _mux_ssh_program = os.path.join(os.path.dirname(program), "ssh")
+    slot_suffix = "" if slot is None else f".{slot}"
+    if len(_mux_dir) + _CONTROL_PATH_SUFFIX + len(slot_suffix) > _MAX_SOCKET_PATH:
+        return []
+    control_path = f"{_mux_dir}/%C{slot_suffix}"
+    return [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={control_path}",
+        "-o",
+        "ControlPersist=60s",
+    ]
+
+
+def _close_multiplexed_connections() -> None:
+    global _mux_dir
+    with _mux_lock:
+        if _mux_dir is None:
+            return
+        mux_dir, _mux_dir = _mux_dir, None
+    try:
+        sockets = [entry.path for entry in os.scandir(mux_dir)]
+    except OSError:
+        sockets = []
+    for socket_path in sockets:
+        try:
+            # The destination argument is required but unused when ControlPath is a literal socket.
+            subprocess.run(
+                [_mux_ssh_program, "-o", f"ControlPath={socket_path}", "-O", "exit", "simple_sync"],
+                capture_output=True,
+                timeout=5,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    shutil.rmtree(mux_dir, ignore_errors=True)
+
+
 def _contains_auth_failure(stderr: str) -> bool:
-    lowered = stderr.lower()
-    return "permission denied" in lowered or "authentication failed" in lowered
+    return _AUTH_FAILURE_RE.search(stderr) is not None
 
 
-def _contains_prompt(stderr: str) -> bool:
-    lowered = stderr.lower()
-    return any(marker in lowered for marker in ["password:", "passphrase", "enter pin", "enter passcode"])
+def contains_prompt(stderr: str) -> bool:
+    """Return True if stderr shows ssh or scp asking for a password, passphrase, PIN or passcode."""
+    return _PROMPT_RE.search(stderr) is not None
 
 
 def _quote_remote_command(parts: Sequence[str]) -> str:
     if not parts:
         return ""
-    return " ".join(shlex.quote(part) for part in parts)
-
-
-__all__ = ["SSHCommandError", "SSHResult", "run_ssh_command"]
+    return " ".join(part if _SAFE_ARG(part) else shlex.quote(part) for part in parts)
+
+
+__all__ = [
+    "SSHCommandError",
+    "SSHResult",
+    "SSHStream",
+    "build_ssh_command",
+    "contains_prompt",
+    "open_ssh_stream",
+    "run_ssh_command",
+]
@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
-import re
+import string
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path, PurePosixPath
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 
+NS_PER_SECOND = 1_000_000_000
+
+
 class EndpointType(str, Enum):
     LOCAL = "local"
     SSH = "ssh"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Endpoint:
     """Represents either a local or SSH endpoint."""
 
@@ -33,14 +38,14 @@ class Endpoint:
             raise ValueError("SSH endpoints must include a host.")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileEntry:
     """Filesystem entry metadata."""
 
     path: str
     is_dir: bool
     size: int
-    mtime: float
+    mtime_ns: int
     is_symlink: bool = False
     link_target: Optional[str] = None
     hash: Optional[str] = None
@@ -49,6 +54,33 @@ class FileEntry:
         normalized = normalize_relative_path(self.path)
         object.__setattr__(self, "path", normalized)
 
+    @classmethod
+    def unchecked(
+        cls,
+        path: str,
+        is_dir: bool,
+        size: int,
+        mtime_ns: int,
+        is_symlink: bool = False,
+        link_target: Optional[str] = None,
+        hash: Optional[str] = None,
+    ) -> "FileEntry":
+        """Build an entry without normalizing ``path``.
+
+        Only for producers that already emit clean relative paths (directory walks and
+        remote ``find`` listings); everything else should use the normal constructor.
+        """
+        entry = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(entry, "path", sys.intern(path))
+        setattr_(entry, "is_dir", is_dir)
+        setattr_(entry, "size", size)
+        setattr_(entry, "mtime_ns", mtime_ns)
+        setattr_(entry, "is_symlink", is_symlink)
+        setattr_(entry, "link_target", link_target)
+        setattr_(entry, "hash", hash)
+        return entry
+
 
 class ChangeType(str, Enum):
     NEW = "new"
@@ -64,7 +96,7 @@ class OperationType(str, Enum):
     MERGE = "merge"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Operation:
     """Operation to apply during synchronization."""
 
@@ -79,7 +111,7 @@ class Operation:
         object.__setattr__(self, "path", normalized)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Conflict:
     """Describes a conflict requiring user input."""
 
@@ -95,20 +127,29 @@ class Conflict:
 
 def normalize_relative_path(path: str | Path) -> str:
     """Normalize a path relative to the endpoint root."""
-    normalized_input = str(path).replace("\\", "/")
-    if re.match(r"^[A-Za-z]:", normalized_input):
+    return _normalize_cached(str(path))
+
+
+_DRIVE_LETTERS = frozenset(string.ascii_letters)
+
+
+@lru_cache(maxsize=65536)
+def _normalize_cached(path: str) -> str:
+    # Pure function of the input string; bounded so huge trees cannot grow it without limit.
+    normalized_input = path.replace("\\", "/")
+    if normalized_input[1:2] == ":" and normalized_input[0] in _DRIVE_LETTERS:
         raise ValueError(f"Absolute paths are not allowed: {path}")
-    candidate = PurePosixPath(normalized_input)
-    if candidate.is_absolute():
+    if normalized_input.startswith("/"):
         raise ValueError(f"Absolute paths are not allowed: {path}")
     parts = []
-    for part in candidate.parts:
+    for part in normalized_input.split("/"):
         if part in ("", "."):
             continue
         if part == "..":
             raise ValueError(f"Path escapes root: {path}")
         parts.append(part)
-    return "/".join(parts) if parts else "."
+    # Interned so the same path seen on both endpoints and in saved state is stored once.
+    return sys.intern("/".join(parts)) if parts else "."
 
 
 __all__ = [
@@ -117,6 +158,7 @@ __all__ = [
     "Endpoint",
     "EndpointType",
     "FileEntry",
+    "NS_PER_SECOND",
     "Operation",
     "OperationType",
     "normalize_relative_path",
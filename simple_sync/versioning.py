@@ -8,6 +8,12 @@ from pathlib import Path
 from typing import Optional
 
 VERSION_TAG_PATTERN = re.compile(r"^v(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)$")
+VERSION_TAG_GLOB = "v[0-9]*.[0-9]*.[0-9]*"
+_PYPROJECT_VERSION_RE = re.compile(rb'^(version\s*=\s*)"[^"]+"', re.MULTILINE)
+_INIT_VERSION_RE = re.compile(rb'^(__version__\s*=\s*)"[^"]+"', re.MULTILINE)
+_FORMULA_URL_RE = re.compile(r'^(url\s*")([^"]+)(")', re.MULTILINE)
+_FORMULA_REVISION_RE = re.compile(r'(revision:\s*")([^"]+)(")', re.MULTILINE)
+_FORMULA_VERSION_RE = re.compile(r'^\s*(version\s*")([^"]+)(")', re.MULTILINE)
 
 
 class VersionError(RuntimeError):
@@ -20,12 +26,15 @@ def latest_version_tag(repo_path: Path | str = ".") -> str:
     """
     Return the latest version tag (vMAJOR.MINOR.PATCH) in the repository.
 
+    This is the highest version among all tags, not the nearest tag reachable from HEAD.
+
     Raises VersionError if no matching tags are found.
     """
     repo = Path(repo_path)
     try:
+        # git sorts highest version first, so only the leading lines need checking against the strict pattern.
         result = subprocess.run(
-            ["git", "-C", str(repo), "tag", "--list", "v[0-9]*.[0-9]*.[0-9]*"],
+            ["git", "-C", str(repo), "tag", "--list", VERSION_TAG_GLOB, "--sort=-v:refname"],
             check=True,
             capture_output=True,
             text=True,
@@ -33,17 +42,11 @@ def latest_version_tag(repo_path: Path | str = ".") -> str:
     except (OSError, subprocess.CalledProcessError) as exc:  # pragma: no cover - git missing is environment-specific
         raise VersionError(f"Failed to read git tags: {exc}") from exc
 
-    tags = [line.strip() for line in result.stdout.splitlines() if line.strip()]
-    matching = [tag for tag in tags if VERSION_TAG_PATTERN.match(tag)]
-    if not matching:
-        raise VersionError("No tags matching vMAJOR.MINOR.PATCH were found.")
-
-    def _version_tuple(tag: str) -> tuple[int, int, int]:
-        match = VERSION_TAG_PATTERN.match(tag)
-        assert match  # already validated above
-        return tuple(int(part) for part in match.groups())
-
-    return sorted(matching, key=_version_tuple, reverse=True)[0]
+    for line in result.stdout.splitlines():
+        tag = line.strip()
+        if VERSION_TAG_PATTERN.match(tag):
+            return tag
+    raise VersionError("No tags matching vMAJOR.MINOR.PATCH were found.")
 
 
 def version_from_tag(tag: str) -> str:
@@ -67,26 +70,27 @@ def update_version_files(
 
     Raises VersionError if the expected fields are missing.
     """
-    pyproject_text = pyproject_path.read_text()
-    init_text = init_path.read_text()
+    # Work on raw bytes: the files only need one ASCII field swapped, so decoding is wasted effort.
+    pyproject_bytes = pyproject_path.read_bytes()
+    init_bytes = init_path.read_bytes()
+    quoted_version = f'"{version}"'.encode()
 
-    pyproject_updated, pyproject_count = re.subn(
-        r'(?m)^(version\s*=\s*)"[^"]+"', rf'\1"{version}"', pyproject_text, count=1
-    )
+    def _replace(match: re.Match[bytes]) -> bytes:
+        return match.group(1) + quoted_version
+
+    pyproject_updated, pyproject_count = _PYPROJECT_VERSION_RE.subn(_replace, pyproject_bytes, count=1)
     if pyproject_count == 0:
         raise VersionError("Could not find version field in pyproject.toml.")
 
-    init_updated, init_count = re.subn(
-        r'(?m)^(__version__\s*=\s*)"[^"]+"', rf'\1"{version}"', init_text, count=1
-    )
+    init_updated, init_count = _INIT_VERSION_RE.subn(_replace, init_bytes, count=1)
     if init_count == 0:
         raise VersionError("Could not find __version__ in __init__.py.")
 
     if dry_run:
         return
 
-    pyproject_path.write_text(pyproject_updated)
-    init_path.write_text(init_updated)
+    pyproject_path.write_bytes(pyproject_updated)
+    init_path.write_bytes(init_updated)
 
 
 def resolve_version_from_tags(repo_path: Path | str = ".") -> str:
@@ -126,36 +130,21 @@ def update_formula(
     text = formula_path.read_text()
 
     if url:
-        text, url_count = re.subn(
-            r'(?m)^(url\s*")([^"]+)(")',
-            rf'\1{url}\3',
-            text,
-            count=1,
-        )
+        text, url_count = _FORMULA_URL_RE.subn(rf'\1{url}\3', text, count=1)
         if url_count == 0:
             raise VersionError("Could not find url field in formula.")
 
     def _replace_revision(match: re.Match[str]) -> str:
         return f'{match.group(1)}{revision}{match.group(3)}'
 
-    text, rev_count = re.subn(
-        r'(?m)(revision:\s*")([^"]+)(")',
-        _replace_revision,
-        text,
-        count=1,
-    )
+    text, rev_count = _FORMULA_REVISION_RE.subn(_replace_revision, text, count=1)
     if rev_count == 0:
         raise VersionError("Could not find revision field in formula.")
 
     def _replace_version(match: re.Match[str]) -> str:
         return f'{match.group(1)}{version}{match.group(3)}'
 
-    text, ver_count = re.subn(
-        r'(?m)^\s*(version\s*")([^"]+)(")',
-        _replace_version,
-        text,
-        count=1,
-    )
+    text, ver_count = _FORMULA_VERSION_RE.subn(_replace_version, text, count=1)
     if ver_count == 0:
         raise VersionError("Could not find version field in formula.")
 
@@ -0,0 +1,33 @@
+"""Scratch directories shared by the test cases."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+_SHM = "/dev/shm"
+
+
+class ScratchTestCase(unittest.TestCase):
+    """Gives each test fresh directories under one per-class root, removed in a single rmtree.
+
+    The root is RAM-backed when /dev/shm is usable; set ``scratch_prefix`` to name it.
+    """
+
+    scratch_prefix = "ss-"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        shm = _SHM if os.path.isdir(_SHM) and os.access(_SHM, os.W_OK) else None
+        cls._scratch_root = Path(tempfile.mkdtemp(prefix=cls.scratch_prefix, dir=shm))
+        cls.addClassCleanup(shutil.rmtree, cls._scratch_root, ignore_errors=True)
+
+    def _scratch_dir(self) -> str:
+        return tempfile.mkdtemp(dir=self._scratch_root)
+
+
+__all__ = ["ScratchTestCase"]
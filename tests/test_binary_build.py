@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import shutil
 import subprocess
@@ -10,9 +11,15 @@ import tempfile
 import unittest
 from pathlib import Path
 
+import pytest
+
 from simple_sync import config
 
 SUPPORTED_PLATFORMS = ("darwin", "linux")
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BINARY_NAME = "simple-sync.exe" if sys.platform.startswith("win") else "simple-sync"
+# Set to a non-empty value to ignore cached binaries and run PyInstaller again.
+REBUILD_ENV_VAR = "SIMPLE_SYNC_REBUILD_BINARY"
 
 
 def _is_supported_platform() -> bool:
@@ -28,10 +35,48 @@ def _require_pyinstaller() -> None:
         ) from exc
 
 
+def _binary_cache_dir() -> Path:
+    """Cache location for built binaries, keyed by the sources and toolchain that produced them."""
+    import PyInstaller  # type: ignore
+
+    digest = hashlib.sha256()
+    digest.update(f"{sys.version}|{PyInstaller.__version__}".encode())
+    sources = sorted((REPO_ROOT / "simple_sync").rglob("*.py"))
+    sources.append(REPO_ROOT / "scripts" / "pyinstaller_entry.py")
+    for path in sources:
+        digest.update(path.relative_to(REPO_ROOT).as_posix().encode())
+        digest.update(path.read_bytes())
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_home / "simple_sync" / "bin" / digest.hexdigest()[:16]
+
+
+def _cached_binary(build_root: Path) -> Path:
+    cache_dir = _binary_cache_dir()
+    cached = cache_dir / "simple-sync" / BINARY_NAME
+    if not os.environ.get(REBUILD_ENV_VAR) and os.access(cached, os.X_OK):
+        return cached
+    binary = _build_binary(build_root)
+    # Publish with one atomic rename of a fully copied staging dir. A published bundle is never
+    # removed, since another process may be running it; if one appeared meanwhile it is equivalent.
+    try:
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix="staging-", dir=cache_dir.parent))
+    except OSError:
+        # An unwritable cache only costs the next run a rebuild.
+        return binary
+    try:
+        shutil.copytree(binary.parent, staging / "simple-sync", symlinks=True)
+        os.replace(staging, cache_dir)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        return binary
+    return cached
+
+
 def _build_binary(build_root: Path) -> Path:
     dist_dir = build_root / "dist"
     work_dir = build_root / "work"
-    source = Path(__file__).resolve().parents[1] / "scripts" / "pyinstaller_entry.py"
+    source = REPO_ROOT / "scripts" / "pyinstaller_entry.py"
     env = os.environ.copy()
     env.update(
         {
@@ -48,7 +93,7 @@ def _build_binary(build_root: Path) -> Path:
         f"--distpath={dist_dir}",
         f"--workpath={work_dir}",
         f"--specpath={work_dir}",
-        f"--paths={Path(__file__).resolve().parents[1]}",
+        f"--paths={REPO_ROOT}",
         "--name",
         "simple-sync",
         str(source),
@@ -63,9 +108,7 @@ def _build_binary(build_root: Path) -> Path:
     )
     if result.returncode != 0:
         raise AssertionError(f"PyInstaller build failed:\nstdout: {result.stdout}\nstderr: {result.stderr}")
-    app_dir = dist_dir / "simple-sync"
-    binary_name = "simple-sync.exe" if sys.platform.startswith("win") else "simple-sync"
-    binary = app_dir / binary_name
+    binary = dist_dir / "simple-sync" / BINARY_NAME
     if not binary.exists():
         raise AssertionError("Standalone binary was not produced.")
     return binary
@@ -95,6 +138,7 @@ def _binary_env() -> dict[str, str]:
 
 
 @unittest.skipUnless(_is_supported_platform(), "Standalone binary tests target macOS and Linux only.")
+@pytest.mark.xdist_group("standalone_binary")  # one worker builds and runs the bundle under --dist loadgroup
 class TestStandaloneBinary(unittest.TestCase):
     """Build a PyInstaller binary and run a couple of commands against it."""
 
@@ -102,7 +146,7 @@ class TestStandaloneBinary(unittest.TestCase):
     def setUpClass(cls):
         _require_pyinstaller()
         cls.build_root = Path(tempfile.mkdtemp(prefix="ss-bin-build-"))
-        cls.binary_path = _build_binary(cls.build_root)
+        cls.binary_path = _cached_binary(cls.build_root)
 
     @classmethod
     def tearDownClass(cls):
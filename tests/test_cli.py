@@ -3,25 +3,42 @@
 from __future__ import annotations
 
 import io
-import json
 import subprocess
-import tempfile
+import sys
 import unittest
 import os
+import shutil
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from functools import lru_cache
 from pathlib import Path
 from unittest import mock
 
 from simple_sync import cli, config, types
-from simple_sync.engine import executor, state_store
+from simple_sync.engine import state_store
+from tests.scratch import ScratchTestCase
+
+# Shared canned results; the code under test only reads them.
+_OK_COMPLETED = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+
+
+@lru_cache(maxsize=None)
+def _ssh_result(exit_code: int):
+    # Imported on first use: cli loads the SSH stack lazily, and parser-only runs should not pay for it.
+    from simple_sync.ssh import transport as ssh_transport
+
+    return ssh_transport.SSHResult(exit_code=exit_code, stdout="", stderr="")
 
 
 def _run_cli(argv: list[str]) -> tuple[int, str, str]:
     """Helper that runs the CLI and captures stdout/stderr."""
     stdout_buffer = io.StringIO()
     stderr_buffer = io.StringIO()
-    with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = stdout_buffer, stderr_buffer
+    try:
         code = cli.main(argv)
+    finally:
+        sys.stdout, sys.stderr = saved
     return code, stdout_buffer.getvalue().strip(), stderr_buffer.getvalue().strip()
 
 
@@ -33,6 +50,77 @@ def _silence_parser_output():
         yield
 
 
+_LOCAL_PROFILE_TOML = """\
+[profile]
+name = {name}
+description = {description}
+
+[conflict]
+policy = {policy}
+{conflict_extra}
+[ignore]
+patterns = []
+
+[ssh]
+use_agent = true
+{ssh_extra}
+[endpoints.A]
+type = "local"
+path = {src}
+
+[endpoints.B]
+type = "local"
+path = {dst}
+"""
+
+
+_REMOTE_PROFILE_TOML = """\
+[profile]
+name = "remote"
+description = "Remote profile"
+
+[conflict]
+policy = "newest"
+
+[ssh]
+ssh_command = "ssh"
+
+[endpoints.local]
+type = "local"
+path = {src}
+
+[endpoints.remote]
+type = "ssh"
+host = "example.com"
+path = "/srv/remote"
+"""
+
+
+@lru_cache(maxsize=1)
+def _demo_profile_toml() -> str:
+    """The default profile template named "demo", serialized once per test run."""
+    profile_cfg = config.build_profile_template()
+    profile_cfg.profile.name = "demo"
+    profile_cfg.profile.description = "Demo profile"
+    return config.profile_to_toml(profile_cfg)
+
+
+def _write_demo_profile(config_dir: Path) -> Path:
+    base = config.ensure_config_structure(config_dir, subdirs=("profiles",))
+    path = base / "profiles" / "demo.toml"
+    path.write_bytes(_demo_profile_toml().encode())
+    return path
+
+
+def _toml_string(value: object) -> str:
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _toml_fields(values: dict | None) -> str:
+    return "".join(f"{key} = {_toml_string(value)}\n" for key, value in (values or {}).items() if value)
+
+
 def _write_local_profile(
     config_dir: Path,
     name: str,
@@ -44,164 +132,153 @@ def _write_local_profile(
     ssh_kwargs: dict | None = None,
 ) -> None:
     """Create a pairwise local profile under the config directory."""
-    conflict_kwargs = conflict_kwargs or {}
-    ssh_kwargs = ssh_kwargs or {}
-    profile_cfg = config.ProfileConfig(
-        profile=config.ProfileBlock(name=name, description=f"{name} profile"),
-        endpoints={
-            "A": config.EndpointBlock(name="A", type="local", path=str(src)),
-            "B": config.EndpointBlock(name="B", type="local", path=str(dst)),
-        },
-        conflict=config.ConflictBlock(
-            policy=conflict_policy,
-            prefer=conflict_kwargs.get("prefer"),
-            manual_behavior=conflict_kwargs.get("manual_behavior"),
-        ),
-        ignore=config.IgnoreBlock(patterns=[]),
-        schedule=config.ScheduleBlock(),
-        ssh=config.SshBlock(**ssh_kwargs) if ssh_kwargs else config.SshBlock(),
+    text = _LOCAL_PROFILE_TOML.format(
+        name=_toml_string(name),
+        description=_toml_string(f"{name} profile"),
+        policy=_toml_string(conflict_policy),
+        conflict_extra=_toml_fields(conflict_kwargs),
+        ssh_extra=_toml_fields(ssh_kwargs),
+        src=_toml_string(src),
+        dst=_toml_string(dst),
     )
-    base = config.ensure_config_structure(config_dir)
-    (base / "profiles" / f"{name}.toml").write_text(config.profile_to_toml(profile_cfg))
+    base = config.ensure_config_structure(config_dir, subdirs=("profiles",))
+    (base / "profiles" / f"{name}.toml").write_bytes(text.encode())
 
 
 class TestCliParser(unittest.TestCase):
     """Parser wiring sanity checks."""
 
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = cli.build_parser()
+
     def test_run_command_requires_profile(self):
-        parser = cli.build_parser()
         with self.assertRaises(SystemExit), _silence_parser_output():
-            parser.parse_args(["run"])
+            self.parser.parse_args(["run"])
 
     def test_conflicts_command_requires_profile(self):
-        parser = cli.build_parser()
         with self.assertRaises(SystemExit), _silence_parser_output():
-            parser.parse_args(["conflicts"])
+            self.parser.parse_args(["conflicts"])
+
+    def test_sniff_subcommand_skips_option_values(self):
+        self.assertEqual(cli._sniff_subcommand(["--config-dir", "run", "status"]), "status")
+        self.assertEqual(cli._sniff_subcommand(["-v", "--config", "cfg", "run", "demo"]), "run")
+        self.assertEqual(cli._sniff_subcommand(["--config-dir=cfg", "edit", "demo"]), "edit")
+        self.assertIsNone(cli._sniff_subcommand(["--help"]))
+        self.assertIsNone(cli._sniff_subcommand(["bogus"]))
+
+    def test_single_command_parser_matches_full_parser(self):
+        argv = ["--config-dir", "cfg", "-v", "run", "demo", "--dry-run"]
+        self.assertEqual(cli.build_parser(only="run").parse_args(argv), self.parser.parse_args(argv))
+
+    def test_importing_cli_defers_engine_and_ssh_modules(self):
+        code = (
+            "import sys, simple_sync.cli as cli; "
+            "assert not {'simple_sync.engine.executor', 'simple_sync.ssh.transport', 'simple_sync.daemon'} & set(sys.modules); "
+            "assert cli.executor is sys.modules['simple_sync.engine.executor']"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=False)
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
 
 
-class TestCliCommands(unittest.TestCase):
+class TestCliCommands(ScratchTestCase):
     """Stub command tests ensure outputs make sense."""
 
+    def setUp(self):
+        self.tmpdir = self._scratch_dir()
+        self.base = Path(self.tmpdir)
+        self.profile_path = _write_demo_profile(self.base)
+
     def test_daemon_command(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch("simple_sync.cli.DaemonRunner.run_forever") as mock_run:
-                exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "daemon", "start", "--once"])
+        with mock.patch("simple_sync.cli.DaemonRunner.run_forever") as mock_run:
+            exit_code, stdout, stderr = _run_cli(["--config-dir", self.tmpdir, "daemon", "start", "--once"])
         self.assertEqual(exit_code, 0)
         mock_run.assert_called_once()
 
     def test_status_command(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = config.ensure_config_structure(Path(tmpdir))
-            profile_cfg = config.build_profile_template()
-            profile_cfg.profile.name = "demo"
-            profile_cfg.profile.description = "Demo profile"
-            (base / "profiles" / "demo.toml").write_text(config.profile_to_toml(profile_cfg))
-            state_store.save_state(state_store.ProfileState(profile="demo"), base)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "status"])
-        self.assertEqual(exit_code, 0)
-        self.assertIn("demo", stdout)
-        self.assertIn("Conflicts", stdout)
-
-    def test_quiet_flag_suppresses_info_logs(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = config.ensure_config_structure(Path(tmpdir))
-            profile_cfg = config.build_profile_template()
-            profile_cfg.profile.name = "demo"
-            profile_cfg.profile.description = "Demo profile"
-            (base / "profiles" / "demo.toml").write_text(config.profile_to_toml(profile_cfg))
-            state_store.save_state(state_store.ProfileState(profile="demo"), base)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "--quiet", "status"])
-        self.assertEqual(exit_code, 0)
-        self.assertNotEqual(stdout, "")
-        self.assertEqual("", stderr)
+        # Ordered so the state file only ever needs to be added, never removed.
+        for with_state, quiet in ((False, False), (True, False), (True, True)):
+            with self.subTest(with_state=with_state, quiet=quiet):
+                if with_state:
+                    state_store.save_state(state_store.ProfileState(profile="demo"), self.base)
+                argv = ["--config-dir", self.tmpdir, *(["--quiet"] if quiet else []), "status"]
+                exit_code, stdout, stderr = _run_cli(argv)
+                self.assertEqual(exit_code, 0)
+                self.assertIn("demo", stdout)
+                self.assertIn("Conflicts", stdout)
+                if quiet:
+                    # --quiet suppresses INFO logging only; the status table still prints.
+                    self.assertEqual("", stderr)
 
     def test_run_prompts_to_initialize_missing_remote_and_copies(self):
-        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as src_tmp:
-            config_dir = Path(tmpdir)
-            src_root = Path(src_tmp)
-            dst_root = "/remote"
-            (src_root / "file.txt").write_text("hello")
-
-            profile_cfg = config.build_profile_template()
-            profile_cfg.profile.name = "demo"
-            profile_cfg.profile.description = "Demo profile"
-            profile_cfg.endpoints = {
-                "local": config.EndpointBlock(name="local", type="local", path=str(src_root)),
-                "remote": config.EndpointBlock(name="remote", type="ssh", host="example.com", path=dst_root),
-            }
-            base = config.ensure_config_structure(config_dir)
-            (base / "profiles" / "demo.toml").write_text(config.profile_to_toml(profile_cfg))
-
-            def fake_run_ssh_command(*, remote_command, **_kwargs):
-                if remote_command[:2] == ["test", "-d"]:
-                    return cli.ssh_transport.SSHResult(exit_code=1, stdout="", stderr="")
-                if remote_command[:2] == ["mkdir", "-p"]:
-                    return cli.ssh_transport.SSHResult(exit_code=0, stdout="", stderr="")
-                return cli.ssh_transport.SSHResult(exit_code=0, stdout="", stderr="")
-
-            with mock.patch("builtins.input", return_value="y"), mock.patch(
-                "simple_sync.engine.snapshot.listing.list_remote_entries", return_value={}
-            ), mock.patch("simple_sync.ssh.transport.run_ssh_command", side_effect=fake_run_ssh_command), mock.patch(
-                "simple_sync.ssh.copy.copy_local_to_remote"
-            ) as mock_push:
-                exit_code, stdout, stderr = _run_cli(["--config-dir", str(config_dir), "run", "demo"])
+        src_tmp = self._scratch_dir()
+        src_root = Path(src_tmp)
+        dst_root = "/remote"
+        (src_root / "file.txt").write_text("hello")
+
+        profile_cfg = config.build_profile_template()
+        profile_cfg.profile.name = "demo"
+        profile_cfg.profile.description = "Demo profile"
+        profile_cfg.endpoints = {
+            "local": config.EndpointBlock(name="local", type="local", path=str(src_root)),
+            "remote": config.EndpointBlock(name="remote", type="ssh", host="example.com", path=dst_root),
+        }
+        self.profile_path.write_text(config.profile_to_toml(profile_cfg))
+
+        def fake_run_ssh_command(*, remote_command, **_kwargs):
+            return _ssh_result(1 if remote_command[:2] == ["test", "-d"] else 0)
+
+        with mock.patch("builtins.input", return_value="y"), mock.patch(
+            "simple_sync.engine.snapshot.listing.list_remote_entries", return_value={}
+        ), mock.patch("simple_sync.ssh.transport.run_ssh_command", side_effect=fake_run_ssh_command), mock.patch(
+            "simple_sync.ssh.copy.copy_local_to_remote"
+        ) as mock_push:
+            exit_code, stdout, stderr = _run_cli(["--config-dir", self.tmpdir, "run", "demo"])
 
         self.assertEqual(exit_code, 0)
         mock_push.assert_called_once()
         self.assertIn("Initialize", stdout + stderr)
 
     def test_edit_command_opens_profile_in_editor(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = config.ensure_config_structure(Path(tmpdir))
-            profile_cfg = config.build_profile_template()
-            profile_cfg.profile.name = "demo"
-            profile_cfg.profile.description = "Demo profile"
-            profile_path = base / "profiles" / "demo.toml"
-            profile_path.write_text(config.profile_to_toml(profile_cfg))
-
-            with mock.patch.dict(os.environ, {"EDITOR": "cat"}):
-                with mock.patch("subprocess.run") as mock_run:
-                    mock_run.return_value = subprocess.CompletedProcess(["cat"], 0)
-                    exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "edit", "demo"])
+        with mock.patch.dict(os.environ, {"EDITOR": "cat"}), mock.patch(
+            "subprocess.run", return_value=_OK_COMPLETED
+        ) as mock_run:
+            exit_code, stdout, stderr = _run_cli(["--config-dir", self.tmpdir, "edit", "demo"])
 
         self.assertEqual(exit_code, 0)
         mock_run.assert_called_once()
         invoked = mock_run.call_args[0][0]
         self.assertEqual(invoked[0], "cat")
-        self.assertEqual(invoked[-1], str(profile_path))
+        self.assertEqual(invoked[-1], str(self.profile_path))
         self.assertIn("Opening", stdout)
 
     def test_edit_command_requires_existing_profile(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "edit", "missing"])
+        exit_code, stdout, stderr = _run_cli(["--config-dir", self.tmpdir, "edit", "missing"])
         self.assertNotEqual(exit_code, 0)
         self.assertIn("missing", stderr)
 
 
-class TestCliProfilesCommand(unittest.TestCase):
+class TestCliProfilesCommand(ScratchTestCase):
     """Tests for the profiles listing command."""
 
     def test_profiles_command_lists_profiles(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            base = config.ensure_config_structure(Path(tmpdir))
-            profile_cfg = config.build_profile_template()
-            profile_cfg.profile.name = "demo"
-            profile_cfg.profile.description = "Demo profile"
-            (base / "profiles" / "demo.toml").write_text(config.profile_to_toml(profile_cfg))
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "profiles"])
-            self.assertEqual(exit_code, 0)
-            self.assertIn("demo", stdout)
-            self.assertIn("never", stdout)
-            self.assertEqual("", stderr.strip())
-            state_store.save_state(state_store.ProfileState(profile="demo"), base)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "profiles"])
-            self.assertNotIn("never", stdout)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "conflicts", "demo"])
-            self.assertEqual(exit_code, 0)
-            self.assertIn("No conflicts", stdout)
+        tmpdir = self._scratch_dir()
+        base = Path(tmpdir)
+        _write_demo_profile(base)
+        exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "profiles"])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("demo", stdout)
+        self.assertIn("never", stdout)
+        self.assertEqual("", stderr.strip())
+        state_store.save_state(state_store.ProfileState(profile="demo"), base)
+        _, profiles_out, _ = _run_cli(["--config-dir", tmpdir, "profiles"])
+        conflicts_code, conflicts_out, _ = _run_cli(["--config-dir", tmpdir, "conflicts", "demo"])
+        self.assertNotIn("never", profiles_out)
+        self.assertEqual(conflicts_code, 0)
+        self.assertIn("No conflicts", conflicts_out)
 
 
-class TestCliInitCommand(unittest.TestCase):
+class TestCliInitCommand(ScratchTestCase):
     """Integration-level tests for the init command."""
 
     def test_init_command_creates_profile_file(self):
@@ -222,7 +299,8 @@ class TestCliInitCommand(unittest.TestCase):
         def fake_input(prompt: str) -> str:
             return next(responses)
 
-        with tempfile.TemporaryDirectory() as tmpdir, mock.patch("builtins.input", side_effect=fake_input):
+        tmpdir = self._scratch_dir()
+        with mock.patch("builtins.input", side_effect=fake_input):
             exit_code, stdout, stderr = _run_cli(["--config-dir", tmpdir, "init", "demo"])
             self.assertEqual(exit_code, 0)
             self.assertEqual(stdout, "")
@@ -251,170 +329,165 @@ class TestCliInitCommand(unittest.TestCase):
         def fake_input(prompt: str) -> str:
             return next(responses)
 
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as workdir:
-            original_cwd = os.getcwd()
-            os.chdir(workdir)
-            try:
-                with mock.patch("builtins.input", side_effect=fake_input):
-                    exit_code, stdout, stderr = _run_cli(
-                        ["--config-dir", config_tmp, "init", "demo"]
-                    )
-            finally:
-                os.chdir(original_cwd)
-            self.assertEqual(exit_code, 0)
-            self.assertEqual(stdout, "")
-            self.assertIn("Profile created", stderr)
-            profile_path = Path(config_tmp) / "profiles" / "demo.toml"
-            profile_cfg = config.load_profile_from_path(profile_path)
-            expected_local_path = str((Path(workdir) / "relative-src").resolve())
-            self.assertEqual(profile_cfg.endpoints["local"].path, expected_local_path)
-            self.assertEqual(profile_cfg.endpoints["remote"].path, "/tmp/remote")
+        config_tmp = self._scratch_dir()
+        workdir = self._scratch_dir()
+        wizard = cli.InitWizard(config_dir=config_tmp, input_func=fake_input, cwd=Path(workdir))
+        profile_path = wizard.run("demo")
+        self.assertEqual(profile_path, Path(config_tmp) / "profiles" / "demo.toml")
+        profile_cfg = config.load_profile_from_path(profile_path)
+        expected_local_path = str((Path(workdir) / "relative-src").resolve())
+        self.assertEqual(profile_cfg.endpoints["local"].path, expected_local_path)
+        self.assertEqual(profile_cfg.endpoints["remote"].path, "/tmp/remote")
 
 
-class TestCliRunCommand(unittest.TestCase):
+class TestCliRunCommand(ScratchTestCase):
     """Integration tests for the run command using real directories."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Source tree shared by every case; setUp copies it into the case's own src root.
+        cls._canonical_src = cls._scratch_root / "_canonical_src"
+        cls._canonical_src.mkdir()
+        (cls._canonical_src / "hello.txt").write_text("hello")
+
+    def setUp(self):
+        case_dir = Path(self._scratch_dir())
+        self.config_dir = case_dir / "config"
+        self.src_root = case_dir / "src"
+        self.dst_root = case_dir / "dst"
+        for path in (self.config_dir, self.dst_root):
+            path.mkdir(parents=True)
+        shutil.copytree(self._canonical_src, self.src_root)
+        # Run tests stay in-process: any child process is a regression (or a missing mock).
+        spawn_guard = mock.patch("subprocess.Popen", side_effect=AssertionError("unexpected subprocess spawn"))
+        spawn_guard.start()
+        self.addCleanup(spawn_guard.stop)
+        # SSH entry points are patched once per test; remote tests only set side effects.
+        self.mock_ssh_run = self._start_patch(
+            "simple_sync.ssh.transport.run_ssh_command", return_value=_ssh_result(0)
+        )
+        self.mock_listing = self._start_patch("simple_sync.engine.snapshot.listing.list_remote_entries")
+
+    def _start_patch(self, target: str, **kwargs) -> mock.MagicMock:
+        patcher = mock.patch(target, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_local_profile_template_matches_serializer(self):
+        _write_local_profile(
+            self.config_dir,
+            "demo",
+            self.src_root,
+            self.dst_root,
+            conflict_policy="manual",
+            conflict_kwargs={"manual_behavior": "copy_both"},
+            ssh_kwargs={"pre_connect_command": "echo setup"},
+        )
+        expected = config.ProfileConfig(
+            profile=config.ProfileBlock(name="demo", description="demo profile"),
+            endpoints={
+                "A": config.EndpointBlock(name="A", type="local", path=str(self.src_root)),
+                "B": config.EndpointBlock(name="B", type="local", path=str(self.dst_root)),
+            },
+            conflict=config.ConflictBlock(policy="manual", manual_behavior="copy_both"),
+            ignore=config.IgnoreBlock(patterns=[]),
+            schedule=config.ScheduleBlock(),
+            ssh=config.SshBlock(pre_connect_command="echo setup"),
+        )
+        loaded = config.load_profile_from_path(self.config_dir / "profiles" / "demo.toml")
+        self.assertEqual(loaded, expected)
+
     def test_run_copies_files_and_writes_state(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "hello.txt").write_text("hello")
-            _write_local_profile(config_dir, "demo", src_root, dst_root)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "run", "demo"])
-            self.assertEqual(exit_code, 0)
-            self.assertEqual(stdout, "")
-            self.assertTrue((dst_root / "hello.txt").exists())
-            state_path = config_dir / "state" / "demo.json"
-            self.assertTrue(state_path.exists())
-            data = json.loads(state_path.read_text())
-            self.assertIn("A", data["endpoints"])
-            self.assertIn("hello.txt", data["endpoints"]["A"])
-            self.assertIn("Plan summary", stderr)
+        _write_local_profile(self.config_dir, "demo", self.src_root, self.dst_root)
+        exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "run", "demo"])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, "")
+        self.assertTrue((self.dst_root / "hello.txt").exists())
+        self.assertTrue((self.config_dir / "state" / "demo.json").exists())
+        state = state_store.load_state("demo", self.config_dir)
+        self.assertIsNotNone(state_store.get_last_entry(state, "A", "hello.txt"))
+        self.assertIn("Plan summary", stderr)
 
     def test_dry_run_does_not_modify_destination_or_state(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "hello.txt").write_text("hello")
-            _write_local_profile(config_dir, "demo", src_root, dst_root)
-            exit_code, stdout, stderr = _run_cli(
-                ["--config-dir", config_tmp, "run", "demo", "--dry-run"]
-            )
-            self.assertEqual(exit_code, 0)
-            self.assertFalse((dst_root / "hello.txt").exists())
-            self.assertFalse((config_dir / "state" / "demo.json").exists())
-            self.assertIn("Dry-run complete", stderr)
+        _write_local_profile(self.config_dir, "demo", self.src_root, self.dst_root)
+        exit_code, stdout, stderr = _run_cli(
+            ["--config-dir", str(self.config_dir), "run", "demo", "--dry-run"]
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertFalse((self.dst_root / "hello.txt").exists())
+        self.assertFalse((self.config_dir / "state" / "demo.json").exists())
+        self.assertIn("Dry-run complete", stderr)
 
     def test_run_manual_policy_records_conflict(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "hello.txt").write_text("hello")
-            (dst_root / "hello.txt").write_text("world!!")
-            _write_local_profile(
-                config_dir,
-                "demo",
-                src_root,
-                dst_root,
-                conflict_policy="manual",
-                conflict_kwargs={"manual_behavior": "copy_both"},
-            )
-            exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "run", "demo"])
-            self.assertEqual(exit_code, 0)
-            state_path = config_dir / "state" / "demo.json"
-            data = json.loads(state_path.read_text())
-            self.assertEqual(len(data.get("conflicts", [])), 1)
-            exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "conflicts", "demo"])
-            self.assertEqual(exit_code, 0)
-            self.assertIn("manual_copy_both", stdout)
-
-    def test_run_executes_preconnect_command(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "hello.txt").write_text("hello")
-            _write_local_profile(
-                config_dir,
-                "demo",
-                src_root,
-                dst_root,
-                ssh_kwargs={"pre_connect_command": "echo setup"},
-            )
-            with mock.patch("subprocess.run", return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")) as mock_run:
-                exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "run", "demo"])
-            self.assertEqual(exit_code, 0)
-            self.assertTrue(mock_run.called)
+        (self.dst_root / "hello.txt").write_text("world!!")
+        _write_local_profile(
+            self.config_dir,
+            "demo",
+            self.src_root,
+            self.dst_root,
+            conflict_policy="manual",
+            conflict_kwargs={"manual_behavior": "copy_both"},
+        )
+        exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "run", "demo"])
+        self.assertEqual(exit_code, 0)
+        state = state_store.load_state("demo", self.config_dir)
+        self.assertEqual(len(state.conflicts), 1)
+        exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "conflicts", "demo"])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("manual_copy_both", stdout)
+
+    @mock.patch("subprocess.run", return_value=_OK_COMPLETED)
+    def test_run_executes_preconnect_command(self, mock_run):
+        _write_local_profile(
+            self.config_dir,
+            "demo",
+            self.src_root,
+            self.dst_root,
+            ssh_kwargs={"pre_connect_command": "echo setup"},
+        )
+        exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "run", "demo"])
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(mock_run.called)
 
     def test_run_handles_auth_prompt_error(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "hello.txt").write_text("hello")
-            _write_local_profile(config_dir, "demo", src_root, dst_root)
-            with mock.patch(
-                "simple_sync.cli.executor.apply_operations",
-                side_effect=executor.ExecutionError("SSH authentication prompt detected; refusing to continue."),
-            ):
-                exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "run", "demo"])
-            self.assertNotEqual(exit_code, 0)
-            self.assertIn("authentication prompt", stderr.lower())
-
-    def test_run_supports_remote_endpoint(self):
-        with tempfile.TemporaryDirectory() as config_tmp, tempfile.TemporaryDirectory() as src_tmp:
-            config_dir = Path(config_tmp)
-            src_root = Path(src_tmp)
-            (src_root / "hello.txt").write_text("hello")
-
-            profile_cfg = config.ProfileConfig(
-                profile=config.ProfileBlock(name="remote", description="Remote profile"),
-                endpoints={
-                    "local": config.EndpointBlock(name="local", type="local", path=str(src_root)),
-                    "remote": config.EndpointBlock(name="remote", type="ssh", host="example.com", path="/srv/remote"),
-                },
-                conflict=config.ConflictBlock(policy="newest"),
-                ignore=config.IgnoreBlock(patterns=[]),
-                schedule=config.ScheduleBlock(),
-                ssh=config.SshBlock(ssh_command="ssh"),
-            )
-            base = config.ensure_config_structure(config_dir)
-            (base / "profiles" / "remote.toml").write_text(config.profile_to_toml(profile_cfg))
-
-            operations: list[types.Operation] = []
-            remote_entries: dict[str, types.FileEntry] = {}
-
-            def fake_listing(host, root, **_kwargs):
-                self.assertEqual(host, "example.com")
-                return remote_entries.copy()
-
-            def fake_apply_operations(ops, dry_run: bool = False, **_kwargs):
-                operations.extend(ops)
-                for op in ops:
-                    if op.type == types.OperationType.COPY and op.destination.type == types.EndpointType.SSH:
-                        source_file = Path(op.source.path) / op.path
-                        remote_entries[op.path] = types.FileEntry(
-                            path=op.path, is_dir=False, size=source_file.stat().st_size, mtime=source_file.stat().st_mtime
-                        )
-
-            def fake_run_ssh_command(*, remote_command, **_kwargs):
-                if remote_command[:2] == ["test", "-d"]:
-                    return cli.ssh_transport.SSHResult(exit_code=0, stdout="", stderr="")
-                return cli.ssh_transport.SSHResult(exit_code=0, stdout="", stderr="")
-
-            with mock.patch("simple_sync.engine.snapshot.listing.list_remote_entries", side_effect=fake_listing), mock.patch(
-                "simple_sync.engine.executor.apply_operations", side_effect=fake_apply_operations
-            ), mock.patch("builtins.input", return_value="n"), mock.patch(
-                "simple_sync.ssh.transport.run_ssh_command", side_effect=fake_run_ssh_command
-            ):
-                exit_code, stdout, stderr = _run_cli(["--config-dir", config_tmp, "run", "remote"])
+        from simple_sync.engine import executor
 
-            self.assertEqual(exit_code, 0)
-            self.assertTrue(any(op.destination.type == types.EndpointType.SSH for op in operations))
-            self.assertTrue((config_dir / "state" / "remote.json").exists())
+        _write_local_profile(self.config_dir, "demo", self.src_root, self.dst_root)
+        error = executor.ExecutionError("SSH authentication prompt detected; refusing to continue.")
+        with mock.patch.object(executor, "apply_operations", side_effect=error):
+            exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "run", "demo"])
+        self.assertNotEqual(exit_code, 0)
+        self.assertIn("authentication prompt", stderr.lower())
+
+    @mock.patch("builtins.input", return_value="n")
+    def test_run_supports_remote_endpoint(self, _mock_input):
+        base = config.ensure_config_structure(self.config_dir)
+        (base / "profiles" / "remote.toml").write_text(_REMOTE_PROFILE_TOML.format(src=_toml_string(self.src_root)))
+
+        operations: list[types.Operation] = []
+        remote_entries: dict[str, types.FileEntry] = {}
+
+        def fake_listing(host, root, **_kwargs):
+            self.assertEqual(host, "example.com")
+            return remote_entries.copy()
+
+        def fake_apply_operations(ops, dry_run: bool = False, **_kwargs):
+            operations.extend(ops)
+            for op in ops:
+                if op.type == types.OperationType.COPY and op.destination.type == types.EndpointType.SSH:
+                    source_file = Path(op.source.path) / op.path
+                    remote_entries[op.path] = types.FileEntry(
+                        path=op.path, is_dir=False, size=source_file.stat().st_size, mtime_ns=source_file.stat().st_mtime_ns
+                    )
+
+        self.mock_listing.side_effect = fake_listing
+        with mock.patch("simple_sync.engine.executor.apply_operations", side_effect=fake_apply_operations):
+            exit_code, stdout, stderr = _run_cli(["--config-dir", str(self.config_dir), "run", "remote"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(any(op.destination.type == types.EndpointType.SSH for op in operations))
+        self.assertTrue((self.config_dir / "state" / "remote.json").exists())
 
 
 if __name__ == "__main__":
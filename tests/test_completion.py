@@ -6,8 +6,16 @@ import argparse
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 
 from simple_sync import completion, config
+from tests.scratch import ScratchTestCase
+
+
+def _fake_scandir(*names: str):
+    """Stand-in for os.scandir that lists the given names without touching the filesystem."""
+    entries = [SimpleNamespace(name=name) for name in names]
+    return lambda _path: iter(entries)
 
 
 class TestProfileCompleter(unittest.TestCase):
@@ -15,38 +23,20 @@ class TestProfileCompleter(unittest.TestCase):
 
     def test_completes_matching_profiles(self):
         """Test that profile completer returns matching profile names."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            profiles_dir = Path(tmpdir) / "profiles"
-            profiles_dir.mkdir(parents=True)
-
-            # Create test profiles
-            (profiles_dir / "dev.toml").touch()
-            (profiles_dir / "development.toml").touch()
-            (profiles_dir / "production.toml").touch()
+        ns = argparse.Namespace(config_dir="/config")
+        scandir = _fake_scandir("dev.toml", "development.toml", "production.toml", "notes.txt")
 
-            ns = argparse.Namespace(config_dir=tmpdir)
-
-            # Test prefix matching
-            results = list(completion.profile_completer("dev", ns))
-            self.assertIn("dev", results)
-            self.assertIn("development", results)
-            self.assertNotIn("production", results)
+        # Test prefix matching
+        results = list(completion.profile_completer("dev", ns, _scandir=scandir))
+        self.assertEqual(results, ["dev", "development"])
 
     def test_completes_all_profiles_with_empty_prefix(self):
         """Test that empty prefix returns all profiles."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            profiles_dir = Path(tmpdir) / "profiles"
-            profiles_dir.mkdir(parents=True)
+        ns = argparse.Namespace(config_dir="/config")
+        scandir = _fake_scandir("profile1.toml", "profile2.toml", ".hidden.toml")
 
-            (profiles_dir / "profile1.toml").touch()
-            (profiles_dir / "profile2.toml").touch()
-
-            ns = argparse.Namespace(config_dir=tmpdir)
-
-            results = list(completion.profile_completer("", ns))
-            self.assertEqual(len(results), 2)
-            self.assertIn("profile1", results)
-            self.assertIn("profile2", results)
+        results = list(completion.profile_completer("", ns, _scandir=scandir))
+        self.assertEqual(results, ["profile1", "profile2"])
 
     def test_returns_empty_if_no_profiles_dir(self):
         """Test that completer returns empty list if profiles directory doesn't exist."""
@@ -79,19 +69,9 @@ class TestProfileCompleter(unittest.TestCase):
             self.assertEqual(results, ["alpha", "beta", "zebra"])
 
 
-class TestEndpointCompleter(unittest.TestCase):
-    """Test endpoint name completion."""
-
-    def test_completes_endpoint_names_from_profile(self):
-        """Test that endpoint completer returns endpoint names from profile."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            profiles_dir = Path(tmpdir) / "profiles"
-            profiles_dir.mkdir(parents=True)
-
-            # Create a profile with endpoints
-            profile_content = """
+_ENDPOINT_PROFILE_TOML = """
 [profile]
-name = "test"
+name = "{name}"
 description = "Test"
 
 [conflict]
@@ -99,67 +79,51 @@ policy = "newest"
 
 [ignore]
 patterns = []
+{endpoints}"""
 
-[endpoints.local]
-type = "local"
-path = "/tmp/local"
 
-[endpoints.remote]
-type = "ssh"
-host = "example.com"
-path = "/tmp/remote"
+def _local_endpoint(name: str) -> str:
+    return f'\n[endpoints.{name}]\ntype = "local"\npath = "/tmp/{name}"\n'
 
-[endpoints.backup]
-type = "local"
-path = "/tmp/backup"
-"""
-            (profiles_dir / "test.toml").write_text(profile_content)
 
-            ns = argparse.Namespace(config_dir=tmpdir, profile="test")
+class TestEndpointCompleter(ScratchTestCase):
+    """Test endpoint name completion."""
 
-            results = list(completion.endpoint_completer("", ns))
-            self.assertEqual(len(results), 3)
-            self.assertIn("local", results)
-            self.assertIn("remote", results)
-            self.assertIn("backup", results)
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Profiles are only read by the completer, so the scratch root serves every test.
+        profiles_dir = cls._scratch_root / "profiles"
+        profiles_dir.mkdir()
+        remote = '\n[endpoints.remote]\ntype = "ssh"\nhost = "example.com"\npath = "/tmp/remote"\n'
+        (profiles_dir / "test.toml").write_text(
+            _ENDPOINT_PROFILE_TOML.format(
+                name="test", endpoints=_local_endpoint("local") + remote + _local_endpoint("backup")
+            )
+        )
+        (profiles_dir / "prefixed.toml").write_text(
+            _ENDPOINT_PROFILE_TOML.format(
+                name="prefixed",
+                endpoints="".join(_local_endpoint(name) for name in ("remote1", "remote2", "local")),
+            )
+        )
+
+    def test_completes_endpoint_names_from_profile(self):
+        """Test that endpoint completer returns endpoint names from profile."""
+        ns = argparse.Namespace(config_dir=str(self._scratch_root), profile="test")
+        results = list(completion.endpoint_completer("", ns))
+        self.assertEqual(len(results), 3)
+        self.assertIn("local", results)
+        self.assertIn("remote", results)
+        self.assertIn("backup", results)
 
     def test_filters_by_prefix(self):
         """Test that endpoint completer filters by prefix."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            profiles_dir = Path(tmpdir) / "profiles"
-            profiles_dir.mkdir(parents=True)
-
-            profile_content = """
-[profile]
-name = "test"
-description = "Test"
-
-[conflict]
-policy = "newest"
-
-[ignore]
-patterns = []
-
-[endpoints.remote1]
-type = "local"
-path = "/tmp/r1"
-
-[endpoints.remote2]
-type = "local"
-path = "/tmp/r2"
-
-[endpoints.local]
-type = "local"
-path = "/tmp/local"
-"""
-            (profiles_dir / "test.toml").write_text(profile_content)
-
-            ns = argparse.Namespace(config_dir=tmpdir, profile="test")
-
-            results = list(completion.endpoint_completer("remote", ns))
-            self.assertIn("remote1", results)
-            self.assertIn("remote2", results)
-            self.assertNotIn("local", results)
+        ns = argparse.Namespace(config_dir=str(self._scratch_root), profile="prefixed")
+        results = list(completion.endpoint_completer("remote", ns))
+        self.assertIn("remote1", results)
+        self.assertIn("remote2", results)
+        self.assertNotIn("local", results)
 
     def test_returns_empty_if_profile_not_specified(self):
         """Test that completer returns empty if no profile specified."""
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import tempfile
 import textwrap
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from simple_sync import config
 
@@ -138,6 +140,153 @@ class TestConfigLoader(unittest.TestCase):
                 config.load_profile("demo", Path(tmp))
         self.assertIn("not defined", str(err.exception))
 
+    def test_inline_comments_are_stripped_outside_strings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_profile(
+                Path(tmp),
+                "demo",
+                """
+                [profile]
+                name = "demo"  # trailing comment
+                description = "Issue #42 mirror"
+
+                [conflict]
+                policy = "newest"
+
+                [ignore]
+                patterns = ["#scratch", "*.tmp"]  # editor files
+
+                [endpoints.local]
+                type = "local"
+                path = "/tmp/a"
+
+                [endpoints.remote]
+                type = "local"
+                path = "/tmp/b"
+                """,
+            )
+            profile = config.load_profile("demo", Path(tmp))
+        self.assertEqual(profile.profile.name, "demo")
+        self.assertEqual(profile.profile.description, "Issue #42 mirror")
+        self.assertEqual(profile.ignore.patterns, ["#scratch", "*.tmp"])
+
+    def test_reports_every_invalid_section_at_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_profile(
+                Path(tmp),
+                "demo",
+                """
+                [profile]
+                name = "demo"
+                description = "Demo profile"
+
+                [conflict]
+                policy = "newest"
+                merge_fallback = "bogus"
+
+                [endpoints.local]
+                type = "local"
+                """,
+            )
+            with self.assertRaises(config.ConfigError) as err:
+                config.load_profile("demo", Path(tmp))
+        message = str(err.exception)
+        self.assertIn("2 problems", message)
+        self.assertIn("must define 'path'", message)
+        self.assertIn("merge_fallback 'bogus'", message)
+
+    def test_validate_profile_skips_checks_that_depend_on_failed_sections(self):
+        data = {
+            "profile": {"name": "demo", "description": "Demo"},
+            "conflict": {"policy": "prefer", "prefer": "missing"},
+            "endpoints": {"local": {"type": "local"}},
+        }
+        errors = config.validate_profile(data)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("must define 'path'", errors[0])
+        data["endpoints"]["local"]["path"] = "/tmp/a"
+        self.assertEqual(len(config.validate_profile(data)), 1)
+        data["conflict"]["prefer"] = "local"
+        self.assertEqual(config.validate_profile(data), [])
+
+    def test_unchanged_profile_is_served_from_cache(self):
+        contents = """
+            [profile]
+            name = "demo"
+            description = "{description}"
+
+            [conflict]
+            policy = "newest"
+
+            [endpoints.local]
+            type = "local"
+            path = "/tmp/a"
+
+            [endpoints.remote]
+            type = "local"
+            path = "/tmp/b"
+            """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write_profile(Path(tmp), "demo", contents.format(description="first"))
+            first = config.load_profile_from_path(path)
+            self.assertIs(config.load_profile_from_path(path), first)
+            _write_profile(Path(tmp), "demo", contents.format(description="second edit"))
+            second = config.load_profile_from_path(path)
+            config.clear_profile_cache()
+            reloaded = config.load_profile_from_path(path)
+        self.assertEqual(second.profile.description, "second edit")
+        self.assertIsNot(reloaded, second)
+        self.assertEqual(reloaded, second)
+
+
+    def test_concurrent_loads_evict_under_the_cache_lock(self):
+        contents = """
+            [profile]
+            name = "{name}"
+            description = "{name}"
+
+            [conflict]
+            policy = "newest"
+
+            [endpoints.local]
+            type = "local"
+            path = "/tmp/a"
+
+            [endpoints.remote]
+            type = "local"
+            path = "/tmp/b"
+            """
+        barrier = threading.Barrier(2, timeout=0.2)
+
+        class RacingCache(dict):
+            # Hold both writers mid-eviction so an unlocked cache would delete the same key twice.
+            def __delitem__(self, key):
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+                super().__delitem__(key)
+
+        errors = []
+
+        def load(path):
+            try:
+                config.load_profile_from_path(path)
+            except Exception as exc:  # pragma: no cover - only on regression
+                errors.append(exc)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [_write_profile(Path(tmp), name, contents.format(name=name)) for name in ("one", "two")]
+            cache = RacingCache()
+            with mock.patch.object(config, "_PROFILE_CACHE", cache), mock.patch.object(config, "PROFILE_CACHE_SIZE", 1):
+                dict.__setitem__(cache, "seed", ((0, 0, 0, 0), None))
+                threads = [threading.Thread(target=load, args=(path,)) for path in paths]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(dict.__len__(cache), 1)
 
 if __name__ == "__main__":
     unittest.main()
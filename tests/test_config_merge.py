@@ -9,6 +9,14 @@ from pathlib import Path
 from simple_sync import config
 
 
+def _load_conflict(block: dict) -> config.ConflictBlock:
+    """Parse a [conflict] table with the loader's own validator, skipping the TOML file round trip.
+
+    Whole-profile loading is covered by test_roundtrip_profile_with_merge_settings.
+    """
+    return config._load_conflict(block, Path("test.toml"))
+
+
 class TestMergeConfiguration(unittest.TestCase):
     """Test merge configuration fields in ConflictBlock."""
 
@@ -35,124 +43,35 @@ class TestMergeConfiguration(unittest.TestCase):
             )
             self.assertEqual(block.merge_fallback, fallback)
 
-    def test_load_profile_with_merge_settings(self):
-        """Test loading a profile with merge settings."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
-
-[conflict]
-policy = "newest"
-merge_text_files = true
-merge_fallback = "newest"
-
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            profile = config.load_profile_from_path(tmp_path)
-            self.assertTrue(profile.conflict.merge_text_files)
-            self.assertEqual(profile.conflict.merge_fallback, "newest")
-        finally:
-            tmp_path.unlink()
-
-    def test_load_profile_with_merge_disabled(self):
-        """Test loading a profile with merge disabled."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
+    def test_conflict_table_with_merge_settings(self):
+        """Test parsing a [conflict] table with merge settings."""
+        conflict = _load_conflict({"policy": "newest", "merge_text_files": True, "merge_fallback": "newest"})
+        self.assertTrue(conflict.merge_text_files)
+        self.assertEqual(conflict.merge_fallback, "newest")
 
-[conflict]
-policy = "newest"
-merge_text_files = false
-merge_fallback = "manual"
+    def test_conflict_table_with_merge_disabled(self):
+        """Test parsing a [conflict] table with merge disabled."""
+        conflict = _load_conflict({"policy": "newest", "merge_text_files": False, "merge_fallback": "manual"})
+        self.assertFalse(conflict.merge_text_files)
+        self.assertEqual(conflict.merge_fallback, "manual")
 
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            profile = config.load_profile_from_path(tmp_path)
-            self.assertFalse(profile.conflict.merge_text_files)
-            self.assertEqual(profile.conflict.merge_fallback, "manual")
-        finally:
-            tmp_path.unlink()
-
-    def test_load_profile_without_merge_settings_uses_defaults(self):
-        """Test that profiles without merge settings use defaults."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
-
-[conflict]
-policy = "newest"
-
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            profile = config.load_profile_from_path(tmp_path)
-            # Should use defaults
-            self.assertTrue(profile.conflict.merge_text_files)
-            self.assertEqual(profile.conflict.merge_fallback, "newest")
-        finally:
-            tmp_path.unlink()
+    def test_conflict_table_without_merge_settings_uses_defaults(self):
+        """Test that a [conflict] table without merge settings uses defaults."""
+        conflict = _load_conflict({"policy": "newest"})
+        self.assertTrue(conflict.merge_text_files)
+        self.assertEqual(conflict.merge_fallback, "newest")
 
     def test_invalid_merge_fallback_raises_error(self):
-        """Test that invalid merge_fallback values raise ConfigError."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
-
-[conflict]
-policy = "newest"
-merge_fallback = "invalid"
-
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            with self.assertRaises(config.ConfigError) as ctx:
-                config.load_profile_from_path(tmp_path)
-            self.assertIn("merge_fallback", str(ctx.exception))
-            self.assertIn("invalid", str(ctx.exception))
-        finally:
-            tmp_path.unlink()
+        """Test that invalid merge_fallback values are reported."""
+        data = {
+            "profile": {"name": "test", "description": "Test profile"},
+            "conflict": {"policy": "newest", "merge_fallback": "invalid"},
+            "endpoints": {"local": {"type": "local", "path": "/tmp/test"}},
+        }
+        errors = config.validate_profile(data)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("merge_fallback", errors[0])
+        self.assertIn("invalid", errors[0])
 
     def test_profile_to_toml_includes_merge_settings(self):
         """Test that serializing a profile includes merge settings."""
@@ -190,75 +109,25 @@ path = "/tmp/test"
         self.assertIn("merge_text_files = false", toml_text)
         self.assertIn('merge_fallback = "newest"', toml_text)
 
-    def test_merge_with_prefer_policy(self):
-        """Test merge configuration with prefer policy."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
-
-[conflict]
-policy = "prefer"
-prefer = "local"
-merge_text_files = true
-merge_fallback = "prefer"
-
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-
-[endpoints.remote]
-type = "local"
-path = "/tmp/remote"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            profile = config.load_profile_from_path(tmp_path)
-            self.assertEqual(profile.conflict.policy, "prefer")
-            self.assertEqual(profile.conflict.prefer, "local")
-            self.assertTrue(profile.conflict.merge_text_files)
-            self.assertEqual(profile.conflict.merge_fallback, "prefer")
-        finally:
-            tmp_path.unlink()
-
-    def test_merge_with_manual_policy(self):
-        """Test merge configuration with manual policy."""
-        toml_content = """
-[profile]
-name = "test"
-description = "Test profile"
-
-[conflict]
-policy = "manual"
-manual_behavior = "copy_both"
-merge_text_files = true
-merge_fallback = "manual"
-
-[ignore]
-patterns = []
-
-[endpoints.local]
-type = "local"
-path = "/tmp/test"
-"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_content)
-            tmp_path = Path(tmp.name)
-
-        try:
-            profile = config.load_profile_from_path(tmp_path)
-            self.assertEqual(profile.conflict.policy, "manual")
-            self.assertEqual(profile.conflict.manual_behavior, "copy_both")
-            self.assertTrue(profile.conflict.merge_text_files)
-            self.assertEqual(profile.conflict.merge_fallback, "manual")
-        finally:
-            tmp_path.unlink()
+    def test_conflict_table_merge_with_prefer_policy(self):
+        """Test parsing merge settings alongside the prefer policy."""
+        conflict = _load_conflict(
+            {"policy": "prefer", "prefer": "local", "merge_text_files": True, "merge_fallback": "prefer"}
+        )
+        self.assertEqual(conflict.policy, "prefer")
+        self.assertEqual(conflict.prefer, "local")
+        self.assertTrue(conflict.merge_text_files)
+        self.assertEqual(conflict.merge_fallback, "prefer")
+
+    def test_conflict_table_merge_with_manual_policy(self):
+        """Test parsing merge settings alongside the manual policy."""
+        conflict = _load_conflict(
+            {"policy": "manual", "manual_behavior": "copy_both", "merge_text_files": True, "merge_fallback": "manual"}
+        )
+        self.assertEqual(conflict.policy, "manual")
+        self.assertEqual(conflict.manual_behavior, "copy_both")
+        self.assertTrue(conflict.merge_text_files)
+        self.assertEqual(conflict.merge_fallback, "manual")
 
     def test_roundtrip_profile_with_merge_settings(self):
         """Test that profile can be saved and loaded with merge settings."""
@@ -276,21 +145,16 @@ path = "/tmp/test"
         # Serialize to TOML
         toml_text = config.profile_to_toml(original)
 
-        # Save to file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as tmp:
-            tmp.write(toml_text)
-            tmp_path = Path(tmp.name)
-
-        try:
-            # Load back
+        # Save to file and load back
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp) / "test.toml"
+            tmp_path.write_text(toml_text)
             loaded = config.load_profile_from_path(tmp_path)
 
-            # Verify merge settings match
-            self.assertEqual(loaded.conflict.merge_text_files, original.conflict.merge_text_files)
-            self.assertEqual(loaded.conflict.merge_fallback, original.conflict.merge_fallback)
-            self.assertEqual(loaded.conflict.policy, original.conflict.policy)
-        finally:
-            tmp_path.unlink()
+        # Verify merge settings match
+        self.assertEqual(loaded.conflict.merge_text_files, original.conflict.merge_text_files)
+        self.assertEqual(loaded.conflict.merge_fallback, original.conflict.merge_fallback)
+        self.assertEqual(loaded.conflict.policy, original.conflict.policy)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+from contextlib import ExitStack
 from pathlib import Path
 from unittest import mock
 
@@ -13,29 +14,37 @@ from simple_sync import config
 class TestConfigPathResolution(unittest.TestCase):
     """Ensure platform-specific config directories resolve correctly."""
 
+    def setUp(self):
+        # The resolution is cached per process; each test patches its inputs afresh.
+        config.get_base_config_dir.cache_clear()
+        self.addCleanup(config.get_base_config_dir.cache_clear)
+
+    @staticmethod
+    def _platform(*, windows: bool, home: Path | None = None, environ: dict | None = None) -> ExitStack:
+        """Patch the platform inputs get_base_config_dir reads, as one context."""
+        stack = ExitStack()
+        stack.enter_context(mock.patch("simple_sync.config.is_windows", return_value=windows))
+        if home is not None:
+            stack.enter_context(mock.patch("simple_sync.config.Path.home", return_value=home))
+        if environ is not None:
+            stack.enter_context(mock.patch.dict("simple_sync.config.os.environ", environ, clear=True))
+        return stack
+
     def test_base_dir_posix(self):
         fake_home = Path("/tmp/fakehome")
-        with mock.patch("simple_sync.config.Path.home", return_value=fake_home), mock.patch(
-            "simple_sync.config.is_windows", return_value=False
-        ):
+        with self._platform(windows=False, home=fake_home):
             base = config.get_base_config_dir()
         self.assertEqual(base, fake_home / ".config" / config.CONFIG_DIR_NAME)
 
     def test_base_dir_windows_uses_appdata(self):
         fake_appdata = Path("C:/Users/test/AppData/Roaming")
-        with mock.patch("simple_sync.config.is_windows", return_value=True), mock.patch.dict(
-            "simple_sync.config.os.environ", {"APPDATA": str(fake_appdata)}
-        ):
+        with self._platform(windows=True, environ={"APPDATA": str(fake_appdata)}):
             base = config.get_base_config_dir()
         self.assertEqual(base, fake_appdata / config.CONFIG_DIR_NAME)
 
     def test_base_dir_windows_without_appdata(self):
         fake_home = Path("C:/Users/test")
-        with mock.patch("simple_sync.config.is_windows", return_value=True), mock.patch(
-            "simple_sync.config.Path.home", return_value=fake_home
-        ), mock.patch.dict(
-            "simple_sync.config.os.environ", {}, clear=True
-        ):
+        with self._platform(windows=True, home=fake_home, environ={}):
             base = config.get_base_config_dir()
         self.assertEqual(base, fake_home / "AppData" / "Roaming" / config.CONFIG_DIR_NAME)
 
@@ -51,6 +60,23 @@ class TestEnsureConfigStructure(unittest.TestCase):
             for sub in config.SUBDIRECTORIES:
                 self.assertTrue((base / sub).exists())
 
+    def test_ensure_structure_is_idempotent_and_handles_no_subdirs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp) / "nested" / "config_root"
+            config.ensure_config_structure(base)
+            config.ensure_config_structure(base)
+            bare = config.ensure_config_structure(Path(tmp) / "bare", subdirs=())
+            self.assertEqual(sorted(p.name for p in base.iterdir()), sorted(config.SUBDIRECTORIES))
+            self.assertTrue(bare.is_dir())
+
+    def test_ensure_structure_rejects_file_in_place_of_subdirectory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            (base / "state").write_text("not a directory")
+            with self.assertRaises(config.ConfigError) as err:
+                config.ensure_config_structure(base)
+        self.assertIn(str(base / "state"), str(err.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,12 +5,14 @@ from __future__ import annotations
 import logging
 import signal
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from simple_sync import config
+from simple_sync import config, types
 from simple_sync.daemon.runner import DaemonRunner
+from simple_sync.engine import snapshot
 
 
 def _write_profile(base: Path, name: str, enabled: bool, *, run_on_start: bool = True) -> None:
@@ -54,6 +56,45 @@ class TestDaemonRunner(unittest.TestCase):
                 runner.run_forever(run_once=True)
         mock_runner.return_value.run.assert_called_once_with(profile_name="enabled", dry_run=False)
 
+    def test_due_profiles_run_concurrently_with_separate_logs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            for name in ("first", "second"):
+                _write_profile(base, name, True)
+            runner = DaemonRunner(config_dir=tmpdir)
+            both_started = threading.Barrier(2, timeout=5)
+
+            def fake_snapshot(endpoint, **_kwargs):
+                logging.getLogger("simple_sync.test").warning("walking %s", endpoint.id)
+                return snapshot.SnapshotResult(root=endpoint.path, entries={})
+
+            def fake_run(*, profile_name, dry_run):
+                both_started.wait()
+                logging.getLogger("simple_sync.test").warning("syncing %s", profile_name)
+                # Records from the engine's worker threads belong to the profile that submitted them.
+                snapshot.build_snapshots_for_endpoints(
+                    [
+                        types.Endpoint(id=f"{profile_name}-{side}", type=types.EndpointType.LOCAL, path=tmpdir)
+                        for side in ("a", "b")
+                    ]
+                )
+
+            with mock.patch("simple_sync.cli.SyncRunner") as mock_runner, mock.patch.object(
+                snapshot, "build_snapshot_for_endpoint", side_effect=fake_snapshot
+            ):
+                mock_runner.return_value.run.side_effect = fake_run
+                runner.run_forever(run_once=True)
+            logs = {name: (base / "logs" / f"{name}.log").read_text() for name in ("first", "second")}
+        self.assertEqual(mock_runner.return_value.run.call_count, 2)
+        self.assertIn("syncing first", logs["first"])
+        self.assertNotIn("syncing second", logs["first"])
+        self.assertIn("syncing second", logs["second"])
+        self.assertNotIn("syncing first", logs["second"])
+        for name, other in (("first", "second"), ("second", "first")):
+            self.assertIn(f"walking {name}-a", logs[name])
+            self.assertIn(f"walking {name}-b", logs[name])
+            self.assertNotIn(f"walking {other}", logs[name])
+
     def test_handle_signal_stop_and_reload(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             runner = DaemonRunner(config_dir=tmpdir)
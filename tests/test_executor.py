@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import os
-import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -11,97 +10,161 @@ from unittest import mock
 from simple_sync import types
 from simple_sync.engine import executor
 from simple_sync.ssh import transport as ssh_transport
+from tests.scratch import ScratchTestCase
 
 
 def make_endpoint(root: Path) -> types.Endpoint:
     return types.Endpoint(id=str(root), type=types.EndpointType.LOCAL, path=str(root))
 
 
-class TestExecutor(unittest.TestCase):
+class TestExecutor(ScratchTestCase):
+    scratch_prefix = "ss-executor-"
+
+    def setUp(self):
+        case_dir = Path(self._scratch_dir())
+        self.src_root = case_dir / "src"
+        self.dst_root = case_dir / "dst"
+        self.src_root.mkdir()
+        self.dst_root.mkdir()
+
     def test_copy_operation_creates_file(self):
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "file.txt").write_text("hello")
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-            )
-            executor.apply_operations([op])
-            self.assertTrue((dst_root / "file.txt").exists())
-            self.assertEqual((dst_root / "file.txt").read_text(), "hello")
+        src_root = self.src_root
+        dst_root = self.dst_root
+        (src_root / "file.txt").write_text("hello")
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="file.txt",
+            source=make_endpoint(src_root),
+            destination=make_endpoint(dst_root),
+        )
+        executor.apply_operations([op])
+        self.assertTrue((dst_root / "file.txt").exists())
+        self.assertEqual((dst_root / "file.txt").read_text(), "hello")
 
     def test_delete_operation_removes_file(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            dst_root = Path(tmpdir)
-            file_path = dst_root / "delete_me.txt"
-            file_path.write_text("bye")
-            op = types.Operation(
-                type=types.OperationType.DELETE,
-                path="delete_me.txt",
-                destination=make_endpoint(dst_root),
-            )
-            executor.apply_operations([op])
-            self.assertFalse(file_path.exists())
+        dst_root = self.dst_root
+        file_path = dst_root / "delete_me.txt"
+        file_path.write_text("bye")
+        op = types.Operation(
+            type=types.OperationType.DELETE,
+            path="delete_me.txt",
+            destination=make_endpoint(dst_root),
+        )
+        executor.apply_operations([op])
+        self.assertFalse(file_path.exists())
 
     def test_dry_run_skips_changes(self):
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "file.txt").write_text("hello")
-            copy_op = types.Operation(
-                type=types.OperationType.COPY,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-            )
-            executor.apply_operations([copy_op], dry_run=True)
-            self.assertFalse((dst_root / "file.txt").exists())
+        src_root = self.src_root
+        dst_root = self.dst_root
+        (src_root / "file.txt").write_text("hello")
+        copy_op = types.Operation(
+            type=types.OperationType.COPY,
+            path="file.txt",
+            source=make_endpoint(src_root),
+            destination=make_endpoint(dst_root),
+        )
+        executor.apply_operations([copy_op], dry_run=True)
+        self.assertFalse((dst_root / "file.txt").exists())
 
     def test_copy_with_suffix(self):
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            (src_root / "file.txt").write_text("hello")
-            op = types.Operation(
+        src_root = self.src_root
+        dst_root = self.dst_root
+        (src_root / "file.txt").write_text("hello")
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="file.txt",
+            source=make_endpoint(src_root),
+            destination=make_endpoint(dst_root),
+            metadata={"target_suffix": "file.txt.conflict-A"},
+        )
+        executor.apply_operations([op])
+        self.assertTrue((dst_root / "file.txt.conflict-A").exists())
+
+    def test_copy_local_to_remote_invokes_ssh_helper(self):
+        src_root = self.src_root
+        (src_root / "file.txt").write_text("hello")
+        local_endpoint = types.Endpoint(
+            id="local",
+            type=types.EndpointType.LOCAL,
+            path=str(src_root),
+        )
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+        )
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="file.txt",
+            source=local_endpoint,
+            destination=remote_endpoint,
+        )
+        with mock.patch("simple_sync.engine.executor._ensure_remote_dir") as mock_mkdir, mock.patch(
+            "simple_sync.engine.executor.ssh_copy.copy_local_to_remote"
+        ) as mock_copy:
+            executor.apply_operations([op])
+        mock_mkdir.assert_called_once()
+        mock_copy.assert_called_once()
+
+    def test_many_local_to_remote_copies_use_one_tar_batch(self):
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+        )
+        src_root = self.src_root
+        names = [f"file{i}.txt" for i in range(executor.TAR_BATCH_MIN_FILES)]
+        for name in names:
+            (src_root / name).write_text(name)
+        ops = [
+            types.Operation(
                 type=types.OperationType.COPY,
-                path="file.txt",
+                path=name,
                 source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"target_suffix": "file.txt.conflict-A"},
+                destination=remote_endpoint,
             )
-            executor.apply_operations([op])
-            self.assertTrue((dst_root / "file.txt.conflict-A").exists())
+            for name in names
+        ]
+        with mock.patch("simple_sync.engine.executor._ensure_remote_dir"), mock.patch(
+            "simple_sync.engine.executor.ssh_copy.copy_batch_to_remote"
+        ) as mock_batch, mock.patch("simple_sync.engine.executor.ssh_copy.copy_local_to_remote") as mock_copy:
+            executor.apply_operations(ops)
+        mock_batch.assert_called_once()
+        self.assertEqual(mock_batch.call_args.kwargs["rel_paths"], names)
+        self.assertEqual(mock_batch.call_args.kwargs["remote_root"], "/remote")
+        mock_copy.assert_not_called()
 
-    def test_copy_local_to_remote_invokes_ssh_helper(self):
-        with tempfile.TemporaryDirectory() as src_tmp:
-            src_root = Path(src_tmp)
-            (src_root / "file.txt").write_text("hello")
-            local_endpoint = types.Endpoint(
-                id="local",
-                type=types.EndpointType.LOCAL,
-                path=str(src_root),
-            )
-            remote_endpoint = types.Endpoint(
-                id="remote",
-                type=types.EndpointType.SSH,
-                path="/remote",
-                host="example.com",
-            )
-            op = types.Operation(
+    def test_few_local_to_remote_copies_upload_in_parallel(self):
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+        )
+        src_root = self.src_root
+        (src_root / "sub").mkdir()
+        names = ["a.txt", "sub/b.txt", "sub/c.txt"]
+        for name in names:
+            (src_root / name).write_text(name)
+        ops = [
+            types.Operation(
                 type=types.OperationType.COPY,
-                path="file.txt",
-                source=local_endpoint,
+                path=name,
+                source=make_endpoint(src_root),
                 destination=remote_endpoint,
             )
-            with mock.patch("simple_sync.engine.executor._ensure_remote_dir") as mock_mkdir, mock.patch(
-                "simple_sync.engine.executor.ssh_copy.copy_local_to_remote"
-            ) as mock_copy:
-                executor.apply_operations([op])
-        mock_mkdir.assert_called_once()
-        mock_copy.assert_called_once()
+            for name in names
+        ]
+        with mock.patch("simple_sync.engine.executor._ensure_remote_dir") as mock_mkdir, mock.patch(
+            "simple_sync.engine.executor.ssh_copy.copy_many"
+        ) as mock_many, mock.patch("simple_sync.engine.executor.ssh_copy.copy_local_to_remote") as mock_copy:
+            executor.apply_operations(ops)
+        mock_mkdir.assert_called_once_with(remote_endpoint, "/remote", "/remote/sub")
+        transfers = mock_many.call_args.kwargs["transfers"]
+        self.assertEqual([remote for _local, remote in transfers], ["/remote/a.txt", "/remote/sub/b.txt", "/remote/sub/c.txt"])
+        mock_copy.assert_not_called()
 
     def test_delete_remote_runs_ssh_command(self):
         remote_endpoint = types.Endpoint(
@@ -124,7 +187,66 @@ class TestExecutor(unittest.TestCase):
             executor.apply_operations([op])
         mock_run.assert_called_once()
 
-    def test_remote_to_remote_copy_relays_via_tempfile(self):
+    def test_remote_deletes_share_one_ssh_command(self):
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+        )
+        ops = [
+            types.Operation(type=types.OperationType.DELETE, path=name, destination=remote_endpoint)
+            for name in ("old.txt", "stale/dir")
+        ]
+        with mock.patch(
+            "simple_sync.engine.executor.ssh_transport.run_ssh_command",
+            return_value=ssh_transport.SSHResult(exit_code=0, stdout="", stderr=""),
+        ) as mock_run:
+            executor.apply_operations(ops)
+        mock_run.assert_called_once()
+        self.assertEqual(
+            mock_run.call_args.kwargs["remote_command"], ["rm", "-rf", "/remote/old.txt", "/remote/stale/dir"]
+        )
+
+    def test_batching_keeps_plan_order_across_operation_kinds(self):
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+        )
+        (self.src_root / "dir").mkdir()
+        (self.src_root / "dir" / "new.txt").write_text("new")
+        ops = [
+            types.Operation(type=types.OperationType.DELETE, path="old.txt", destination=remote_endpoint),
+            types.Operation(type=types.OperationType.DELETE, path="dir", destination=remote_endpoint),
+            types.Operation(
+                type=types.OperationType.COPY,
+                path="dir/new.txt",
+                source=make_endpoint(self.src_root),
+                destination=remote_endpoint,
+            ),
+            types.Operation(type=types.OperationType.DELETE, path="stale.txt", destination=remote_endpoint),
+        ]
+        events = []
+        with mock.patch(
+            "simple_sync.engine.executor._delete_remote",
+            side_effect=lambda _endpoint, targets: events.append(("rm", *targets)),
+        ), mock.patch("simple_sync.engine.executor._ensure_remote_dir"), mock.patch(
+            "simple_sync.engine.executor.ssh_copy.copy_local_to_remote",
+            side_effect=lambda **kwargs: events.append(("copy", kwargs["remote_path"])),
+        ):
+            executor.apply_operations(ops)
+        self.assertEqual(
+            events,
+            [
+                ("rm", "/remote/old.txt", "/remote/dir"),
+                ("copy", "/remote/dir/new.txt"),
+                ("rm", "/remote/stale.txt"),
+            ],
+        )
+
+    def test_remote_to_remote_copy_streams_between_hosts(self):
         source_endpoint = types.Endpoint(
             id="source",
             type=types.EndpointType.SSH,
@@ -143,81 +265,81 @@ class TestExecutor(unittest.TestCase):
             source=source_endpoint,
             destination=destination_endpoint,
         )
-        with mock.patch("simple_sync.engine.executor.ssh_copy.copy_remote_to_local") as mock_pull, mock.patch(
-            "simple_sync.engine.executor.ssh_copy.copy_local_to_remote"
-        ) as mock_push:
+        with mock.patch(
+            "simple_sync.engine.executor.ssh_transport.run_ssh_command",
+            return_value=ssh_transport.SSHResult(exit_code=0, stdout="", stderr=""),
+        ), mock.patch("simple_sync.engine.executor.ssh_copy.copy_remote_to_remote") as mock_relay:
             executor.apply_operations([op])
-        mock_pull.assert_called_once()
-        mock_push.assert_called_once()
+        mock_relay.assert_called_once()
+        self.assertEqual(mock_relay.call_args.kwargs["source_path"], "/remote_src/file.txt")
+        self.assertEqual(mock_relay.call_args.kwargs["destination_host"], "dest.example.com")
+        self.assertEqual(mock_relay.call_args.kwargs["destination_path"], "/remote_dst/file.txt")
 
     def test_copy_local_symlink_preserves_link(self):
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-            target = src_root / "target.txt"
-            target.write_text("contents")
-            link = src_root / "link.txt"
-            link.symlink_to(target.name)
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="link.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-            )
-            executor.apply_operations([op])
-            copied = dst_root / "link.txt"
-            self.assertTrue(copied.is_symlink())
-            self.assertEqual(os.readlink(copied), target.name)
+        src_root = self.src_root
+        dst_root = self.dst_root
+        target = src_root / "target.txt"
+        target.write_text("contents")
+        link = src_root / "link.txt"
+        link.symlink_to(target.name)
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="link.txt",
+            source=make_endpoint(src_root),
+            destination=make_endpoint(dst_root),
+        )
+        executor.apply_operations([op])
+        copied = dst_root / "link.txt"
+        self.assertTrue(copied.is_symlink())
+        self.assertEqual(os.readlink(copied), target.name)
 
     def test_copy_remote_symlink_to_local_uses_symlink_metadata(self):
-        with tempfile.TemporaryDirectory() as dst_tmp:
-            dst_root = Path(dst_tmp)
-            source_endpoint = types.Endpoint(
-                id="source",
-                type=types.EndpointType.SSH,
-                path="/remote_src",
-                host="source.example.com",
-            )
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="link.txt",
-                source=source_endpoint,
-                destination=make_endpoint(dst_root),
-                metadata={"is_symlink": True, "link_target": "../target.txt"},
-            )
-            with mock.patch("simple_sync.engine.executor.ssh_copy.copy_remote_to_local") as mock_pull:
-                executor.apply_operations([op])
-                mock_pull.assert_not_called()
-            copied = dst_root / "link.txt"
-            self.assertTrue(copied.is_symlink())
-            self.assertEqual(os.readlink(copied), "../target.txt")
+        dst_root = self.dst_root
+        source_endpoint = types.Endpoint(
+            id="source",
+            type=types.EndpointType.SSH,
+            path="/remote_src",
+            host="source.example.com",
+        )
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="link.txt",
+            source=source_endpoint,
+            destination=make_endpoint(dst_root),
+            metadata={"is_symlink": True, "link_target": "../target.txt"},
+        )
+        with mock.patch("simple_sync.engine.executor.ssh_copy.copy_remote_to_local") as mock_pull:
+            executor.apply_operations([op])
+            mock_pull.assert_not_called()
+        copied = dst_root / "link.txt"
+        self.assertTrue(copied.is_symlink())
+        self.assertEqual(os.readlink(copied), "../target.txt")
 
     def test_copy_local_directory_to_remote_makes_dir_without_scp(self):
-        with tempfile.TemporaryDirectory() as src_tmp:
-            src_root = Path(src_tmp)
-            (src_root / "dir").mkdir()
-            local_endpoint = types.Endpoint(
-                id="local",
-                type=types.EndpointType.LOCAL,
-                path=str(src_root),
-            )
-            remote_endpoint = types.Endpoint(
-                id="remote",
-                type=types.EndpointType.SSH,
-                path="/remote",
-                host="example.com",
-                ssh_command="ssh",  # ensure scp fallback still used
-            )
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="dir",
-                source=local_endpoint,
-                destination=remote_endpoint,
-            )
-            with mock.patch("simple_sync.engine.executor._ensure_remote_dir") as mock_mkdir, mock.patch(
-                "simple_sync.engine.executor.ssh_copy.copy_local_to_remote"
-            ) as mock_scp:
-                executor.apply_operations([op])
+        src_root = self.src_root
+        (src_root / "dir").mkdir()
+        local_endpoint = types.Endpoint(
+            id="local",
+            type=types.EndpointType.LOCAL,
+            path=str(src_root),
+        )
+        remote_endpoint = types.Endpoint(
+            id="remote",
+            type=types.EndpointType.SSH,
+            path="/remote",
+            host="example.com",
+            ssh_command="ssh",  # ensure scp fallback still used
+        )
+        op = types.Operation(
+            type=types.OperationType.COPY,
+            path="dir",
+            source=local_endpoint,
+            destination=remote_endpoint,
+        )
+        with mock.patch("simple_sync.engine.executor._ensure_remote_dir") as mock_mkdir, mock.patch(
+            "simple_sync.engine.executor.ssh_copy.copy_local_to_remote"
+        ) as mock_scp:
+            executor.apply_operations([op])
         mock_mkdir.assert_called_once()
         mock_scp.assert_not_called()
 
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import os
-import tempfile
 import time
 import unittest
 from pathlib import Path
@@ -11,284 +10,167 @@ from unittest import mock
 
 from simple_sync import types
 from simple_sync.engine import executor, merge, state_store
+from tests.scratch import ScratchTestCase
 
 
 def make_endpoint(root: Path) -> types.Endpoint:
     return types.Endpoint(id=str(root), type=types.EndpointType.LOCAL, path=str(root))
 
 
-class TestExecutorMerge(unittest.TestCase):
+def _merge_op(src_root: Path, dst_root: Path, path: str, **metadata: str) -> types.Operation:
+    """Build a local MERGE operation; metadata defaults to the newest fallback."""
+    return types.Operation(
+        type=types.OperationType.MERGE,
+        path=path,
+        source=make_endpoint(src_root),
+        destination=make_endpoint(dst_root),
+        metadata={"fallback_policy": "newest", **metadata},
+    )
+
+
+def _write_with_mtime(path: Path, data: bytes, mtime: float) -> None:
+    """Write data and stamp its mtime through one file descriptor."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.utime(fd, (mtime, mtime))
+    finally:
+        os.close(fd)
+
+
+_A_TXT = b"line1\nline2 modified by A\nline3\n"
+_B_TXT = b"line1\nline2\nline3 modified by B\n"
+_A_BIN = b"binary\x00data A"
+_B_BIN = b"binary\x00data B"
+
+# (name, path, source bytes, destination bytes or None if missing, fragment the result must keep)
+_CONVERGENCE_CASES = (
+    ("non_conflicting", "file.txt", _A_TXT, _B_TXT, b"line1"),
+    ("conflicting", "file.txt", b"line1\nmodified by A\nline3\n", b"line1\nmodified by B\nline3\n", b"line1"),
+    ("binary", "file.dat", _A_BIN, _B_BIN, b"binary\x00data"),
+    ("nested", "subdir/file.txt", b"content A\n", b"content B\n", b"content"),
+    ("missing_destination", "file.txt", b"content A\n", None, b"content A"),
+    (
+        "preserves_content",
+        "file.py",
+        b"# Header\nline1\nline2 modified\nline3\n",
+        b"# Header\nline1\nline2\nline3 modified\n",
+        b"# Header",
+    ),
+)
+
+
+class TestExecutorMerge(ScratchTestCase):
     """Test executor handling of MERGE operations."""
 
-    def test_merge_operation_with_non_conflicting_changes(self):
-        """Test merge operation attempts to merge or falls back gracefully."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Setup: both sides modified the same file
-            # Without base content, simple merge may fall back
-            (src_root / "file.txt").write_text("line1\nline2 modified by A\nline3\n")
-            (dst_root / "file.txt").write_text("line1\nline2\nline3 modified by B\n")
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
-
-            executor.apply_operations([op])
-
-            # Both should have same content after merge or fallback
-            src_content = (src_root / "file.txt").read_text()
-            dst_content = (dst_root / "file.txt").read_text()
-
-            self.assertEqual(src_content, dst_content)
-            # Content should be non-empty
-            self.assertTrue(len(src_content) > 0)
-
-    def test_merge_operation_with_conflicting_changes_falls_back(self):
-        """Test merge falls back to policy when conflicts occur."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Setup: both sides modified same line (conflict)
-            (src_root / "file.txt").write_text("line1\nmodified by A\nline3\n")
-            (dst_root / "file.txt").write_text("line1\nmodified by B\nline3\n")
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
-
-            # Should fall back to copying from source (newest policy prefers source in our impl)
-            executor.apply_operations([op])
+    scratch_prefix = "ss-merge-"
+
+    def _mkpair(self) -> tuple[Path, Path]:
+        case_dir = Path(self._scratch_dir())
+        src_root, dst_root = case_dir / "a", case_dir / "b"
+        src_root.mkdir()
+        dst_root.mkdir()
+        return src_root, dst_root
+
+    def test_merge_leaves_both_sides_identical(self):
+        """Merges that succeed and merges that fall back to newest both converge the two sides."""
+        for name, path, src_bytes, dst_bytes, fragment in _CONVERGENCE_CASES:
+            with self.subTest(name=name):
+                src_root, dst_root = self._mkpair()
+                src_file, dst_file = src_root / path, dst_root / path
+                for target, payload in ((src_file, src_bytes), (dst_file, dst_bytes)):
+                    if payload is not None:
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        target.write_bytes(payload)
+
+                op = _merge_op(src_root, dst_root, path)
+                executor.apply_operations([op])
 
-            # Verify fallback was applied (both should have same content)
-            src_content = (src_root / "file.txt").read_text()
-            dst_content = (dst_root / "file.txt").read_text()
-            self.assertEqual(src_content, dst_content)
+                merged = src_file.read_bytes()
+                self.assertEqual(merged, dst_file.read_bytes())
+                self.assertIn(fragment, merged)
 
     def test_merge_fallback_newest_prefers_newer_file(self):
         """Test newest fallback copies from the most recently modified file."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            (src_root / "file.txt").write_text("older version\n")
-            (dst_root / "file.txt").write_text("newer version\n")
-
-            older_time = time.time() - 120
-            newer_time = time.time()
-            os.utime(src_root / "file.txt", (older_time, older_time))
-            os.utime(dst_root / "file.txt", (newer_time, newer_time))
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
-
-            # Force merge failure to exercise fallback path
-            with mock.patch("simple_sync.engine.executor._simple_two_way_merge") as mock_merge:
-                mock_merge.return_value = merge.MergeResult(success=False, conflicts=["conflict"])
-                executor.apply_operations([op])
+        src_root, dst_root = self._mkpair()
+        src_file, dst_file = src_root / "file.txt", dst_root / "file.txt"
 
-            self.assertEqual((src_root / "file.txt").read_text(), "newer version\n")
-            self.assertEqual((dst_root / "file.txt").read_text(), "newer version\n")
+        now = time.time()
+        _write_with_mtime(src_file, b"older version\n", now - 120)
+        _write_with_mtime(dst_file, b"newer version\n", now)
 
-    def test_merge_operation_dry_run(self):
-        """Test merge operation in dry-run mode doesn't modify files."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            original_a = "line1\nline2 modified by A\nline3\n"
-            original_b = "line1\nline2\nline3 modified by B\n"
-            (src_root / "file.txt").write_text(original_a)
-            (dst_root / "file.txt").write_text(original_b)
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
-
-            executor.apply_operations([op], dry_run=True)
-
-            # Files should remain unchanged
-            self.assertEqual((src_root / "file.txt").read_text(), original_a)
-            self.assertEqual((dst_root / "file.txt").read_text(), original_b)
-
-    def test_merge_binary_file_falls_back(self):
-        """Test that binary files fall back to policy."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Create binary-like content (with null bytes)
-            (src_root / "file.dat").write_bytes(b"binary\x00data A")
-            (dst_root / "file.dat").write_bytes(b"binary\x00data B")
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.dat",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
-
-            # Should fall back to copying
-            executor.apply_operations([op])
-
-            # Both should have same content (fallback applied)
-            src_content = (src_root / "file.dat").read_bytes()
-            dst_content = (dst_root / "file.dat").read_bytes()
-            self.assertEqual(src_content, dst_content)
-
-    def test_merge_creates_parent_directories(self):
-        """Test merge operation creates parent directories as needed."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Create nested file
-            (src_root / "subdir").mkdir()
-            (src_root / "subdir" / "file.txt").write_text("content A\n")
-            (dst_root / "subdir").mkdir()
-            (dst_root / "subdir" / "file.txt").write_text("content B\n")
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="subdir/file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
+        op = _merge_op(src_root, dst_root, "file.txt")
 
+        # Force merge failure to exercise fallback path
+        with mock.patch("simple_sync.engine.executor._simple_two_way_merge") as mock_merge:
+            mock_merge.return_value = merge.MergeResult(success=False, conflicts=["conflict"])
             executor.apply_operations([op])
 
-            # Verify both files exist
-            self.assertTrue((src_root / "subdir" / "file.txt").exists())
-            self.assertTrue((dst_root / "subdir" / "file.txt").exists())
+        self.assertEqual(src_file.read_bytes(), b"newer version\n")
+        self.assertEqual(dst_file.read_bytes(), b"newer version\n")
 
-    def test_merge_with_manual_fallback_raises_error(self):
-        """Test merge with manual fallback policy raises on conflict."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Setup conflicting changes
-            (src_root / "file.txt").write_text("line1\nmodified by A\nline3\n")
-            (dst_root / "file.txt").write_text("line1\nmodified by B\nline3\n")
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={
-                    "fallback_policy": "manual",
-                    "fallback_manual_behavior": "copy_both",
-                },
-            )
-
-            # Should raise ExecutionError for manual resolution
-            with self.assertRaises(executor.ExecutionError) as ctx:
-                executor.apply_operations([op])
+    def test_merge_fallback_copies_content_and_mtime(self):
+        """Binary fallback copies carry the winner's bytes and mtime to the other side."""
+        src_root, dst_root = self._mkpair()
+        src_file, dst_file = src_root / "file.dat", dst_root / "file.dat"
+        mtime = int(time.time()) - 60
+        _write_with_mtime(src_file, _A_BIN, mtime)
+        _write_with_mtime(dst_file, _B_BIN, mtime - 120)
 
-            self.assertIn("Manual resolution required", str(ctx.exception))
+        executor.apply_operations([_merge_op(src_root, dst_root, "file.dat")])
 
-    def test_merge_missing_file_falls_back(self):
-        """Test merge with missing file falls back gracefully."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
+        self.assertEqual(dst_file.read_bytes(), _A_BIN)
+        self.assertEqual(dst_file.stat().st_mtime_ns, src_file.stat().st_mtime_ns)
 
-            # Only create file on one side
-            (src_root / "file.txt").write_text("content A\n")
-            # dst side missing
+    def test_merge_operation_dry_run(self):
+        """Test merge operation in dry-run mode doesn't modify files."""
+        src_root, dst_root = self._mkpair()
+        src_file, dst_file = src_root / "file.txt", dst_root / "file.txt"
 
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.txt",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
+        src_file.write_bytes(_A_TXT)
+        dst_file.write_bytes(_B_TXT)
 
-            # Should fall back and copy
-            executor.apply_operations([op])
+        op = _merge_op(src_root, dst_root, "file.txt")
 
-            # Destination should now have the file
-            self.assertTrue((dst_root / "file.txt").exists())
-
-    def test_merge_preserves_content(self):
-        """Test that merge operation produces consistent output."""
-        with tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            src_root = Path(src_tmp)
-            dst_root = Path(dst_tmp)
-
-            # Setup files with some content
-            src_content = "# Header\nline1\nline2 modified\nline3\n"
-            dst_content = "# Header\nline1\nline2\nline3 modified\n"
-            (src_root / "file.py").write_text(src_content)
-            (dst_root / "file.py").write_text(dst_content)
-
-            op = types.Operation(
-                type=types.OperationType.MERGE,
-                path="file.py",
-                source=make_endpoint(src_root),
-                destination=make_endpoint(dst_root),
-                metadata={"fallback_policy": "newest"},
-            )
+        executor.apply_operations([op], dry_run=True)
 
-            executor.apply_operations([op])
+        # Files should remain unchanged
+        self.assertEqual(src_file.read_bytes(), _A_TXT)
+        self.assertEqual(dst_file.read_bytes(), _B_TXT)
 
-            # Verify both sides have the same content
-            merged_a = (src_root / "file.py").read_text()
-            merged_b = (dst_root / "file.py").read_text()
-            self.assertEqual(merged_a, merged_b)
-            # Should contain the header
-            self.assertIn("# Header", merged_a)
-
-    def test_merge_operation_without_source_raises_error(self):
-        """Test merge operation without source endpoint raises error."""
-        op = types.Operation(
-            type=types.OperationType.MERGE,
-            path="file.txt",
-            destination=make_endpoint(Path("/tmp")),
-            metadata={"fallback_policy": "newest"},
-        )
-
-        with self.assertRaises(executor.ExecutionError) as ctx:
-            executor.apply_operations([op])
+    def test_merge_with_manual_fallback_raises_error(self):
+        """Test merge with manual fallback policy raises on conflict."""
+        src_root, dst_root = self._mkpair()
 
-        self.assertIn("source and destination", str(ctx.exception))
+        # Setup conflicting changes
+        (src_root / "file.txt").write_bytes(b"line1\nmodified by A\nline3\n")
+        (dst_root / "file.txt").write_bytes(b"line1\nmodified by B\nline3\n")
 
-    def test_merge_operation_without_destination_raises_error(self):
-        """Test merge operation without destination endpoint raises error."""
-        op = types.Operation(
-            type=types.OperationType.MERGE,
-            path="file.txt",
-            source=make_endpoint(Path("/tmp")),
-            metadata={"fallback_policy": "newest"},
+        op = _merge_op(
+            src_root, dst_root, "file.txt", fallback_policy="manual", fallback_manual_behavior="copy_both"
         )
 
+        # Should raise ExecutionError for manual resolution
         with self.assertRaises(executor.ExecutionError) as ctx:
             executor.apply_operations([op])
 
-        self.assertIn("source and destination", str(ctx.exception))
+        self.assertIn("Manual resolution required", str(ctx.exception))
+
+    def test_merge_operation_missing_endpoint_raises_error(self):
+        """Test merge operation without a source or destination endpoint raises error."""
+        endpoint = make_endpoint(Path("/tmp"))
+        for missing in ("source", "destination"):
+            with self.subTest(missing=missing):
+                present = "destination" if missing == "source" else "source"
+                op = types.Operation(
+                    type=types.OperationType.MERGE,
+                    path="file.txt",
+                    metadata={"fallback_policy": "newest"},
+                    **{present: endpoint},
+                )
+                with self.assertRaises(executor.ExecutionError) as ctx:
+                    executor.apply_operations([op])
+                self.assertIn("source and destination", str(ctx.exception))
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import io
 import logging
 import unittest
@@ -13,23 +14,49 @@ class TestConfigureLogging(unittest.TestCase):
     """Validate log level and destination behavior."""
 
     def setUp(self) -> None:
-        logging.getLogger().handlers.clear()
+        # A private logger per test keeps the root logger (and other tests) untouched.
+        self.logger = logging.getLogger(f"simple_sync.test.{self.id()}")
+        self.logger.propagate = False
+        self.addCleanup(self._drop_handlers)
+
+    def _drop_handlers(self) -> None:
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+            handler.close()
 
     def test_verbose_enables_debug(self):
         sink = io.StringIO()
-        configure_logging(verbose=1, stream=sink)
-        logging.getLogger("simple_sync.test").debug("debug message")
+        configure_logging(verbose=1, stream=sink, logger=self.logger)
+        self.logger.debug("debug message")
         self.assertIn("debug message", sink.getvalue())
 
     def test_quiet_suppresses_info_but_not_warning(self):
         sink = io.StringIO()
-        configure_logging(quiet=1, stream=sink)
-        logger = logging.getLogger("simple_sync.test")
-        logger.info("info message")
+        configure_logging(quiet=1, stream=sink, logger=self.logger)
+        self.logger.info("info message")
         self.assertEqual("", sink.getvalue())
-        logger.warning("warning message")
+        self.logger.warning("warning message")
         self.assertIn("warning message", sink.getvalue())
 
+    def test_repeated_configuration_keeps_single_handler(self):
+        first, second = io.StringIO(), io.StringIO()
+        configure_logging(stream=first, logger=self.logger)
+        configure_logging(stream=second, logger=self.logger)
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.logger.info("once")
+        self.assertEqual("", first.getvalue())
+        self.assertEqual(second.getvalue().count("once"), 1)
+
+    def test_default_stream_follows_current_stderr(self):
+        configure_logging(logger=self.logger)
+        handler = self.logger.handlers[0]
+        sink = io.StringIO()
+        with contextlib.redirect_stderr(sink):
+            configure_logging(quiet=1, logger=self.logger)
+            self.logger.warning("redirected")
+        self.assertIs(self.logger.handlers[0], handler)
+        self.assertIn("[WARNING] redirected", sink.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
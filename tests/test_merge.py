@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import re
 import unittest
 
 from simple_sync.engine import merge
 
+_CONFLICT_RE = re.compile(
+    r"<<<<<<< LOCAL.*?line2 modified by A.*?=======.*?line2 modified by B.*?>>>>>>> REMOTE",
+    re.DOTALL,
+)
+
 
 class TestTextFileDetection(unittest.TestCase):
     """Test text file detection by extension."""
@@ -109,11 +115,7 @@ class TestThreeWayMerge(unittest.TestCase):
         result = merge.merge_three_way(base, a, b)
         self.assertFalse(result.success)
         self.assertIsNotNone(result.content)
-        self.assertIn("<<<<<<< LOCAL", result.content)
-        self.assertIn("=======", result.content)
-        self.assertIn(">>>>>>> REMOTE", result.content)
-        self.assertIn("line2 modified by A", result.content)
-        self.assertIn("line2 modified by B", result.content)
+        self.assertRegex(result.content, _CONFLICT_RE)
 
     def test_multiple_non_overlapping_changes(self):
         base = "1\n2\n3\n4\n5\n"
@@ -2,26 +2,34 @@
 
 from __future__ import annotations
 
+import functools
 import unittest
 
-from unittest import mock
-
 from simple_sync.engine import planner, state_store
 from simple_sync import types
 
 
+@functools.lru_cache(maxsize=256)
 def make_entry(path: str, *, size: int = 1, mtime: float = 1.0) -> types.FileEntry:
-    return types.FileEntry(path=path, is_dir=False, size=size, mtime=mtime)
+    return types.FileEntry(path=path, is_dir=False, size=size, mtime_ns=int(mtime * types.NS_PER_SECOND))
 
 
+@functools.lru_cache(maxsize=32)
 def make_endpoint(id_: str) -> types.Endpoint:
     return types.Endpoint(id=id_, type=types.EndpointType.LOCAL, path=f"/tmp/{id_}")
 
 
 class TestPlanner(unittest.TestCase):
-    def setUp(self) -> None:
-        self.endpoint_a = make_endpoint("A")
-        self.endpoint_b = make_endpoint("B")
+    # FileEntry and Endpoint are frozen, so the cached instances are safe to share.
+    endpoint_a = make_endpoint("A")
+    endpoint_b = make_endpoint("B")
+
+    def _synced_state(self) -> state_store.ProfileState:
+        """State in which both endpoints last synced the same file.txt."""
+        state = state_store.ProfileState(profile="demo")
+        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.txt", size=1, mtime=1))
+        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.txt", size=1, mtime=1))
+        return state
 
     def _planner_input(self, snapshot_a, snapshot_b, state=None):
         return planner.PlannerInput(
@@ -45,9 +53,7 @@ class TestPlanner(unittest.TestCase):
     def test_both_modified_creates_conflict(self):
         snap_a = {"file.txt": make_entry("file.txt", size=2, mtime=5)}
         snap_b = {"file.txt": make_entry("file.txt", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.txt", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.txt", size=1, mtime=1))
+        state = self._synced_state()
         result = planner.plan(self._planner_input(snap_a, snap_b, state))
         self.assertEqual(len(result.conflicts), 0)
         self.assertEqual(len(result.operations), 1)
@@ -57,9 +63,7 @@ class TestPlanner(unittest.TestCase):
     def test_both_modified_conflict_when_not_newest_policy(self):
         snap_a = {"file.txt": make_entry("file.txt", size=2, mtime=5)}
         snap_b = {"file.txt": make_entry("file.txt", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.txt", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.txt", size=1, mtime=1))
+        state = self._synced_state()
         result = planner.plan(
             planner.PlannerInput(
                 profile="demo",
@@ -76,9 +80,7 @@ class TestPlanner(unittest.TestCase):
     def test_both_modified_prefer_policy(self):
         snap_a = {"file.txt": make_entry("file.txt", size=2, mtime=5)}
         snap_b = {"file.txt": make_entry("file.txt", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.txt", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.txt", size=1, mtime=1))
+        state = self._synced_state()
         result = planner.plan(
             planner.PlannerInput(
                 profile="demo",
@@ -97,22 +99,20 @@ class TestPlanner(unittest.TestCase):
     def test_manual_policy_copy_both(self):
         snap_a = {"file.txt": make_entry("file.txt", size=2, mtime=5)}
         snap_b = {"file.txt": make_entry("file.txt", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.txt", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.txt", size=1, mtime=1))
-        with mock.patch("simple_sync.engine.planner.time.time", return_value=1700000000):
-            result = planner.plan(
-                planner.PlannerInput(
-                    profile="demo",
-                    snapshot_a=snap_a,
-                    snapshot_b=snap_b,
-                    endpoint_a=self.endpoint_a,
-                    endpoint_b=self.endpoint_b,
-                    state=state,
-                    policy="manual",
-                    manual_behavior="copy_both",
-                )
+        state = self._synced_state()
+        result = planner.plan(
+            planner.PlannerInput(
+                profile="demo",
+                snapshot_a=snap_a,
+                snapshot_b=snap_b,
+                endpoint_a=self.endpoint_a,
+                endpoint_b=self.endpoint_b,
+                state=state,
+                policy="manual",
+                manual_behavior="copy_both",
+                clock=lambda: 1700000000,
             )
+        )
         self.assertEqual(len(result.conflicts), 1)
         self.assertEqual(len(result.operations), 2)
         suffixes = {op.metadata["target_suffix"] for op in result.operations}
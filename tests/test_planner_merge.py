@@ -9,7 +9,7 @@ from simple_sync import types
 
 
 def make_entry(path: str, *, size: int = 1, mtime: float = 1.0, is_dir: bool = False) -> types.FileEntry:
-    return types.FileEntry(path=path, is_dir=is_dir, size=size, mtime=mtime)
+    return types.FileEntry(path=path, is_dir=is_dir, size=size, mtime_ns=int(mtime * types.NS_PER_SECOND))
 
 
 def make_endpoint(id_: str) -> types.Endpoint:
@@ -23,6 +23,15 @@ class TestPlannerMergeIntegration(unittest.TestCase):
         self.endpoint_a = make_endpoint("A")
         self.endpoint_b = make_endpoint("B")
 
+    def _synced_state(self, *paths: str, is_dir: bool = False) -> state_store.ProfileState:
+        """State in which both endpoints last synced each path at the baseline size and mtime."""
+        state = state_store.ProfileState(profile="demo")
+        size = 0 if is_dir else 1
+        for path in paths:
+            for endpoint in (self.endpoint_a, self.endpoint_b):
+                state_store.record_entry(state, endpoint.id, make_entry(path, is_dir=is_dir, size=size, mtime=1))
+        return state
+
     def _planner_input(
         self,
         snapshot_a,
@@ -48,84 +57,39 @@ class TestPlannerMergeIntegration(unittest.TestCase):
             manual_behavior=manual_behavior,
         )
 
-    def test_both_modified_text_file_creates_merge_operation(self):
-        """Test that modified text files create MERGE operations."""
-        snap_a = {"file.py": make_entry("file.py", size=2, mtime=5)}
-        snap_b = {"file.py": make_entry("file.py", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.py", size=1, mtime=1))
-
-        result = planner.plan(self._planner_input(snap_a, snap_b, state))
-
-        self.assertEqual(len(result.operations), 1)
-        self.assertEqual(len(result.conflicts), 0)
-        op = result.operations[0]
-        self.assertEqual(op.type, types.OperationType.MERGE)
-        self.assertEqual(op.path, "file.py")
-        self.assertEqual(op.metadata["reason"], "merge_attempt")
-        self.assertEqual(op.metadata["fallback_policy"], "newest")
-
-    def test_both_modified_non_text_file_uses_policy(self):
-        """Test that non-text files don't trigger merge."""
-        snap_a = {"image.png": make_entry("image.png", size=2, mtime=5)}
-        snap_b = {"image.png": make_entry("image.png", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("image.png", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("image.png", size=1, mtime=1))
-
-        result = planner.plan(self._planner_input(snap_a, snap_b, state))
-
-        self.assertEqual(len(result.operations), 1)
-        op = result.operations[0]
-        # Should use newest policy, not merge
-        self.assertEqual(op.type, types.OperationType.COPY)
-        self.assertEqual(op.metadata["reason"], "newest_wins")
-
-    def test_merge_disabled_uses_policy(self):
-        """Test that disabling merge uses regular policy."""
-        snap_a = {"file.py": make_entry("file.py", size=2, mtime=5)}
-        snap_b = {"file.py": make_entry("file.py", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.py", size=1, mtime=1))
-
-        result = planner.plan(
-            self._planner_input(snap_a, snap_b, state, merge_text_files=False)
+    def test_both_modified_merge_decision(self):
+        """Modified text files become MERGE operations; binaries and disabled merging use the policy."""
+        cases = (
+            # (name, path, planner kwargs, expected type, expected metadata subset)
+            ("text_file", "file.py", {}, types.OperationType.MERGE,
+             {"reason": "merge_attempt", "fallback_policy": "newest"}),
+            ("non_text_file", "image.png", {}, types.OperationType.COPY, {"reason": "newest_wins"}),
+            ("merge_disabled", "file.py", {"merge_text_files": False}, types.OperationType.COPY,
+             {"reason": "newest_wins"}),
+            ("manual_fallback", "file.py",
+             {"merge_fallback": "manual", "policy": "manual", "manual_behavior": "copy_both"},
+             types.OperationType.MERGE, {"fallback_policy": "manual", "fallback_manual_behavior": "copy_both"}),
         )
+        for name, path, kwargs, expected_type, expected_metadata in cases:
+            with self.subTest(name=name):
+                snap_a = {path: make_entry(path, size=2, mtime=5)}
+                snap_b = {path: make_entry(path, size=3, mtime=6)}
 
-        self.assertEqual(len(result.operations), 1)
-        op = result.operations[0]
-        self.assertEqual(op.type, types.OperationType.COPY)
-        self.assertEqual(op.metadata["reason"], "newest_wins")
-
-    def test_merge_with_different_fallback_policies(self):
-        """Test that fallback policy is passed in metadata."""
-        snap_a = {"file.py": make_entry("file.py", size=2, mtime=5)}
-        snap_b = {"file.py": make_entry("file.py", size=3, mtime=6)}
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.py", size=1, mtime=1))
-
-        result = planner.plan(
-            self._planner_input(
-                snap_a, snap_b, state, merge_fallback="manual", policy="manual", manual_behavior="copy_both"
-            )
-        )
+                result = planner.plan(self._planner_input(snap_a, snap_b, self._synced_state(path), **kwargs))
 
-        self.assertEqual(len(result.operations), 1)
-        op = result.operations[0]
-        self.assertEqual(op.type, types.OperationType.MERGE)
-        self.assertEqual(op.metadata["fallback_policy"], "manual")
-        self.assertEqual(op.metadata["fallback_manual_behavior"], "copy_both")
+                self.assertEqual(len(result.operations), 1)
+                self.assertEqual(len(result.conflicts), 0)
+                op = result.operations[0]
+                self.assertEqual(op.type, expected_type)
+                self.assertEqual(op.path, path)
+                for key, value in expected_metadata.items():
+                    self.assertEqual(op.metadata[key], value)
 
     def test_directories_dont_trigger_merge(self):
         """Test that directories are not merged."""
         snap_a = {"dir": make_entry("dir", is_dir=True, size=0, mtime=5)}
         snap_b = {"dir": make_entry("dir", is_dir=True, size=0, mtime=5)}  # same mtime
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("dir", is_dir=True, size=0, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("dir", is_dir=True, size=0, mtime=1))
+        state = self._synced_state("dir", is_dir=True)
 
         result = planner.plan(self._planner_input(snap_a, snap_b, state))
 
@@ -151,9 +115,7 @@ class TestPlannerMergeIntegration(unittest.TestCase):
         """Test that only one side modified doesn't trigger merge."""
         snap_a = {"file.py": make_entry("file.py", size=2, mtime=5)}
         snap_b = {"file.py": make_entry("file.py", size=1, mtime=1)}  # unchanged
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.py", size=1, mtime=1))
+        state = self._synced_state("file.py")
 
         result = planner.plan(self._planner_input(snap_a, snap_b, state))
 
@@ -174,11 +136,7 @@ class TestPlannerMergeIntegration(unittest.TestCase):
             "file1.py": make_entry("file1.py", size=3, mtime=6),
             "file2.js": make_entry("file2.js", size=3, mtime=6),
         }
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file1.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file1.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file2.js", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file2.js", size=1, mtime=1))
+        state = self._synced_state("file1.py", "file2.js")
 
         result = planner.plan(self._planner_input(snap_a, snap_b, state))
 
@@ -196,11 +154,7 @@ class TestPlannerMergeIntegration(unittest.TestCase):
             "file.py": make_entry("file.py", size=3, mtime=6),
             "image.png": make_entry("image.png", size=3, mtime=6),
         }
-        state = state_store.ProfileState(profile="demo")
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("file.py", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_a.id, make_entry("image.png", size=1, mtime=1))
-        state_store.record_entry(state, self.endpoint_b.id, make_entry("image.png", size=1, mtime=1))
+        state = self._synced_state("file.py", "image.png")
 
         result = planner.plan(self._planner_input(snap_a, snap_b, state))
 
@@ -11,46 +11,96 @@ from unittest import mock
 
 from simple_sync import types
 from simple_sync.engine import snapshot
+from tests.scratch import ScratchTestCase
 
 
-class TestSnapshotBuilder(unittest.TestCase):
+class TestSnapshotBuilder(ScratchTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The read-only tests share one tree; tests needing an exact layout build their own.
+        cls.base = base = cls._scratch_root / "shared"
+        base.mkdir()
+        (base / "dir").mkdir()
+        (base / "dir" / "file.txt").write_text("hello")
+        (base / "ignored").mkdir()
+        (base / "ignored" / "file.txt").write_text("ignored")
+        (base / "keep.tmp").write_text("tmp")
+        (base / "link.txt").symlink_to(base / "missing.txt")
+        (base / "real").mkdir()
+        (base / "real" / "file.txt").write_text("data")
+        (base / "alias").symlink_to(base / "real")
+        cls.result = snapshot.build_snapshot(base)
+
     def test_build_snapshot_collects_files_and_dirs(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            base = Path(tmp)
-            (base / "dir").mkdir()
-            file_path = base / "dir" / "file.txt"
-            file_path.write_text("hello")
-            snapshot_result = snapshot.build_snapshot(base)
-            self.assertIn("dir", snapshot_result.entries)
-            self.assertIn("dir/file.txt", snapshot_result.entries)
-            file_entry = snapshot_result.entries["dir/file.txt"]
-            self.assertFalse(file_entry.is_dir)
-            self.assertEqual(file_entry.size, 5)
+        self.assertIn("dir", self.result.entries)
+        self.assertIn("dir/file.txt", self.result.entries)
+        file_entry = self.result.entries["dir/file.txt"]
+        self.assertFalse(file_entry.is_dir)
+        self.assertEqual(file_entry.size, 5)
 
     def test_ignore_patterns_skip_files_and_dirs(self):
+        result = snapshot.build_snapshot(self.base, ignore_patterns=["ignored*", "*.tmp"])
+        self.assertNotIn("ignored", result.entries)
+        self.assertNotIn("ignored/file.txt", result.entries)
+        self.assertNotIn("keep.tmp", result.entries)
+        self.assertIn("dir/file.txt", result.entries)
+
+    def test_many_ignore_patterns_are_compiled_once_per_walk(self):
+        patterns = [f"*.skip{i}" for i in range(50)]
         with tempfile.TemporaryDirectory() as tmp:
             base = Path(tmp)
-            (base / "ignored").mkdir()
-            (base / "ignored" / "file.txt").write_text("ignored")
-            (base / "keep.tmp").write_text("tmp")
-            result = snapshot.build_snapshot(base, ignore_patterns=["ignored*", "*.tmp"])
-            self.assertNotIn("ignored", result.entries)
-            self.assertNotIn("ignored/file.txt", result.entries)
-            self.assertNotIn("keep.tmp", result.entries)
+            for i in range(500):
+                suffix = f"skip{i % 50}" if i % 2 else "txt"
+                (base / f"file{i}.{suffix}").write_bytes(b"")
+            with mock.patch.object(snapshot, "_compile_ignore", wraps=snapshot._compile_ignore) as compile_ignore:
+                result = snapshot.build_snapshot(base, ignore_patterns=patterns)
+        compile_ignore.assert_called_once()
+        self.assertEqual(len(result.entries), 250)
+        self.assertTrue(all(path.endswith(".txt") for path in result.entries))
 
-    def test_dangling_symlink_is_recorded(self):
+    def test_ignore_patterns_match_full_relative_path(self):
         with tempfile.TemporaryDirectory() as tmp:
             base = Path(tmp)
-            target = base / "missing.txt"
-            link = base / "link.txt"
-            link.symlink_to(target)
-            result = snapshot.build_snapshot(base)
-        self.assertIn("link.txt", result.entries)
-        entry = result.entries["link.txt"]
+            (base / "build").mkdir()
+            (base / "build" / "out.o").write_text("obj")
+            (base / "src").mkdir()
+            (base / "src" / "main.c").write_text("int main;")
+            (base / "src" / "main.o").write_text("obj")
+            result = snapshot.build_snapshot(base, ignore_patterns=["build", "src/*.o", "*.log"])
+        self.assertEqual(sorted(result.entries), ["src", "src/main.c"])
+
+    def test_dangling_symlink_is_recorded(self):
+        self.assertIn("link.txt", self.result.entries)
+        entry = self.result.entries["link.txt"]
         self.assertTrue(entry.is_symlink)
         self.assertFalse(entry.is_dir)
         self.assertEqual(entry.size, 0)
 
+    def test_directory_symlink_is_recorded_without_descending(self):
+        self.assertTrue(self.result.entries["alias"].is_symlink)
+        self.assertFalse(self.result.entries["alias"].is_dir)
+        self.assertNotIn("alias/file.txt", self.result.entries)
+        self.assertIn("real/file.txt", self.result.entries)
+
+    def test_snapshot_entry_matches_the_walk(self):
+        for rel_path, entry in self.result.entries.items():
+            with self.subTest(path=rel_path):
+                self.assertEqual(snapshot.snapshot_entry(self.base, rel_path), entry)
+        self.assertIsNone(snapshot.snapshot_entry(self.base, "missing.txt"))
+
+    def test_build_snapshots_for_endpoints_keeps_order(self):
+        with tempfile.TemporaryDirectory() as tmp_a, tempfile.TemporaryDirectory() as tmp_b:
+            (Path(tmp_a) / "a.txt").write_text("a")
+            (Path(tmp_b) / "b.txt").write_text("b")
+            endpoints = [
+                types.Endpoint(id="A", type=types.EndpointType.LOCAL, path=tmp_a),
+                types.Endpoint(id="B", type=types.EndpointType.LOCAL, path=tmp_b),
+            ]
+            snap_a, snap_b = snapshot.build_snapshots_for_endpoints(endpoints)
+        self.assertEqual(list(snap_a.entries), ["a.txt"])
+        self.assertEqual(list(snap_b.entries), ["b.txt"])
+
     def test_missing_root_errors(self):
         with self.assertRaises(snapshot.SnapshotError):
             snapshot.build_snapshot("/path/that/does/not/exist")
@@ -66,9 +116,9 @@ class TestRemoteSnapshot(unittest.TestCase):
             ssh_command="ssh",
         )
         mock_entries = {
-            ".": types.FileEntry(path=".", is_dir=True, size=0, mtime=0),
-            "keep.txt": types.FileEntry(path="keep.txt", is_dir=False, size=5, mtime=10),
-            "ignored.tmp": types.FileEntry(path="ignored.tmp", is_dir=False, size=1, mtime=10),
+            ".": types.FileEntry(path=".", is_dir=True, size=0, mtime_ns=0),
+            "keep.txt": types.FileEntry(path="keep.txt", is_dir=False, size=5, mtime_ns=10),
+            "ignored.tmp": types.FileEntry(path="ignored.tmp", is_dir=False, size=1, mtime_ns=10),
         }
         with mock.patch("simple_sync.engine.snapshot.listing.list_remote_entries", return_value=mock_entries) as mock_list:
             result = snapshot.build_snapshot_for_endpoint(
@@ -10,17 +10,38 @@ from simple_sync.ssh import commands
 
 
 class TestSSHMarkerCommands(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("simple_sync.ssh.commands.run_ssh_command")
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_wrap_remote_command_includes_markers(self):
         wrapped = commands.wrap_remote_command(["echo", "hello"])
-        self.assertIn(commands.BEGIN_MARKER, " ".join(wrapped))
-        self.assertIn(commands.END_MARKER, " ".join(wrapped))
+        joined = " ".join(wrapped)
+        self.assertIn(commands.BEGIN_MARKER, joined)
+        self.assertIn(commands.END_MARKER, joined)
+
+    def test_wrapped_command_quotes_arguments_and_keeps_exit_status(self):
+        wrapped = commands.wrap_remote_command(["sh", "-c", "echo \"it's here\"; exit 3"])
+        completed = subprocess.run(wrapped, capture_output=True, text=True, check=False)
+        self.assertEqual(completed.returncode, 3)
+        self.assertEqual(
+            completed.stdout,
+            f"{commands.BEGIN_MARKER}\nit's here\n{commands.END_MARKER}\n",
+        )
 
     def test_run_with_markers_extracts_between_markers(self):
         stdout = f"banner\n{commands.BEGIN_MARKER}\ndata\nmore\n{commands.END_MARKER}\nnoise"
-        with mock.patch("simple_sync.ssh.commands.run_ssh_command", return_value=commands.SSHResult(0, stdout, "")):
-            result = commands.run_with_markers(host="example.com", remote_command=["ls"])
+        self.mock_run.return_value = commands.SSHResult(0, stdout, "")
+        result = commands.run_with_markers(host="example.com", remote_command=["ls"])
         self.assertEqual(result.body, "data\nmore")
 
+    def test_run_with_markers_without_markers_returns_empty_body(self):
+        self.mock_run.return_value = commands.SSHResult(1, "motd only\n", "err")
+        result = commands.run_with_markers(host="example.com", remote_command=["ls"])
+        self.assertEqual(result.body, "")
+        self.assertEqual(result.exit_code, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
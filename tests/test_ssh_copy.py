@@ -2,51 +2,223 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from simple_sync.ssh import copy
+from simple_sync.ssh import copy, transport
+
+_SCP_OK = subprocess.CompletedProcess(args=[], returncode=0, stdout=None, stderr=b"")
+_SCP_FAIL = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=b"fail")
+_SCP_PASSWORD_PROMPT = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=b"Password:")
+_real_run = subprocess.run
+
+
+def _run_locally(*, remote_command, **_kwargs):
+    return list(remote_command)
 
 
 class TestRemoteCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        # scp goes through subprocess.run; the tar/pipe tests use Popen and are unaffected.
+        patcher = mock.patch("subprocess.run", return_value=_SCP_OK)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_copy_local_to_remote_builds_command(self):
-        with mock.patch("subprocess.run", return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")) as mock_run:
-            copy.copy_local_to_remote(
-                host="example.com",
-                local_path="/tmp/file.txt",
-                remote_path="/remote/file.txt",
-                scp_command=["scp", "-P", "2222"],
-                extra_args=["-i", "~/.ssh/id"],
-            )
-        args = mock_run.call_args[0][0]
+        copy.copy_local_to_remote(
+            host="example.com",
+            local_path="/tmp/file.txt",
+            remote_path="/remote/file.txt",
+            scp_command=["scp", "-P", "2222"],
+            extra_args=["-i", "~/.ssh/id"],
+        )
+        args = self.mock_run.call_args[0][0]
         self.assertEqual(
             args,
-            ["scp", "-P", "2222", "-i", "~/.ssh/id", "/tmp/file.txt", "example.com:/remote/file.txt"],
+            ["scp", "-P", "2222", *transport.multiplex_args(["scp"]), "-p", "-i", "~/.ssh/id", "/tmp/file.txt", "example.com:/remote/file.txt"],
         )
 
     def test_copy_remote_to_local_error(self):
-        completed = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="fail")
-        with mock.patch("subprocess.run", return_value=completed):
-            with self.assertRaises(copy.RemoteCopyError):
-                copy.copy_remote_to_local(
-                    host="example.com",
-                    remote_path="/remote/file",
-                    local_path="local",
-                )
+        self.mock_run.return_value = _SCP_FAIL
+        with self.assertRaises(copy.RemoteCopyError):
+            copy.copy_remote_to_local(
+                host="example.com",
+                remote_path="/remote/file",
+                local_path="local",
+            )
 
     def test_copy_remote_prompt_detected(self):
-        completed = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="Password:")
-        with mock.patch("subprocess.run", return_value=completed):
-            with self.assertRaises(copy.RemoteCopyError) as err:
-                copy.copy_remote_to_local(
-                    host="example.com",
-                    remote_path="/remote/file",
-                    local_path="local",
-                )
+        self.mock_run.return_value = _SCP_PASSWORD_PROMPT
+        with self.assertRaises(copy.RemoteCopyError) as err:
+            copy.copy_remote_to_local(
+                host="example.com",
+                remote_path="/remote/file",
+                local_path="local",
+            )
         self.assertIn("prompt", str(err.exception))
 
+    def test_copy_many_uses_distinct_control_paths_per_slot(self):
+        copy.copy_many(
+            host="example.com",
+            transfers=[(f"/tmp/{i}.txt", f"/remote/{i}.txt") for i in range(6)],
+            direction="to_remote",
+            max_conns=2,
+        )
+        commands = [call.args[0] for call in self.mock_run.call_args_list]
+        self.assertEqual(sorted(cmd[-1] for cmd in commands), [f"example.com:/remote/{i}.txt" for i in range(6)])
+        control_paths = {opt for cmd in commands for opt in cmd if opt.startswith("ControlPath=")}
+        expected = {
+            opt for slot in (0, 1) for opt in transport.multiplex_args(["scp"], slot=slot) if opt.startswith("ControlPath=")
+        }
+        self.assertTrue(control_paths)
+        self.assertLessEqual(control_paths, expected)
+
+    def test_copy_many_preserves_mtimes(self):
+        def local_scp(cmd, **_kwargs):
+            # Stand in for scp with cp, passing -p through and dropping the host prefix.
+            flags = [arg for arg in cmd[1:-2] if arg == "-p"]
+            return _real_run(["cp", *flags, cmd[-2], cmd[-1].removeprefix("example.com:")], **_kwargs)
+
+        self.mock_run.side_effect = local_scp
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            for i in range(3):
+                (Path(src) / f"{i}.txt").write_text(str(i))
+                os.utime(Path(src) / f"{i}.txt", ns=(1_000_000_000 * i, 1_000_000_000 * i))
+            copy.copy_many(
+                host="example.com",
+                transfers=[(Path(src) / f"{i}.txt", f"{dst}/{i}.txt") for i in range(3)],
+                direction="to_remote",
+                max_conns=2,
+            )
+            for i in range(3):
+                self.assertEqual((Path(dst) / f"{i}.txt").read_text(), str(i))
+                self.assertEqual((Path(dst) / f"{i}.txt").stat().st_mtime_ns, 1_000_000_000 * i)
+
+    def test_copy_many_reports_every_failure(self):
+        def fake_run(cmd, **_kwargs):
+            failed = cmd[-2].endswith(("/1.txt", "/3.txt"))
+            return subprocess.CompletedProcess(args=cmd, returncode=1 if failed else 0, stdout="", stderr=b"boom" if failed else b"")
+
+        self.mock_run.side_effect = fake_run
+        with self.assertRaises(copy.RemoteCopyError) as err:
+            copy.copy_many(
+                host="example.com",
+                transfers=[(f"/local/{i}.txt", f"/remote/{i}.txt") for i in range(4)],
+                direction="from_remote",
+            )
+        self.assertEqual(self.mock_run.call_count, 4)
+        self.assertIn("2 transfer(s) failed", str(err.exception))
+
+    def test_batch_round_trip_through_tar_pipeline(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as mid, tempfile.TemporaryDirectory() as dst:
+            (Path(src) / "dir").mkdir()
+            (Path(src) / "dir" / "a.txt").write_text("alpha")
+            (Path(src) / "line\nbreak.txt").write_text("beta")
+            (Path(src) / "skipped.txt").write_text("not listed")
+            names = ["dir", "dir/a.txt", "line\nbreak.txt"]
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                copy.copy_batch_to_remote(host="example.com", local_root=src, rel_paths=names, remote_root=mid)
+                copy.copy_batch_from_remote(host="example.com", remote_root=mid, rel_paths=names, local_root=dst)
+            self.assertEqual((Path(dst) / "dir" / "a.txt").read_text(), "alpha")
+            self.assertEqual((Path(dst) / "line\nbreak.txt").read_text(), "beta")
+            self.assertFalse((Path(dst) / "skipped.txt").exists())
+
+    def test_batch_failure_raises_with_stderr(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                with self.assertRaises(copy.RemoteCopyError) as err:
+                    copy.copy_batch_to_remote(host="example.com", local_root=src, rel_paths=["missing.txt"], remote_root=dst)
+        self.assertIn("missing.txt", str(err.exception))
+
+    def test_remote_to_remote_streams_through_pipe(self):
+        self.mock_run.side_effect = _real_run  # the final rename runs through subprocess.run
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            (Path(src) / "it's here.txt").write_bytes(b"payload\0bytes")
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                copy.copy_remote_to_remote(
+                    source_host="a.example.com",
+                    source_path=str(Path(src) / "it's here.txt"),
+                    destination_host="b.example.com",
+                    destination_path=str(Path(dst) / "copy.txt"),
+                )
+            self.assertEqual((Path(dst) / "copy.txt").read_bytes(), b"payload\0bytes")
+            self.assertEqual(sorted(p.name for p in Path(dst).iterdir()), ["copy.txt"])
+
+    def test_remote_to_remote_failure_leaves_destination_untouched(self):
+        self.mock_run.side_effect = _real_run
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            target = Path(dst) / "target.txt"
+            target.write_text("precious")
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                with self.assertRaises(copy.RemoteCopyError):
+                    copy.copy_remote_to_remote(
+                        source_host="a.example.com",
+                        source_path=str(Path(src) / "missing.txt"),
+                        destination_host="b.example.com",
+                        destination_path=str(target),
+                    )
+            self.assertEqual(target.read_text(), "precious")
+            self.assertEqual(sorted(p.name for p in Path(dst).iterdir()), ["target.txt"])
+
+    def test_remote_to_remote_keeps_mode_and_mtime(self):
+        self.mock_run.side_effect = _real_run
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            source = Path(src) / "tool.sh"
+            source.write_text("#!/bin/sh\n")
+            source.chmod(0o750)
+            os.utime(source, ns=(1_600_000_000_250_000_000, 1_600_000_000_250_000_000))
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                copy.copy_remote_to_remote(
+                    source_host="a.example.com",
+                    source_path=str(source),
+                    destination_host="b.example.com",
+                    destination_path=str(Path(dst) / "tool.sh"),
+                )
+            copied = (Path(dst) / "tool.sh").stat()
+        self.assertEqual(copied.st_mode & 0o7777, 0o750)
+        self.assertEqual(copied.st_mtime_ns, 1_600_000_000_250_000_000)
+
+    def test_remote_to_remote_rename_failure_removes_partial_file(self):
+        def run(cmd, **kwargs):
+            if cmd[0] == "mv":
+                return _SCP_FAIL
+            return _real_run(cmd, **kwargs)
+
+        self.mock_run.side_effect = run
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            (Path(src) / "a.txt").write_text("new")
+            with mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+                with self.assertRaises(copy.RemoteCopyError) as err:
+                    copy.copy_remote_to_remote(
+                        source_host="a.example.com",
+                        source_path=str(Path(src) / "a.txt"),
+                        destination_host="b.example.com",
+                        destination_path=str(Path(dst) / "a.txt"),
+                    )
+            self.assertEqual(list(Path(dst).iterdir()), [])
+        self.assertEqual(str(err.exception), "fail")
+        self.assertEqual([call.args[0][0] for call in self.mock_run.call_args_list], ["mv", "rm"])
+
+    def test_remote_to_remote_failures_have_their_own_messages(self):
+        with mock.patch("simple_sync.ssh.copy._run_pipeline"), mock.patch(
+            "simple_sync.ssh.copy._run_command", side_effect=copy.RemoteCopyError("boom")
+        ) as mock_command, mock.patch("simple_sync.ssh.copy.build_ssh_command", side_effect=_run_locally):
+            with self.assertRaisesRegex(copy.RemoteCopyError, "boom"):
+                copy.copy_remote_to_remote(
+                    source_host="a.example.com",
+                    source_path="/src/a.txt",
+                    destination_host="b.example.com",
+                    destination_path="/dst/a.txt",
+                )
+        self.assertEqual(
+            [(call.args[0][0], call.kwargs["failure"]) for call in mock_command.call_args_list],
+            [("mv", "remote rename failed."), ("rm", "remote cleanup failed.")],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import shutil
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
@@ -14,20 +15,24 @@ from simple_sync.ssh import transport
 
 
 def _make_endpoints(local_root: Path, remote_root: Path) -> tuple[types.Endpoint, types.Endpoint]:
-    local = types.Endpoint(id="local", type=types.EndpointType.LOCAL, path=str(local_root))
-    remote = types.Endpoint(id="remote", type=types.EndpointType.SSH, path=str(remote_root), host="localhost")
+    local = types.Endpoint(id="local", type=types.EndpointType.LOCAL, path=local_root)
+    remote = types.Endpoint(id="remote", type=types.EndpointType.SSH, path=remote_root, host="localhost")
     return local, remote
 
 
 class TestSSHCopyIntegration(unittest.TestCase):
     """Exercise executor paths using SSH endpoints without a real server."""
 
-    def test_copy_local_to_remote_applies_bytes(self):
-        with tempfile.TemporaryDirectory() as local_tmp, tempfile.TemporaryDirectory() as remote_tmp:
-            local_root = Path(local_tmp)
-            remote_root = Path(remote_tmp)
-            source_file = local_root / "hello.txt"
-            source_file.write_text("hello over ssh")
+    def test_executor_applies_mixed_operations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            local_root = Path(tmp) / "local"
+            remote_root = Path(tmp) / "remote"
+            local_root.mkdir()
+            remote_root.mkdir()
+            (local_root / "hello.txt").write_text("hello over ssh")
+            (remote_root / "payload.txt").write_text("from remote")
+            obsolete = remote_root / "obsolete.txt"
+            obsolete.write_text("old data")
             local_ep, remote_ep = _make_endpoints(local_root, remote_root)
 
             def fake_copy_local_to_remote(*, host, local_path, remote_path, **_kwargs):
@@ -36,68 +41,47 @@ class TestSSHCopyIntegration(unittest.TestCase):
                 dst.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(local_path, dst)
 
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="hello.txt",
-                source=local_ep,
-                destination=remote_ep,
-            )
-            with mock.patch("simple_sync.engine.executor.ssh_copy.copy_local_to_remote", side_effect=fake_copy_local_to_remote):
-                executor.apply_operations([op])
-
-            self.assertEqual((remote_root / "hello.txt").read_text(), "hello over ssh")
-
-    def test_copy_remote_to_local_applies_bytes(self):
-        with tempfile.TemporaryDirectory() as local_tmp, tempfile.TemporaryDirectory() as remote_tmp:
-            local_root = Path(local_tmp)
-            remote_root = Path(remote_tmp)
-            remote_file = remote_root / "payload.txt"
-            remote_file.write_text("from remote")
-            local_ep, remote_ep = _make_endpoints(local_root, remote_root)
-
             def fake_copy_remote_to_local(*, host, remote_path, local_path, **_kwargs):
                 self.assertEqual(host, "localhost")
-                src = Path(remote_path)
                 dst = Path(local_path)
                 dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
+                shutil.copy2(remote_path, dst)
 
-            op = types.Operation(
-                type=types.OperationType.COPY,
-                path="payload.txt",
-                source=remote_ep,
-                destination=local_ep,
-            )
-            with mock.patch(
-                "simple_sync.engine.executor.ssh_copy.copy_remote_to_local", side_effect=fake_copy_remote_to_local
-            ):
-                executor.apply_operations([op])
+            def fake_run_ssh_command(*, host, remote_command, **_kwargs):
+                # Run the "remote" side locally; the banner on stderr must not be mistaken for an error.
+                self.assertEqual(host, "localhost")
+                completed = subprocess.run(list(remote_command), capture_output=True, text=True, check=False)
+                return transport.SSHResult(
+                    exit_code=completed.returncode,
+                    stdout=completed.stdout,
+                    stderr="Welcome!\nAuthorized users only\n" + completed.stderr,
+                )
+
+            ops = [
+                types.Operation(
+                    type=types.OperationType.COPY, path="hello.txt", source=local_ep, destination=remote_ep
+                ),
+                types.Operation(
+                    type=types.OperationType.COPY, path="payload.txt", source=remote_ep, destination=local_ep
+                ),
+                types.Operation(type=types.OperationType.DELETE, path="obsolete.txt", destination=remote_ep),
+            ]
+            with mock.patch.multiple(
+                "simple_sync.engine.executor.ssh_copy",
+                copy_local_to_remote=mock.DEFAULT,
+                copy_remote_to_local=mock.DEFAULT,
+            ) as copy_mocks, mock.patch(
+                "simple_sync.engine.executor.ssh_transport.run_ssh_command", side_effect=fake_run_ssh_command
+            ) as mock_ssh:
+                copy_mocks["copy_local_to_remote"].side_effect = fake_copy_local_to_remote
+                copy_mocks["copy_remote_to_local"].side_effect = fake_copy_remote_to_local
+                executor.apply_operations(ops)
 
+            self.assertEqual((remote_root / "hello.txt").read_text(), "hello over ssh")
             self.assertEqual((local_root / "payload.txt").read_text(), "from remote")
-
-    def test_remote_delete_handles_banner_noise(self):
-        with tempfile.TemporaryDirectory() as remote_tmp:
-            remote_root = Path(remote_tmp)
-            target = remote_root / "obsolete.txt"
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text("old data")
-            _, remote_ep = _make_endpoints(remote_root, remote_root)
-
-            def fake_run_ssh_command(*, remote_command, **_kwargs):
-                self.assertIn("obsolete.txt", " ".join(remote_command))
-                if target.exists():
-                    target.unlink()
-                return transport.SSHResult(exit_code=0, stdout="", stderr="Welcome!\nAuthorized users only")
-
-            op = types.Operation(
-                type=types.OperationType.DELETE,
-                path="obsolete.txt",
-                destination=remote_ep,
-            )
-            with mock.patch("simple_sync.engine.executor.ssh_transport.run_ssh_command", side_effect=fake_run_ssh_command):
-                executor.apply_operations([op])
-
-            self.assertFalse(target.exists())
+            self.assertFalse(obsolete.exists())
+            remote_commands = [" ".join(call.kwargs["remote_command"]) for call in mock_ssh.call_args_list]
+            self.assertTrue(any("obsolete.txt" in command for command in remote_commands))
 
 
 if __name__ == "__main__":
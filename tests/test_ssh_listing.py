@@ -5,32 +5,100 @@ from __future__ import annotations
 import unittest
 from unittest import mock
 
-from simple_sync.ssh import listing
+from simple_sync.ssh import commands, listing, transport
+
+
+class _FakeStream:
+    def __init__(self, stdout: bytes, exit_code: int = 0, stderr: str = "", chunk_size: int = 7) -> None:
+        self._stdout = stdout
+        self._result = transport.SSHResult(exit_code=exit_code, stdout="", stderr=stderr)
+        self._chunk_size = chunk_size
+
+    def iter_chunks(self):
+        for start in range(0, len(self._stdout), self._chunk_size):
+            yield self._stdout[start : start + self._chunk_size]
+
+    def finish(self):
+        return self._result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        return None
+
+
+def _marked(body: str) -> bytes:
+    return f"banner\n{commands.BEGIN_MARKER}\n{body}{commands.END_MARKER}\n".encode()
 
 
 class TestRemoteListing(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("simple_sync.ssh.listing.open_ssh_stream")
+        self.mock_open = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_parses_find_output(self):
-        body = "\n".join(
+        body = "".join(
             [
-                "|d|0|0",
-                "dir|d|0|100",
-                "dir/file.txt|f|5|200",
+                "\0d\0" "0\0" "0\0\0",
+                "dir\0d\0" "0\0" "100\0\0",
+                "dir/file.txt\0f\0" "5\0" "200.1234567891\0\0",
+                "dir/line\nbreak|x\0l\0" "0\0" "300\0target\0",
             ]
         )
-        marker_result = mock.Mock(exit_code=0, body=body, stderr="")
-        with mock.patch("simple_sync.ssh.listing.run_with_markers", return_value=marker_result) as mock_run:
-            entries = listing.list_remote_entries(host="example.com", root="/data")
-        self.assertIn("dir/file.txt", entries)
+        self.mock_open.return_value = _FakeStream(_marked(body))
+        entries = listing.list_remote_entries(host="example.com", root="/data")
+        self.assertEqual(sorted(entries), [".", "dir", "dir/file.txt", "dir/line\nbreak|x"])
         file_entry = entries["dir/file.txt"]
         self.assertFalse(file_entry.is_dir)
-        mock_run.assert_called_once()
+        self.assertEqual(file_entry.mtime_ns, 200_123_456_789)
+        self.assertEqual(entries["dir"].mtime_ns, 100_000_000_000)
+        link_entry = entries["dir/line\nbreak|x"]
+        self.assertTrue(link_entry.is_symlink)
+        self.assertEqual(link_entry.link_target, "target")
+        self.mock_open.assert_called_once()
+        remote_command = self.mock_open.call_args.kwargs["remote_command"]
+        self.assertIn(listing.FIND_FORMAT, " ".join(remote_command))
+
+    def test_pre_epoch_mtimes_keep_their_sign(self):
+        body = "old.txt\0f\0" "1\0" "-1.5\0\0" "older.txt\0f\0" "1\0" "-0.25\0\0"
+        self.mock_open.return_value = _FakeStream(_marked(body))
+        entries = listing.list_remote_entries(host="example.com", root="/data")
+        self.assertEqual(entries["old.txt"].mtime_ns, -1_500_000_000)
+        self.assertEqual(entries["older.txt"].mtime_ns, -250_000_000)
+
+    def test_multibyte_names_split_across_chunks(self):
+        self.mock_open.return_value = _FakeStream(_marked("café.txt\0f\0" "1\0" "5\0\0"), chunk_size=3)
+        entries = listing.list_remote_entries(host="example.com", root="/data")
+        self.assertIn("café.txt", entries)
+
+    def test_undecodable_names_round_trip_with_surrogateescape(self):
+        raw = b"bad\xff.txt\0f\0" b"1\0" b"5\0\0"
+        self.mock_open.return_value = _FakeStream(
+            f"{commands.BEGIN_MARKER}\n".encode() + raw + f"{commands.END_MARKER}\n".encode()
+        )
+        entries = listing.list_remote_entries(host="example.com", root="/data")
+        (name,) = entries
+        self.assertEqual(name.encode("utf-8", "surrogateescape"), b"bad\xff.txt")
+
+    def test_malformed_record_raises(self):
+        self.mock_open.return_value = _FakeStream(_marked("file.txt\0f\0" "size\0" "5\0\0"))
+        with self.assertRaises(listing.RemoteListingError):
+            listing.list_remote_entries(host="example.com", root="/data")
 
     def test_error_on_non_zero_exit(self):
-        marker_result = mock.Mock(exit_code=1, body="", stderr="fail")
-        with mock.patch("simple_sync.ssh.listing.run_with_markers", return_value=marker_result):
-            with self.assertRaises(listing.RemoteListingError):
-                listing.list_remote_entries(host="example.com", root="/data")
+        self.mock_open.return_value = _FakeStream(_marked(""), exit_code=1, stderr="fail")
+        with self.assertRaises(listing.RemoteListingError):
+            listing.list_remote_entries(host="example.com", root="/data")
 
+    def test_unreadable_subdirectory_fails_the_whole_listing(self):
+        body = "\0d\0" "0\0" "0\0\0" "ok.txt\0f\0" "2\0" "10\0\0"
+        stderr = "find: '/data/private': Permission denied"
+        self.mock_open.return_value = _FakeStream(_marked(body), exit_code=1, stderr=stderr)
+        with self.assertRaises(listing.RemoteListingError) as err:
+            listing.list_remote_entries(host="example.com", root="/data")
+        self.assertIn("Permission denied", str(err.exception))
 
 if __name__ == "__main__":
     unittest.main()
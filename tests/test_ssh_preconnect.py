@@ -4,16 +4,21 @@ from __future__ import annotations
 
 import os
 import subprocess
-import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
 
 from simple_sync import cli, config
+from tests.scratch import ScratchTestCase
 
+_PRECONNECT_OK = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+_PRECONNECT_FAIL = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="agent missing")
 
-def _write_profile(config_dir: Path, src: Path, dst: Path, *, include_preconnect: bool) -> None:
-    profile_cfg = config.ProfileConfig(
+
+def _profile(src: Path, dst: Path, *, include_preconnect: bool) -> config.ProfileConfig:
+    return config.ProfileConfig(
         profile=config.ProfileBlock(name="demo", description="Demo profile"),
         endpoints={
             "A": config.EndpointBlock(name="A", type="local", path=str(src)),
@@ -29,50 +34,79 @@ def _write_profile(config_dir: Path, src: Path, dst: Path, *, include_preconnect
             env={"SSH_AUTH_SOCK": "/tmp/fake.sock"} if include_preconnect else {},
         ),
     )
-    base = config.ensure_config_structure(config_dir)
-    (base / "profiles" / "demo.toml").write_text(config.profile_to_toml(profile_cfg))
 
 
-class TestPreconnectHook(unittest.TestCase):
+def _install_profile(config_dir: Path, toml_text: str) -> None:
+    # Only profiles/ is needed up front; the runner creates state and log directories itself.
+    base = config.ensure_config_structure(config_dir, subdirs=("profiles",))
+    (base / "profiles" / "demo.toml").write_text(toml_text)
+
+
+class TestPreconnectHook(ScratchTestCase):
     """Ensure SSH pre-connect hook is honored and only runs once."""
 
+    scratch_prefix = "ss-preconnect-"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Endpoints and the rendered profile are shared; each test gets its own config dir.
+        src, dst = cls._scratch_root / "src", cls._scratch_root / "dst"
+        src.mkdir()
+        dst.mkdir()
+        (src / "hello.txt").write_text("hello")
+        cls._toml_with_preconnect = config.profile_to_toml(_profile(src, dst, include_preconnect=True))
+
+    def setUp(self) -> None:
+        self.config_dir = Path(self._scratch_dir())
+        _install_profile(self.config_dir, self._toml_with_preconnect)
+        patcher = mock.patch("subprocess.run", return_value=_PRECONNECT_OK)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_preconnect_runs_once_and_merges_env(self):
-        with tempfile.TemporaryDirectory() as cfg_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(cfg_tmp)
-            src = Path(src_tmp)
-            dst = Path(dst_tmp)
-            (src / "hello.txt").write_text("hello")
-            _write_profile(config_dir, src, dst, include_preconnect=True)
-
-            runner = cli.SyncRunner(config_dir=str(config_dir))
-            with mock.patch.dict(os.environ, {"ORIGINAL": "keep"}), mock.patch(
-                "subprocess.run",
-                return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
-            ) as mock_run:
-                runner.run(profile_name="demo", dry_run=False)
+        runner = cli.SyncRunner(config_dir=str(self.config_dir))
+        with mock.patch.dict(os.environ, {"ORIGINAL": "keep"}):
+            runner.run(profile_name="demo", dry_run=False)
+            runner.run(profile_name="demo", dry_run=False)
+
+        # Called only once despite two runs on the same SyncRunner
+        self.assertEqual(self.mock_run.call_count, 1)
+        env = self.mock_run.call_args.kwargs["env"]
+        self.assertEqual(env["SSH_AUTH_SOCK"], "/tmp/fake.sock")
+        self.assertEqual(env["ORIGINAL"], "keep")
+
+    def test_concurrent_runs_share_one_preconnect(self):
+        runner = cli.SyncRunner(config_dir=str(self.config_dir))
+
+        def slow_preconnect(*_args, **_kwargs):
+            time.sleep(0.05)  # long enough for the other thread to reach the hook meanwhile
+            return _PRECONNECT_OK
+
+        class _Stop(Exception):
+            pass
+
+        def run_until_preconnected():
+            try:
                 runner.run(profile_name="demo", dry_run=False)
+            except _Stop:
+                pass
 
-            # Called only once despite two runs on the same SyncRunner
-            self.assertEqual(mock_run.call_count, 1)
-            env = mock_run.call_args.kwargs["env"]
-            self.assertEqual(env["SSH_AUTH_SOCK"], "/tmp/fake.sock")
-            self.assertEqual(env["ORIGINAL"], "keep")
+        self.mock_run.side_effect = slow_preconnect
+        # Stop each run right after the hook; only the pre-connect bookkeeping is shared.
+        with mock.patch.object(cli.SyncRunner, "_ensure_endpoints_available", side_effect=_Stop):
+            threads = [threading.Thread(target=run_until_preconnected) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+        self.assertEqual(self.mock_run.call_count, 1)
 
     def test_failing_preconnect_bubbles_error(self):
-        with tempfile.TemporaryDirectory() as cfg_tmp, tempfile.TemporaryDirectory() as src_tmp, tempfile.TemporaryDirectory() as dst_tmp:
-            config_dir = Path(cfg_tmp)
-            src = Path(src_tmp)
-            dst = Path(dst_tmp)
-            (src / "hello.txt").write_text("hello")
-            _write_profile(config_dir, src, dst, include_preconnect=True)
-
-            runner = cli.SyncRunner(config_dir=str(config_dir))
-            with mock.patch(
-                "subprocess.run",
-                return_value=subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="agent missing"),
-            ):
-                with self.assertRaises(RuntimeError):
-                    runner.run(profile_name="demo", dry_run=False)
+        runner = cli.SyncRunner(config_dir=str(self.config_dir))
+        self.mock_run.return_value = _PRECONNECT_FAIL
+        with self.assertRaises(RuntimeError):
+            runner.run(profile_name="demo", dry_run=False)
 
 
 if __name__ == "__main__":
@@ -2,34 +2,136 @@
 
 from __future__ import annotations
 
+import shlex
 import subprocess
+import tempfile
+import threading
+import time
 import unittest
 from unittest import mock
 
 from simple_sync.ssh import transport
 
+_SSH_OK = subprocess.CompletedProcess(args=[], returncode=0, stdout="ok", stderr="")
+_SSH_NO_STDOUT = subprocess.CompletedProcess(args=[], returncode=0, stdout=None, stderr="")
+_SSH_PERMISSION_DENIED = subprocess.CompletedProcess(args=[], returncode=255, stdout="", stderr="Permission denied")
+
 
 class TestSSHTransport(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("simple_sync.ssh.transport.subprocess.run", return_value=_SSH_OK)
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_run_invokes_subprocess_with_expected_args(self):
-        completed = subprocess.CompletedProcess(args=[], returncode=0, stdout="ok", stderr="")
-        with mock.patch("simple_sync.ssh.transport.subprocess.run", return_value=completed) as mock_run:
-            result = transport.run_ssh_command(
-                host="example.com",
-                remote_command=["echo", "hello world"],
-                ssh_command=["ssh", "-p", "2222"],
-                extra_args=["-i", "~/.ssh/id_ed25519"],
-            )
+        result = transport.run_ssh_command(
+            host="example.com",
+            remote_command=["echo", "hello world"],
+            ssh_command=["ssh", "-p", "2222"],
+            extra_args=["-i", "~/.ssh/id_ed25519"],
+        )
         self.assertEqual(result.exit_code, 0)
-        called_args = mock_run.call_args[0][0]
+        called_args = self.mock_run.call_args[0][0]
         self.assertEqual(
             called_args,
-            ["ssh", "-p", "2222", "-i", "~/.ssh/id_ed25519", "example.com", "echo 'hello world'"],
+            ["ssh", "-p", "2222", *transport.multiplex_args(["ssh"]), "-i", "~/.ssh/id_ed25519", "example.com", "echo 'hello world'"],
+        )
+
+    def test_multiplexing_options_share_control_path(self):
+        options = transport.multiplex_args(["ssh"])
+        self.assertIn("ControlMaster=auto", options)
+        self.assertIn("ControlPersist=60s", options)
+        control_path = next(opt for opt in options if opt.startswith("ControlPath="))
+        self.assertTrue(control_path.endswith("/%C"))
+        self.assertEqual(options, transport.multiplex_args(["ssh", "-p", "22"]))
+
+    def test_overlong_control_path_disables_multiplexing_options(self):
+        with mock.patch.object(transport, "_mux_dir", "/var/folders/zz/" + "x" * 40 + "/T/ss-abcdefgh"):
+            self.assertEqual(transport.multiplex_args(["ssh"]), [])
+            self.assertEqual(transport.multiplex_args(["ssh"], slot=3), [])
+        control_path = next(opt for opt in transport.multiplex_args(["ssh"], slot=3) if opt.startswith("ControlPath="))
+        self.assertLessEqual(len(control_path.removeprefix("ControlPath=").replace("%C", "c" * 40)) + 17, 103)
+
+    def test_multiplexing_options_only_for_openssh_programs(self):
+        self.assertEqual(transport.multiplex_args(["my-ssh-wrapper", "--profile", "work"]), [])
+        self.assertEqual(transport.multiplex_args([]), [])
+        self.assertTrue(transport.multiplex_args(["/usr/local/bin/scp"]))
+
+    def test_concurrent_first_use_creates_one_socket_directory(self):
+        barrier = threading.Barrier(8, timeout=5)
+        results = []
+
+        def first_use():
+            barrier.wait()
+            results.append(transport.multiplex_args(["ssh"]))
+
+        def slow_mkdtemp(**_kwargs):
+            time.sleep(0.02)  # widen the window in which other threads could also see no directory
+            return "/tmp/ss-shared"
+
+        with mock.patch.object(transport, "_mux_dir", None), mock.patch(
+            "simple_sync.ssh.transport.tempfile.mkdtemp", side_effect=slow_mkdtemp
+        ) as mkdtemp, mock.patch("simple_sync.ssh.transport.atexit.register") as register:
+            threads = [threading.Thread(target=first_use) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        mkdtemp.assert_called_once()
+        register.assert_called_once()
+
+    def test_close_uses_configured_ssh_program(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(transport, "_mux_dir", None), mock.patch.object(
+            transport, "_mux_ssh_program", "ssh"
+        ), mock.patch("simple_sync.ssh.transport.tempfile.mkdtemp", return_value=tmp), mock.patch(
+            "simple_sync.ssh.transport.atexit.register"
+        ):
+            transport.multiplex_args(["/opt/openssh/bin/ssh", "-F", "cfg"])
+            open(f"{tmp}/socket", "w").close()
+            transport._close_multiplexed_connections()
+        self.assertEqual(self.mock_run.call_args.args[0][0], "/opt/openssh/bin/ssh")
+        self.assertEqual(self.mock_run.call_args.args[0][-3:], ["-O", "exit", "simple_sync"])
+
+    def test_caller_control_path_disables_multiplexing_options(self):
+        transport.run_ssh_command(
+            host="example.com",
+            remote_command=["true"],
+            extra_args=["-o", "ControlPath=/tmp/custom-%C"],
+        )
+        self.assertEqual(
+            self.mock_run.call_args[0][0],
+            ["ssh", "-o", "ControlPath=/tmp/custom-%C", "example.com", "true"],
         )
 
+    def test_status_only_commands_discard_stdout(self):
+        self.mock_run.return_value = _SSH_NO_STDOUT
+        result = transport.run_ssh_command(host="example.com", remote_command=["true"], capture_stdout=False)
+        self.assertIs(self.mock_run.call_args.kwargs["stdout"], subprocess.DEVNULL)
+        self.assertEqual(result.stdout, "")
+
+    def test_remote_command_quotes_only_unsafe_arguments(self):
+        parts = ["find", "/srv/data", "-printf", "%P\\0", "it's", "", "über"]
+        quoted = transport._quote_remote_command(parts)
+        self.assertEqual(quoted, "find /srv/data -printf '%P\\0' 'it'\"'\"'s' '' 'über'")
+        self.assertEqual(quoted, " ".join(shlex.quote(part) for part in parts))
+
     def test_auth_failure_detection(self):
-        completed = subprocess.CompletedProcess(args=[], returncode=255, stdout="", stderr="Permission denied")
-        with mock.patch("simple_sync.ssh.transport.subprocess.run", return_value=completed):
-            result = transport.run_ssh_command(host="example.com", remote_command=["true"])
+        self.mock_run.return_value = _SSH_PERMISSION_DENIED
+        result = transport.run_ssh_command(host="example.com", remote_command=["true"])
+        self.assertTrue(result.auth_failed)
+
+    def test_stream_yields_stdout_and_reports_exit_status(self):
+        stderr_file = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            ["sh", "-c", "printf 'abc'; echo 'Permission denied' >&2; exit 2"],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        with transport.SSHStream(process, stderr_file) as stream:
+            body = b"".join(stream.iter_chunks(chunk_size=2))
+            result = stream.finish()
+        self.assertEqual(body, b"abc")
+        self.assertEqual(result.exit_code, 2)
         self.assertTrue(result.auth_failed)
 
     def test_missing_ssh_command_raises(self):
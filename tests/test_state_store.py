@@ -6,52 +6,123 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from simple_sync.engine import state_store
 from simple_sync import types
 
 
 class TestStateStore(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base = Path(tmp.name)
+
     def test_load_missing_profile_returns_empty_state(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state = state_store.load_state("demo", Path(tmpdir))
+        state = state_store.load_state("demo", self.base)
         self.assertEqual(state.profile, "demo")
         self.assertEqual(state.endpoints, {})
 
     def test_save_and_load_round_trip(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state = state_store.ProfileState(profile="demo")
-            entry = types.FileEntry(path="file.txt", is_dir=False, size=10, mtime=1.0)
-            state_store.record_entry(state, "A", entry)
-            path = state_store.save_state(state, Path(tmpdir))
-            loaded = state_store.load_state("demo", Path(tmpdir))
+        state = state_store.ProfileState(profile="demo")
+        entry = types.FileEntry(path="file.txt", is_dir=False, size=10, mtime_ns=1)
+        state_store.record_entry(state, "A", entry)
+        path = state_store.save_state(state, self.base)
+        loaded = state_store.load_state("demo", self.base)
         self.assertEqual(path.name, "demo.json")
         stored = state_store.get_last_entry(loaded, "A", "file.txt")
         self.assertIsNotNone(stored)
         self.assertEqual(stored.size, 10)
 
+    def test_record_entries_matches_record_entry(self):
+        entries = [
+            types.FileEntry(path="a.txt", is_dir=False, size=1, mtime_ns=5),
+            types.FileEntry(path="dir", is_dir=True, size=0, mtime_ns=6),
+            types.FileEntry(path="link", is_dir=False, size=0, mtime_ns=7, is_symlink=True, link_target="a.txt"),
+        ]
+        bulk = state_store.ProfileState(profile="demo")
+        single = state_store.ProfileState(profile="demo")
+        state_store.record_entries(bulk, "A", entries)
+        for entry in entries:
+            state_store.record_entry(single, "A", entry)
+        self.assertEqual(bulk.to_dict(), single.to_dict())
+        self.assertEqual(list(bulk.endpoints["A"]), ["a.txt", "dir", "link"])
+
+    def test_save_replaces_file_without_leaving_temp(self):
+        state = state_store.ProfileState(profile="demo")
+        state_store.save_state(state, self.base)
+        state_store.record_entry(state, "A", types.FileEntry(path="file.txt", is_dir=False, size=3, mtime_ns=1))
+        path = state_store.save_state(state, self.base)
+        leftovers = sorted(p.name for p in path.parent.iterdir())
+        data = json.loads(path.read_text())
+        self.assertEqual(leftovers, ["demo.json"])
+        self.assertIn("file.txt", data["endpoints"]["A"])
+
+    def test_save_encoder_failure_removes_partial_temp(self):
+        state = state_store.ProfileState(profile="demo")
+        path = state_store.save_state(state, self.base)
+        with mock.patch.object(state_store, "orjson", None), mock.patch.object(
+            state_store.ProfileState, "to_dict", return_value={"profile": "demo", "bad": object()}
+        ):
+            with self.assertRaises(TypeError):
+                state_store.save_state(state, self.base)
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), ["demo.json"])
+        self.assertEqual(json.loads(path.read_text())["profile"], "demo")
+
+    def test_save_preserves_recorded_entry_order(self):
+        state = state_store.ProfileState(profile="demo")
+        for name in ("a.txt", "b/c.txt", "d.txt"):
+            state_store.record_entry(state, "A", types.FileEntry(path=name, is_dir=False, size=1, mtime_ns=1))
+        path = state_store.save_state(state, self.base)
+        data = json.loads(path.read_text())
+        self.assertEqual(list(data["endpoints"]["A"]), ["a.txt", "b/c.txt", "d.txt"])
+        self.assertEqual(list(data["endpoints"]["A"]["a.txt"])[:2], ["path", "is_dir"])
+
+    def test_loads_version_4_float_mtime_as_nanoseconds(self):
+        payload = {
+            "version": 4,
+            "profile": "demo",
+            "endpoints": {"A": {"file.txt": {"path": "file.txt", "is_dir": False, "size": 3, "mtime": 12.5}}},
+        }
+        state = state_store.ProfileState.from_dict(payload)
+        stored = state_store.get_last_entry(state, "A", "file.txt")
+        self.assertEqual(stored.mtime_ns, 12_500_000_000)
+        self.assertEqual(state.to_dict()["version"], state_store.STATE_VERSION)
+
     def test_invalid_json_raises(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_dir = Path(tmpdir) / "state"
-            state_dir.mkdir(parents=True, exist_ok=True)
-            (state_dir / "demo.json").write_text("{invalid}")
+        state_dir = self.base / "state"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        (state_dir / "demo.json").write_text("{invalid}")
+        with self.assertRaises(state_store.StateStoreError):
+            state_store.load_state("demo", self.base)
+
+    def test_invalid_json_raises_with_orjson_decoder(self):
+        class _DecodeError(json.JSONDecodeError):  # orjson.JSONDecodeError subclasses json's
+            pass
+
+        def loads(data):
+            raise _DecodeError("unexpected character", data.decode(), 1)
+
+        state_dir = self.base / "state"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        (state_dir / "demo.json").write_text("{invalid}")
+        with mock.patch.object(state_store, "orjson", mock.Mock(loads=loads)):
             with self.assertRaises(state_store.StateStoreError):
-                state_store.load_state("demo", Path(tmpdir))
+                state_store.load_state("demo", self.base)
 
     def test_conflict_persistence(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state = state_store.ProfileState(profile="demo")
-            state_store.record_conflict(
-                state,
-                path="file.txt",
-                reason="manual_copy_both",
-                endpoints=("A", "B"),
-                resolution="copy_both",
-                timestamp=1234.0,
-                metadata={"note": "manual resolution"},
-            )
-            state_store.save_state(state, Path(tmpdir))
-            loaded = state_store.load_state("demo", Path(tmpdir))
+        state = state_store.ProfileState(profile="demo")
+        state_store.record_conflict(
+            state,
+            path="file.txt",
+            reason="manual_copy_both",
+            endpoints=("A", "B"),
+            resolution="copy_both",
+            timestamp=1234.0,
+            metadata={"note": "manual resolution"},
+        )
+        state_store.save_state(state, self.base)
+        loaded = state_store.load_state("demo", self.base)
         self.assertEqual(len(loaded.conflicts), 1)
         conflict = loaded.conflicts[0]
         self.assertEqual(conflict.path, "file.txt")
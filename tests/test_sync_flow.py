@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import tempfile
 import unittest
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 from simple_sync import types
 from simple_sync.engine import executor, planner, snapshot, state_store
@@ -15,7 +15,7 @@ def make_endpoint(root: Path, name: str) -> types.Endpoint:
 
 
 def make_entry(path: str, *, size: int, mtime: float) -> types.FileEntry:
-    return types.FileEntry(path=path, is_dir=False, size=size, mtime=mtime)
+    return types.FileEntry(path=path, is_dir=False, size=size, mtime_ns=int(mtime * types.NS_PER_SECOND))
 
 
 def run_sync_once(
@@ -40,11 +40,31 @@ def run_sync_once(
     if result.conflicts:
         raise AssertionError(f"Unexpected conflicts: {result.conflicts}")
     executor.apply_operations(result.operations)
+    # Start from the pre-plan snapshots and re-stat only what the operations touched,
+    # instead of walking both trees again.
+    tables = {endpoint_a.id: dict(snap_a.entries), endpoint_b.id: dict(snap_b.entries)}
+    roots = {endpoint_a.id: root_a, endpoint_b.id: root_b}
+    for op in result.operations:
+        rel_path = (op.metadata or {}).get("target_suffix") or op.path
+        touched = (op.source, op.destination) if op.type == types.OperationType.MERGE else (op.destination,)
+        for endpoint in touched:
+            table = tables[endpoint.id]
+            if op.type == types.OperationType.DELETE:
+                prefix = rel_path + "/"
+                for path in [path for path in table if path == rel_path or path.startswith(prefix)]:
+                    del table[path]
+            # Adding or removing a child also bumps the mtime of every directory above it.
+            for path in (rel_path, *(str(parent) for parent in PurePosixPath(rel_path).parents)):
+                if path == "." or (path == rel_path and op.type == types.OperationType.DELETE):
+                    continue
+                entry = snapshot.snapshot_entry(roots[endpoint.id], path)
+                if entry is None:
+                    table.pop(path, None)
+                else:
+                    table[path] = entry
     new_state = state_store.ProfileState(profile=profile)
-    for entry in snapshot.build_snapshot(root_a).entries.values():
-        state_store.record_entry(new_state, endpoint_a.id, entry)
-    for entry in snapshot.build_snapshot(root_b).entries.values():
-        state_store.record_entry(new_state, endpoint_b.id, entry)
+    for endpoint_id, table in tables.items():
+        state_store.record_entries(new_state, endpoint_id, table.values())
     return new_state
 
 
@@ -84,6 +104,39 @@ class TestSyncFlow(unittest.TestCase):
             state = run_sync_once("demo", root_a, root_b, state)
             self.assertFalse((root_b / "obsolete.txt").exists())
 
+    def test_run_sync_once_state_matches_a_fresh_walk(self):
+        def fresh_state(root_a: Path, root_b: Path) -> dict:
+            expected = state_store.ProfileState(profile="demo")
+            for endpoint_id, root in (("A", root_a), ("B", root_b)):
+                state_store.record_entries(expected, endpoint_id, snapshot.build_snapshot(root).entries.values())
+            return expected.to_dict()
+
+        def nested_tree(root_a: Path, root_b: Path) -> None:
+            (root_a / "dir" / "sub").mkdir(parents=True)
+            (root_a / "dir" / "sub" / "file.txt").write_text("nested")
+            (root_a / "dir" / "other.txt").write_text("other")
+            (root_a / "top.txt").write_text("v1")
+            (root_a / "link").symlink_to("dir/other.txt")
+
+        def delete_dir_and_add_on_b(root_a: Path, root_b: Path) -> None:
+            (root_a / "dir" / "sub" / "file.txt").unlink()
+            (root_a / "dir" / "sub").rmdir()
+            (root_a / "top.txt").write_text("v2-longer")
+            (root_b / "new" / "deep").mkdir(parents=True)
+            (root_b / "new" / "deep" / "file.txt").write_text("from B")
+
+        def no_changes(root_a: Path, root_b: Path) -> None:
+            pass
+
+        with tempfile.TemporaryDirectory() as a_tmp, tempfile.TemporaryDirectory() as b_tmp:
+            root_a, root_b = Path(a_tmp), Path(b_tmp)
+            state = state_store.ProfileState(profile="demo")
+            for change in (nested_tree, delete_dir_and_add_on_b, no_changes):
+                with self.subTest(round=change.__name__):
+                    change(root_a, root_b)
+                    state = run_sync_once("demo", root_a, root_b, state)
+                    self.assertEqual(state.to_dict(), fresh_state(root_a, root_b))
+
     def test_newest_policy_prefers_latest_mtime(self):
         with tempfile.TemporaryDirectory() as a_tmp, tempfile.TemporaryDirectory() as b_tmp:
             root_a, root_b = Path(a_tmp), Path(b_tmp)
@@ -38,9 +38,13 @@ class TestNormalizeRelativePath(unittest.TestCase):
 
 class TestMetadataContainers(unittest.TestCase):
     def test_file_entry_normalizes_path(self):
-        entry = types.FileEntry(path="./dir/file.txt", is_dir=False, size=10, mtime=1.0)
+        entry = types.FileEntry(path="./dir/file.txt", is_dir=False, size=10, mtime_ns=1)
         self.assertEqual(entry.path, "dir/file.txt")
 
+    def test_unchecked_entry_matches_normal_constructor_for_clean_paths(self):
+        entry = types.FileEntry.unchecked("dir/file.txt", False, 10, 1)
+        self.assertEqual(entry, types.FileEntry(path="dir/file.txt", is_dir=False, size=10, mtime_ns=1))
+
     def test_operation_normalizes_path(self):
         op = types.Operation(type=types.OperationType.COPY, path="./foo/bar")
         self.assertEqual(op.path, "foo/bar")
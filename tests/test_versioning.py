@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import shutil
 import subprocess
 from pathlib import Path
 
@@ -8,31 +10,46 @@ import pytest
 from simple_sync import versioning
 
 
+# Fixed identity and dates so commits need no per-call -c flags and hashes are stable.
+_GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test User",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test User",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "GIT_AUTHOR_DATE": "2000-01-01T00:00:00Z",
+    "GIT_COMMITTER_DATE": "2000-01-01T00:00:00Z",
+}
+
+
 def _git(cwd: Path, *args: str) -> None:
-    subprocess.run(["git", "-C", str(cwd), *args], check=True, capture_output=True, text=True)
+    # Output is never inspected; stderr is kept (undecoded) only for CalledProcessError diagnostics.
+    subprocess.run(
+        ["git", "-C", str(cwd), *args], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=_GIT_ENV
+    )
 
 
 def _init_repo(tmp_path: Path) -> Path:
     repo = tmp_path / "repo"
     repo.mkdir()
-    _git(repo, "init")
-    (repo / "README.md").write_text("demo")
-    _git(repo, "add", "README.md")
-    _git(
-        repo,
-        "-c",
-        "user.email=test@example.com",
-        "-c",
-        "user.name=Test User",
-        "commit",
-        "-m",
-        "init",
-    )
+    _git(repo, "init", "-q")
+    # Tag resolution only needs a commit, not file content: skip the add and commit an empty tree.
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "init")
     return repo
 
 
-def test_latest_version_tag_picks_highest_semver(tmp_path: Path) -> None:
-    repo = _init_repo(tmp_path)
+@pytest.fixture(scope="module")
+def base_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return _init_repo(tmp_path_factory.mktemp("base"))
+
+
+@pytest.fixture
+def repo(base_repo: Path, tmp_path: Path) -> Path:
+    # Tests add tags and commits, so each one gets its own copy of the initialized repository.
+    return Path(shutil.copytree(base_repo, tmp_path / "repo", symlinks=True))
+
+
+def test_latest_version_tag_picks_highest_semver(repo: Path) -> None:
     _git(repo, "tag", "v0.1.0")
     _git(repo, "tag", "v0.2.0")
     _git(repo, "tag", "v0.1.5")
@@ -41,6 +58,34 @@ def test_latest_version_tag_picks_highest_semver(tmp_path: Path) -> None:
     assert versioning.resolve_version_from_tags(repo) == "0.2.0"
 
 
+def test_latest_version_tag_ignores_which_tags_head_can_reach(repo: Path) -> None:
+    _git(repo, "tag", "v0.1.0")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "next")
+    _git(repo, "tag", "v0.2.0")
+    _git(repo, "checkout", "-q", "v0.1.0")
+
+    assert versioning.latest_version_tag(repo) == "v0.2.0"
+
+
+def test_latest_version_tag_sees_every_annotated_tag_on_the_commit(repo: Path) -> None:
+    for tag in ("v0.1.0", "v0.2.0", "v0.10.0"):
+        _git(repo, "tag", "-a", tag, "-m", f"Release {tag}")
+
+    assert versioning.latest_version_tag(repo) == "v0.10.0"
+
+
+def test_latest_version_tag_skips_tags_outside_the_strict_pattern(repo: Path) -> None:
+    for tag in ("v1.2.3", "v1.2.3-rc1", "v1.10.0.1"):
+        _git(repo, "tag", tag)
+
+    assert versioning.latest_version_tag(repo) == "v1.2.3"
+
+
+def test_latest_version_tag_without_tags_raises(repo: Path) -> None:
+    with pytest.raises(versioning.VersionError):
+        versioning.latest_version_tag(repo)
+
+
 def test_version_from_tag_rejects_invalid_format() -> None:
     with pytest.raises(versioning.VersionError):
         versioning.version_from_tag("0.1.0")
@@ -80,8 +125,7 @@ def test_update_version_files_errors_when_missing_fields(tmp_path: Path) -> None
         versioning.update_version_files("1.0.0", pyproject_path=pyproject, init_path=init_file)
 
 
-def test_tag_commit_resolves_tag_hash(tmp_path: Path) -> None:
-    repo = _init_repo(tmp_path)
+def test_tag_commit_resolves_tag_hash(repo: Path) -> None:
     _git(repo, "tag", "v0.0.1")
     commit = versioning.tag_commit("v0.0.1", repo)
     assert len(commit) == 40